@@ -0,0 +1,79 @@
+"""
+压缩分块存储基准：压缩比与单次查询延迟
+
+把JSONL转换为zstd分块存储（可指定多种块大小），报告压缩比，并对比
+DYHDCIndexLoader 直接读JSONL与读压缩存储时 query() 的平均/P99 延迟（随机查询，冷块占多数）。
+
+合成数据（与 bench_dyhdc_query 相同）由重复的短语拼成，压缩比远高于真实词典，只用来看延迟；
+压缩比请以 --jsonl 指向真实数据的结果为准。
+
+用法：
+    python benchmarks/bench_block_store.py
+    python benchmarks/bench_block_store.py --jsonl 《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl \\
+        --index data/processed/dyhdc_index.bin --block-sizes 65536 131072 262144
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_dyhdc_query import make_synthetic_jsonl
+from src.data.block_store import convert_jsonl_to_store
+from src.data.dyhdc_index_builder import DYHDCIndexBuilder, DYHDCIndexLoader
+
+
+def measure(loader: DYHDCIndexLoader, chars) -> tuple:
+    timings = []
+    for char in chars:
+        start = time.perf_counter()
+        loader.query(char)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return sum(timings) / len(timings) * 1000, timings[int(len(timings) * 0.99)] * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="压缩分块存储基准")
+    ap.add_argument("--jsonl", default=None, help="JSONL路径（缺省时生成合成数据）")
+    ap.add_argument("--index", default=None, help="索引路径（缺省时现场构建）")
+    ap.add_argument("--block-sizes", type=int, nargs="+", default=[32768, 131072, 524288], help="块大小（字节）")
+    ap.add_argument("--level", type=int, default=9, help="zstd 压缩级别")
+    ap.add_argument("--queries", type=int, default=5000, help="查询次数")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = Path(args.jsonl) if args.jsonl else Path(tmp) / "synthetic.jsonl"
+        if not args.jsonl:
+            make_synthetic_jsonl(jsonl_path)
+        index_path = Path(args.index) if args.index else Path(tmp) / "index.bin"
+        if not args.index:
+            DYHDCIndexBuilder(str(jsonl_path)).build_index(str(index_path))
+
+        with DYHDCIndexLoader(str(jsonl_path), str(index_path)) as loader:
+            loader.load_index()
+            heads = sorted({loader._binary.key(i)[0] for i in range(0, len(loader._binary), 7)})
+            rng = random.Random(1)
+            chars = [rng.choice(heads) for _ in range(args.queries)]
+            plain = measure(loader, chars)
+
+        rows = [("JSONL", jsonl_path.stat().st_size, 1.0) + plain]
+        for block_size in args.block_sizes:
+            store_path = Path(tmp) / f"store_{block_size}.zst"
+            info = convert_jsonl_to_store(str(jsonl_path), str(store_path), block_size=block_size, level=args.level)
+            with DYHDCIndexLoader(str(store_path), str(index_path)) as loader:
+                loader.load_index()
+                timing = measure(loader, chars)
+            ratio = info["raw_bytes"] / info["compressed_bytes"]
+            rows.append((f"zstd {block_size // 1024}KB", info["compressed_bytes"], ratio) + timing)
+
+    print(f"\n{'数据源':<14}{'大小MB':>10}{'压缩比':>8}{'平均ms':>10}{'P99ms':>10}")
+    for name, size, ratio, mean, p99 in rows:
+        print(f"{name:<14}{size / 1024 / 1024:>10.1f}{ratio:>8.1f}{mean:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
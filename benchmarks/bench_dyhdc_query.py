@@ -0,0 +1,101 @@
+"""
+DYHDCIndexLoader 查询吞吐基准
+
+对比两种读取方式的每秒查询数（QPS）：
+- 改进前：每次查询重新 open JSONL，再逐条 seek/read
+- 改进后：加载器持有一个只读描述符，用 pread 定位读取（含多线程）
+
+用法：
+    python benchmarks/bench_dyhdc_query.py                       # 使用合成数据
+    python benchmarks/bench_dyhdc_query.py --jsonl 《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl \\
+        --index data/processed/dyhdc_index.bin                  # 使用真实数据
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.dyhdc_index_builder import DYHDCIndexBuilder, DYHDCIndexLoader
+
+
+def make_synthetic_jsonl(path: Path, n_chars: int = 3000, compounds_per_char: int = 20) -> None:
+    """生成与真实数据结构一致的合成JSONL（单字条目 + 复合词条目）"""
+    rng = random.Random(0)
+    chars = [chr(0x4E00 + i) for i in range(n_chars)]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for char in chars:
+            words = [char] + [char + rng.choice(chars) for _ in range(compounds_per_char)]
+            for word in words:
+                entry = {
+                    "headword": word,
+                    "hw": word,
+                    "senses": [
+                        {"mean": "释义" * rng.randint(5, 40),
+                         "examples": [{"text": "例句" * rng.randint(10, 60)}]}
+                        for _ in range(rng.randint(1, 6))
+                    ],
+                }
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def query_reopen(loader: DYHDCIndexLoader, char: str) -> list:
+    """改进前的读取方式：每次查询打开文件并 seek"""
+    results = []
+    entries_info = [(o, l) for h, o, l in loader._iter_bucket(char) if len(h) == 1]
+    with open(loader.jsonl_path, "rb") as f:
+        for offset, length in entries_info:
+            f.seek(offset)
+            results.append(json.loads(f.read(length).decode("utf-8").strip()))
+    return results
+
+
+def measure(fn, chars, threads: int = 1) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for char in chars:
+            fn(char)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(fn, chars))
+    return len(chars) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="DYHDCIndexLoader 查询吞吐基准")
+    ap.add_argument("--jsonl", default=None, help="JSONL路径（缺省时生成合成数据）")
+    ap.add_argument("--index", default=None, help="索引路径（缺省时现场构建）")
+    ap.add_argument("--queries", type=int, default=20000, help="查询次数")
+    ap.add_argument("--threads", type=int, default=4, help="多线程测试的线程数")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = Path(args.jsonl) if args.jsonl else Path(tmp) / "synthetic.jsonl"
+        if not args.jsonl:
+            make_synthetic_jsonl(jsonl_path)
+        index_path = Path(args.index) if args.index else Path(tmp) / "index.bin"
+        if not args.index:
+            DYHDCIndexBuilder(str(jsonl_path)).build_index(str(index_path))
+
+        with DYHDCIndexLoader(str(jsonl_path), str(index_path)) as loader:
+            loader.load_index()
+            heads = [chr(0x4E00 + i) for i in range(3000)]
+            rng = random.Random(1)
+            chars = [rng.choice(heads) for _ in range(args.queries)]
+
+            before = measure(lambda c: query_reopen(loader, c), chars)
+            after = measure(loader.query, chars)
+            after_mt = measure(loader.query, chars, threads=args.threads)
+
+    print(f"改进前（每次重新打开）: {before:,.0f} 次/秒")
+    print(f"改进后（持久描述符+pread）: {after:,.0f} 次/秒 ({after / before:.2f}x)")
+    print(f"改进后，{args.threads} 线程并发: {after_mt:,.0f} 次/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+JSONL 解码吞吐基准
+
+对每个可用后端（orjson / msgspec / json）分别测：
+- loads：解码为 dict
+- decode_entry：解码为类型化结构 Entry
+
+报告 MB/s（按输入字节计）。缺省使用合成词条（带 html_clean 与 examples_rich，体量接近真实数据）。
+
+用法：
+    python benchmarks/bench_jsonl_codec.py
+    python benchmarks/bench_jsonl_codec.py --jsonl 《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl --limit 200000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data import jsonl_codec
+
+
+def make_synthetic_lines(n_entries: int = 20000):
+    """生成合成词条行（bytes）"""
+    rng = random.Random(0)
+    vocab = [chr(0x4E00 + i) for i in range(4000)]
+
+    def text(k):
+        return "".join(rng.choices(vocab, k=k))
+
+    lines = []
+    for i in range(n_entries):
+        senses = []
+        for _ in range(rng.randint(1, 6)):
+            examples = [{
+                "books": [f"《{text(3)}》"], "quotes": [text(rng.randint(8, 40)) + "。"],
+                "notes": [], "u_texts": [text(2)], "cross_refs": [], "images": [],
+                "text": text(40), "html": f"<book>{text(3)}</book>{text(40)}",
+            } for _ in range(rng.randint(0, 4))]
+            senses.append({
+                "mean": text(rng.randint(4, 30)), "see": [], "see_refs": [], "examples": examples,
+                "examples_rich": {"html": text(200), "segments": [{"type": "example", "data": ex} for ex in examples]},
+            })
+        entry = {
+            "headword": vocab[i % len(vocab)] + text(rng.randint(0, 2)), "hw": "", "pron": "chóng",
+            "yinyun": [{"text": text(20), "books": ["《广韵》"]}], "senses": senses, "images": [],
+            "cross_refs": [], "redirect_to": None, "variant_of": [], "source_class": "xml",
+            "html_clean": "<hdcs>" + text(600) + "</hdcs>",
+        }
+        lines.append(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+    return lines
+
+
+def read_lines(path: Path, limit: int):
+    lines = []
+    with open(path, "rb") as f:
+        for line in f:
+            lines.append(line)
+            if len(lines) >= limit:
+                break
+    return lines
+
+
+def measure(func, lines, total_bytes: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return total_bytes / best / 1024 / 1024
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="JSONL 解码吞吐基准")
+    ap.add_argument("--jsonl", default=None, help="真实JSONL路径（缺省时用合成数据）")
+    ap.add_argument("--limit", type=int, default=50000, help="最多读取的行数")
+    ap.add_argument("--entries", type=int, default=20000, help="合成词条数")
+    ap.add_argument("--repeat", type=int, default=3, help="重复次数，取最快一次")
+    args = ap.parse_args()
+
+    lines = read_lines(Path(args.jsonl), args.limit) if args.jsonl else make_synthetic_lines(args.entries)
+    total_bytes = sum(len(line) for line in lines)
+    print(f"{len(lines)} 行, {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"{'后端':<10}{'loads MB/s':>14}{'decode_entry MB/s':>20}")
+    for backend in jsonl_codec.BACKENDS:
+        jsonl_codec.set_backend(backend)
+        loads_speed = measure(jsonl_codec.loads, lines, total_bytes, args.repeat)
+        entry_speed = measure(jsonl_codec.decode_entry, lines, total_bytes, args.repeat)
+        print(f"{backend:<10}{loads_speed:>14.1f}{entry_speed:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
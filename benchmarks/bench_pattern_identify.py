@@ -0,0 +1,90 @@
+"""
+训式识别吞吐基准
+
+对比 PatternTool 两种识别方式：
+    逐个尝试    按优先级对全部格式逐个跑完整正则（prefilter=False）
+    术语预筛    先用合并的术语正则扫一遍，只尝试句中术语对应的候选格式
+并核对两者对每个句子的结果完全相同。
+
+句子取自 data/test/test_dataset.json 的训诂句，加上按训式模板合成的句子
+和不含训释术语的普通注文句（语料批量分类时这类句子占多数）。
+
+用法：
+    python benchmarks/bench_pattern_identify.py
+    python benchmarks/bench_pattern_identify.py --sentences 500000 --plain 0.7
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tools.pattern_tool import PatternTool
+
+TEMPLATES = [
+    "{a}，读为{b}", "{a}，读曰{b}。", "{a}，读当为{b}", "{a}，当作{b}", "{a}与{b}通",
+    "{a}、{b}，古字通", "{a}，{b}之假借字", "{a}，读若{b}", "{a}，或作{b}", "{a}之言{b}也",
+    "{a}之为言{b}也", "{a}，犹{b}也", "{a}，犹言{b}", "{a}，谓之{b}", "{a}，{b}之貌",
+    "{a}，{b}貌", "{a}，所以{b}也", "{a}者，{b}也", "{a}，即{b}", "{a}，{b}也",
+]
+
+
+def make_sentences(n: int, plain_ratio: float) -> list:
+    """训诂句 + 模板合成句 + 普通注文句"""
+    rng = random.Random(0)
+    vocab = [chr(0x4E00 + i) for i in range(3000)]
+    dataset = Path(__file__).resolve().parent.parent / "data" / "test" / "test_dataset.json"
+    real = [case["训诂句"] for case in json.loads(dataset.read_text(encoding="utf-8"))] if dataset.exists() else []
+
+    def words(lo: int, hi: int) -> str:
+        return "".join(rng.choices(vocab, k=rng.randint(lo, hi)))
+
+    sentences = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < plain_ratio:
+            sentences.append(f"{words(4, 12)}，{words(4, 16)}。")
+        elif real and roll < plain_ratio + 0.05:
+            sentences.append(rng.choice(real))
+        else:
+            sentences.append(rng.choice(TEMPLATES).format(a=words(1, 3), b=words(1, 8)))
+    return sentences
+
+
+def timed(tool: PatternTool, sentences: list) -> tuple:
+    start = time.perf_counter()
+    results = [tool.identify(s) for s in sentences]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="训式识别吞吐基准")
+    ap.add_argument("--sentences", type=int, default=200000, help="句子数")
+    ap.add_argument("--plain", type=float, default=0.5, help="不含训释术语的普通句比例")
+    args = ap.parse_args()
+
+    sentences = make_sentences(args.sentences, args.plain)
+    PatternTool().identify("崇，终也")  # 预先加载繁简对照表
+    print(f"{len(sentences)} 句（普通句约 {args.plain:.0%}）")
+
+    rows = []
+    baseline = None
+    for name, prefilter in (("逐个尝试", False), ("术语预筛", True)):
+        seconds, results = timed(PatternTool(prefilter=prefilter), sentences)
+        rows.append((name, seconds))
+        if baseline is None:
+            baseline = results
+        else:
+            mismatch = sum(a != b for a, b in zip(baseline, results))
+
+    print(f"\n{'方式':<10}{'总耗时s':>10}{'句/秒':>12}")
+    for name, seconds in rows:
+        print(f"{name:<10}{seconds:>10.2f}{len(sentences) / seconds:>12.0f}")
+    print(f"\n加速: {rows[0][1] / rows[1][1]:.1f}x，结果不一致: {mismatch} 句")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+拟音相似度基准：一百万对拟音的打分耗时
+
+对比三种实现：
+    difflib        旧实现（去符号后 SequenceMatcher.ratio，只作对照）
+    逐对DP         phonemes.feature_edit_distance（按音段对缓存代价，按拟音对缓存结果）
+    NumPy批量DP    phonemes.feature_edit_distances（全部拟音对同时推进动态规划）
+并核对两种特征编辑距离实现的结果一致。
+
+拟音取自 data/processed/phonology.bin（白-沙、潘悟云、斯塔罗斯金），随机配对；
+difflib 与逐对DP默认只跑 --sample 对再按比例折算到全量。
+
+用法：
+    python benchmarks/bench_phoneme_distance.py
+    python benchmarks/bench_phoneme_distance.py --pairs 1000000 --sample 1000000
+"""
+import argparse
+import difflib
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.phonemes import _cached_edit_distance, feature_edit_distance, feature_edit_distances
+from src.data.phonology_store import SOURCES, PhonologyStore
+
+
+def load_recons(path: str) -> list:
+    with PhonologyStore.open(path) as store:
+        skip = SOURCES.index("中原音韵")
+        return sorted({store._texts[store._recon[i]] for i in range(store.reading_count)
+                       if store._recon[i] and store._source[i] != skip})
+
+
+def difflib_ratio(a: str, b: str) -> float:
+    a = re.sub(r'[\*\[\]\(\)\<\>\-\s]', '', a)
+    b = re.sub(r'[\*\[\]\(\)\<\>\-\s]', '', b)
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def timed(func, pairs) -> tuple:
+    start = time.perf_counter()
+    result = [func(a, b) for a, b in pairs]
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="拟音相似度基准")
+    ap.add_argument("--store", default="data/processed/phonology.bin", help="音韵存储路径")
+    ap.add_argument("--pairs", type=int, default=1000000, help="拟音对数")
+    ap.add_argument("--sample", type=int, default=100000, help="difflib 与逐对DP实际运行的对数")
+    args = ap.parse_args()
+
+    recons = load_recons(args.store)
+    rng = random.Random(1)
+    pairs = [(rng.choice(recons), rng.choice(recons)) for _ in range(args.pairs)]
+    sample = pairs[:min(args.sample, args.pairs)]
+    scale = len(pairs) / len(sample)
+    print(f"{len(recons)} 个不同拟音, {len(pairs)} 对")
+
+    rows = []
+    seconds, _ = timed(difflib_ratio, sample)
+    rows.append(("difflib", seconds * scale))
+    _cached_edit_distance.cache_clear()
+    seconds, scalar = timed(feature_edit_distance, sample)
+    rows.append(("逐对DP（冷缓存）", seconds * scale))
+    seconds, _ = timed(feature_edit_distance, sample[:262144])
+    rows.append(("逐对DP（热缓存）", seconds * len(pairs) / min(len(sample), 262144)))
+
+    start = time.perf_counter()
+    batch = feature_edit_distances(pairs)
+    rows.append(("NumPy批量DP", time.perf_counter() - start))
+    mismatch = max(abs(x - y) for x, y in zip(scalar, batch[:len(sample)]))
+
+    print(f"\n{'实现':<16}{'总耗时s':>10}{'每对µs':>10}")
+    for name, seconds in rows:
+        print(f"{name:<16}{seconds:>10.2f}{seconds / len(pairs) * 1e6:>10.2f}")
+    print(f"\n逐对与批量结果最大差: {mismatch:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+例证引文倒排索引检索延迟基准
+
+在合成语料（按齐夫分布抽字）上构建 QuoteIndex，随机取引文片段做异文检索，
+替换字分别取高频字与普通字，报告平均延迟；另测上下文全由高频字组成的最坏情况
+（锚点二元组的倒排表很长，候选须靠其余二元组收窄并由 MAX_CANDIDATES 封顶）。
+
+用法：
+    python benchmarks/bench_quote_index.py                    # 使用合成数据
+    python benchmarks/bench_quote_index.py --index data/processed/dyhdc_quotes.bin
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.quote_index import MAX_CANDIDATES, QuoteIndex, build_quote_index
+
+
+def make_synthetic_jsonl(path: Path, n_entries: int = 20000, quotes_per_entry: int = 10) -> None:
+    """生成带例证引文的合成JSONL，字频近似齐夫分布"""
+    rng = random.Random(0)
+    vocab = [chr(0x4E00 + i) for i in range(4000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for i in range(n_entries):
+            examples = [
+                {"books": ["《书》"], "quotes": ["".join(rng.choices(vocab, weights, k=rng.randint(8, 30))) + "。"]}
+                for _ in range(quotes_per_entry)
+            ]
+            entry = {"headword": vocab[i % len(vocab)], "senses": [{"mean": "释义", "examples": examples}]}
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="引文倒排索引检索延迟基准")
+    ap.add_argument("--index", default=None, help="索引路径（缺省时用合成数据现场构建）")
+    ap.add_argument("--entries", type=int, default=20000, help="合成词条数")
+    ap.add_argument("--queries", type=int, default=500, help="查询次数")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(args.index) if args.index else Path(tmp) / "quotes.bin"
+        if not args.index:
+            jsonl_path = Path(tmp) / "synthetic.jsonl"
+            make_synthetic_jsonl(jsonl_path, args.entries)
+            build_quote_index(str(jsonl_path), str(index_path))
+
+        with QuoteIndex(index_path) as index:
+            rng = random.Random(1)
+            contexts = []
+            while len(contexts) < args.queries:
+                quote = index.doc(rng.randrange(len(index)))[2]
+                if len(quote) >= 9:
+                    contexts.append(quote[:8])
+            frequent = "一"  # 合成数据中最常见的字
+            for label, pick in (("高频替换字", lambda c: frequent), ("普通替换字", lambda c: c[1])):
+                start = time.perf_counter()
+                for context in contexts:
+                    index.search_variants(context, context[3], pick(context))
+                elapsed = (time.perf_counter() - start) / len(contexts) * 1000
+                print(f"{label}: {elapsed:.2f} ms/次 （引文 {len(index):,} 条）")
+
+            # 最坏情况：取含最常见二元组的引文，上下文各字都是高频字
+            frequent_gram = max((index.doc(i)[2][:2] for i in range(min(len(index), 1000))),
+                                key=lambda g: len(index.postings(g)))
+            worst = [context for context in contexts
+                     if len(index.postings(context[2:4])) >= len(index.postings(frequent_gram)) // 4]
+            worst = worst or [frequent_gram * 4]
+            start = time.perf_counter()
+            for context in worst:
+                index.search_variants(context, context[3], frequent)
+            elapsed = (time.perf_counter() - start) / len(worst) * 1000
+            print(f"高频二元组上下文: {elapsed:.2f} ms/次 （最长倒排表 {len(index.postings(frequent_gram)):,} 条，"
+                  f"候选上限 {MAX_CANDIDATES:,}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Agent模块 - 核心推理引擎
 """
 
 from .xungu_agent import XunguAgent, AnalysisResult, analyze
+from .rule_classifier import FastPathConfig, RuleClassifier, RuleDecision
 from .prompts import SYSTEM_PROMPT, REASONING_PROMPT
 from .llm_client import get_llm
 from .tool_wrappers import get_all_tools
@@ -14,6 +15,10 @@ __all__ = [
     "XunguAgent",
     "AnalysisResult",
     "analyze",
+    # 规则快速判定
+    "FastPathConfig",
+    "RuleClassifier",
+    "RuleDecision",
     # Prompt
     "SYSTEM_PROMPT",
     "REASONING_PROMPT",
@@ -0,0 +1,150 @@
+"""
+规则优先的快速判定（不调用LLM）
+
+训式本身已是铁证（读为、读曰、借为等，identify_pattern 给出可直接判定、置信度极高）时，
+五步 LLM 推理只是重复确认。RuleClassifier 在调用 Agent 之前综合三项可直接查表的证据：
+1. 训式：identify_pattern 的格式、暗示类型、置信度
+2. 音韵：check_phonetic_relation（预构建的 phonology.bin，两字均收录时才计入）
+3. 词典假借记录：《汉语大词典》假借关系索引（dyhdc_jiajie.bin，存在时才计入）
+得出的置信度达到 FastPathConfig.min_confidence 时直接给出结论，否则交给 LLM。
+
+判定规则：
+- 可直接判定的假借格式：格式置信度 + 音近加分 + 词典假借记录加分；两字均收录而音远时扣分
+- 可直接判定的语义格式：格式置信度；词典中两字有假借记录时扣分
+- 其他格式：词典有假借记录且音近时，按 evidence_confidence 判为假借
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FastPathConfig:
+    """快速判定的阈值配置"""
+    enabled: bool = True
+    min_confidence: float = 0.9  # 规则置信度达到此值才跳过 LLM
+    # identify_pattern 置信度等级 -> 数值
+    pattern_confidence: Dict[str, float] = field(default_factory=lambda: {
+        "极高": 0.95, "高": 0.85, "中": 0.6, "低": 0.4,
+    })
+    phonetic_bonus: float = 0.03  # 假借格式且音近
+    jiajie_bonus: float = 0.04  # 假借格式且词典有假借记录
+    phonetic_penalty: float = 0.15  # 假借格式但两字音远
+    jiajie_penalty: float = 0.15  # 语义格式但词典有假借记录
+    evidence_confidence: float = 0.9  # 非直判格式：词典假借记录 + 音近
+    max_confidence: float = 0.99
+
+
+@dataclass
+class RuleDecision:
+    """规则判定结果"""
+    classification: str  # "假借说明" 或 "语义解释"
+    confidence: float
+    char_a: str
+    char_b: str
+    pattern: Dict[str, Any]  # identify_pattern 的结果
+    phonetic: Dict[str, Any]  # check_phonetic_relation 的结果（未计入时为空）
+    jiajie_records: List[Dict[str, Any]]  # 词典假借记录
+    reasoning: str
+    accepted: bool  # 置信度是否达到阈值（未达到时应交给 LLM）
+
+
+class RuleClassifier:
+    """
+    规则优先的训诂句分类器
+
+    使用方法：
+        classifier = RuleClassifier()
+        decision = classifier.classify("正，读为征")
+        if decision and decision.accepted:
+            print(decision.classification, decision.confidence)
+    """
+
+    def __init__(self, config: Optional[FastPathConfig] = None, jiajie_index_path: Optional[str] = None):
+        self.config = config or FastPathConfig()
+        if jiajie_index_path is None:
+            from ..config import get_settings
+            jiajie_index_path = str(get_settings().dyhdc_jiajie_index_path)
+        self.jiajie_index_path = jiajie_index_path
+        self._jiajie_index = None
+        self._jiajie_checked = False
+
+    def _lookup_jiajie(self, char_a: str, char_b: str) -> List[Dict[str, Any]]:
+        """词典中两字的假借关系记录；索引不存在时为空"""
+        if not self._jiajie_checked:
+            self._jiajie_checked = True
+            if Path(self.jiajie_index_path).exists():
+                from ..data.jiajie_index import JiajieIndex
+                self._jiajie_index = JiajieIndex(self.jiajie_index_path)
+        if self._jiajie_index is None:
+            return []
+        return self._jiajie_index.lookup(char_a, char_b)
+
+    def _phonetic(self, char_a: str, char_b: str) -> Dict[str, Any]:
+        """两字的音韵关系；非单字或有字未收录时为空（不计入判定）"""
+        if len(char_a) != 1 or len(char_b) != 1:
+            return {}
+        from ..tools.phonology_tool import check_phonetic_relation
+        relation = check_phonetic_relation(char_a, char_b)
+        if "未收录" in (relation["char1_info"]["韵部"], relation["char2_info"]["韵部"]):
+            return {}
+        return relation
+
+    def classify(self, sentence: str) -> Optional[RuleDecision]:
+        """
+        规则判定
+
+        Returns:
+            RuleDecision（accepted 表示置信度达到阈值）；规则无从判断（未识别出格式或证据不足）时返回 None
+        """
+        from ..tools.pattern_tool import identify_pattern
+
+        config = self.config
+        pattern = identify_pattern(sentence)
+        char_a, char_b = pattern["被释字"], pattern["释字"]
+        if pattern["格式"] == "未知" or not char_a or not char_b:
+            return None
+
+        phonetic = self._phonetic(char_a, char_b)
+        jiajie_records = self._lookup_jiajie(char_a, char_b)
+        is_close = phonetic.get("is_close")
+        base = config.pattern_confidence.get(pattern["置信度"], 0.0)
+        reasons = [f"训式「{pattern['格式']}」({pattern['暗示类型']}，置信度{pattern['置信度']})"]
+
+        if pattern["可直接判定"] and pattern["暗示类型"] == "假借":
+            classification = "假借说明"
+            confidence = base
+            if is_close:
+                confidence += config.phonetic_bonus
+                reasons.append("两字音近")
+            elif phonetic:
+                confidence -= config.phonetic_penalty
+                reasons.append("两字音远")
+            if jiajie_records:
+                confidence += config.jiajie_bonus
+                reasons.append(f"词典有{len(jiajie_records)}条假借记录")
+        elif pattern["可直接判定"] and pattern["暗示类型"] == "语义解释":
+            classification = "语义解释"
+            confidence = base
+            if jiajie_records:
+                confidence -= config.jiajie_penalty
+                reasons.append(f"但词典有{len(jiajie_records)}条假借记录")
+        elif jiajie_records and is_close:
+            classification = "假借说明"
+            confidence = config.evidence_confidence
+            reasons.append(f"词典有{len(jiajie_records)}条假借记录，且两字音近")
+        else:
+            return None
+
+        confidence = min(confidence, config.max_confidence)
+        return RuleDecision(
+            classification=classification,
+            confidence=confidence,
+            char_a=char_a,
+            char_b=char_b,
+            pattern=pattern,
+            phonetic=phonetic,
+            jiajie_records=jiajie_records,
+            reasoning="；".join(reasons) + f" → {classification}",
+            accepted=confidence >= config.min_confidence,
+        )
@@ -23,6 +23,7 @@ except ImportError as e:
 from .llm_client import get_llm
 from .tool_wrappers import get_all_tools
 from .prompts import SYSTEM_PROMPT
+from .rule_classifier import FastPathConfig, RuleClassifier, RuleDecision
 
 
 @dataclass
@@ -48,6 +49,7 @@ class AnalysisResult:
     
     # 最终判断
     final_reasoning: str = ""
+    path: str = "llm"  # 判定路径："rule"（规则快速判定，未调用LLM）或 "llm"
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -68,7 +70,8 @@ class AnalysisResult:
                 "step4_pattern": self.step4_pattern,
                 "step5_context": self.step5_context
             },
-            "final_reasoning": self.final_reasoning
+            "final_reasoning": self.final_reasoning,
+            "path": self.path
         }
     
     def to_json(self, indent: int = 2) -> str:
@@ -229,10 +232,15 @@ class XunguAgent:
     这是系统的核心Agent类，使用LangChain框架实现五步推理流程。
     所有工具调用都通过LangChain的Tool系统，确保模块化和可扩展性。
     
+    分析前先走规则快速判定（RuleClassifier）：训式、音韵、词典假借记录足以定论时直接返回，
+    不调用LLM（result.path == "rule"）；阈值见 FastPathConfig。
+    
     使用方法：
         agent = XunguAgent(llm_provider="openai", verbose=True)
         result = agent.analyze("崇，终也", context="崇朝其雨")
         print(result.classification)  # "假借说明"
+        # 关闭快速判定，全部交给LLM
+        agent = XunguAgent(fast_path=FastPathConfig(enabled=False))
     """
     
     def __init__(
@@ -240,7 +248,8 @@ class XunguAgent:
         llm_provider: Optional[str] = None,
         verbose: bool = True,
         max_iterations: int = 15,
-        max_execution_time: Optional[int] = None
+        max_execution_time: Optional[int] = None,
+        fast_path: Optional[FastPathConfig] = None
     ):
         """
         初始化Agent
@@ -250,10 +259,12 @@ class XunguAgent:
             verbose: 是否输出详细日志
             max_iterations: 最大迭代次数（工具调用次数）
             max_execution_time: 最大执行时间（秒）
+            fast_path: 规则快速判定的阈值配置（None 为默认配置）
         """
         self.llm = get_llm(llm_provider)
         self.verbose = verbose
         self.llm_provider = llm_provider or "openai"
+        self.rule_classifier = RuleClassifier(fast_path)
         
         # 创建工具列表（通过tool_wrappers模块获取，确保模块化）
         self.tools = get_all_tools()
@@ -312,6 +323,16 @@ class XunguAgent:
                 print(f"出处: {source}")
             print(f"{'='*50}")
         
+        # 规则快速判定：证据足以定论时不调用LLM
+        decision = self._rule_first(xungu_sentence)
+        if decision is not None:
+            analysis_result = self._rule_result(xungu_sentence, context, source, decision)
+            if self.verbose:
+                print(f"\n{'='*50}")
+                print(f"规则判定: {analysis_result.classification} (置信度: {analysis_result.confidence:.0%})")
+                print(f"{'='*50}")
+            return analysis_result
+        
         # 构建Agent输入
         input_text = self._build_input(xungu_sentence, context, source)
         
@@ -336,6 +357,55 @@ class XunguAgent:
         
         return analysis_result
     
+    def _rule_first(self, xungu_sentence: str) -> Optional[RuleDecision]:
+        """规则快速判定；未启用、证据不足或置信度未达阈值时返回 None（交给LLM）"""
+        if not self.rule_classifier.config.enabled:
+            return None
+        try:
+            decision = self.rule_classifier.classify(xungu_sentence)
+        except Exception as e:
+            if self.verbose:
+                print(f"规则判定出错，改用LLM: {e}")
+            return None
+        if decision is None or not decision.accepted:
+            if self.verbose and decision is not None:
+                print(f"规则判定置信度不足 ({decision.confidence:.0%})，交给LLM")
+            return None
+        return decision
+    
+    def _rule_result(
+        self,
+        xungu_sentence: str,
+        context: Optional[str],
+        source: Optional[str],
+        decision: RuleDecision
+    ) -> AnalysisResult:
+        """把规则判定转换为分析结果（第二、三、四步填入查表所得证据）"""
+        result = AnalysisResult(
+            xungu_sentence=xungu_sentence,
+            char_a=decision.char_a,
+            char_b=decision.char_b,
+            context=context,
+            source=source,
+            classification=decision.classification,
+            confidence=decision.confidence,
+            step4_pattern=decision.pattern,
+            final_reasoning=f"规则判定：{decision.reasoning}",
+            path="rule"
+        )
+        if decision.phonetic:
+            result.step2_phonetic = {
+                "分析": decision.phonetic["analysis"],
+                "结论": "音近" if decision.phonetic["is_close"] else "音远"
+            }
+        if decision.jiajie_records:
+            result.step3_textual = {
+                "分析": "；".join(r["text"] for r in decision.jiajie_records[:3]),
+                "结论": "有佐证",
+                "假借记录": decision.jiajie_records
+            }
+        return result
+    
     def _build_input(
         self, 
         xungu_sentence: str, 
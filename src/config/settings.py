@@ -31,6 +31,7 @@ class Settings:
     # ===== 数据路径 =====
     dyhdc_path: Optional[Path] = None  # 汉语大词典
     phonology_path: Optional[Path] = None  # 音韵数据
+    dyhdc_cache_mb: int = 64  # 词条缓存上限（MB），语义/文献工具共用
     
     # ===== 运行配置 =====
     debug: bool = False
@@ -52,14 +53,19 @@ class Settings:
         if os.getenv("DYHDC_PATH"):
             self.dyhdc_path = self.project_root / os.getenv("DYHDC_PATH")
         else:
-            # 默认路径
+            # 默认路径；部署时若只保留了压缩分块存储，则使用压缩存储
             self.dyhdc_path = self.project_root / "《汉语大词典》结构化" / "dyhdc.parsed.fixed.v2.jsonl"
+            if not self.dyhdc_path.exists() and self.dyhdc_store_path.exists():
+                self.dyhdc_path = self.dyhdc_store_path
         
         if os.getenv("PHONOLOGY_PATH"):
             self.phonology_path = self.project_root / os.getenv("PHONOLOGY_PATH")
         else:
             self.phonology_path = self.project_root / "音韵数据" / "上古音" / "潘悟云《汉语古音手册》" / "汉语古音手册.txt"
         
+        if os.getenv("DYHDC_CACHE_MB"):
+            self.dyhdc_cache_mb = int(os.getenv("DYHDC_CACHE_MB"))
+        
         # 运行配置
         self.debug = os.getenv("DEBUG", "false").lower() == "true"
         self.log_level = os.getenv("LOG_LEVEL", self.log_level)
@@ -72,6 +78,40 @@ class Settings:
     def data_processed_dir(self) -> Path:
         return self.project_root / "data" / "processed"
     
+    @property
+    def dyhdc_index_path(self) -> Path:
+        """《汉语大词典》二进制偏移量索引；尚未构建而旧版JSON索引存在时，使用JSON索引"""
+        path = self.data_processed_dir / "dyhdc_index.bin"
+        legacy = self.data_processed_dir / "dyhdc_index.json"
+        if not path.exists() and legacy.exists():
+            return legacy
+        return path
+    
+    @property
+    def dyhdc_store_path(self) -> Path:
+        """《汉语大词典》压缩分块存储（zstd，可代替JSONL供加载器读取）"""
+        return self.data_processed_dir / "dyhdc.jsonl.zst"
+    
+    @property
+    def dyhdc_db_path(self) -> Path:
+        """《汉语大词典》规范化SQLite数据库（含FTS5全文索引，可选）"""
+        return self.data_processed_dir / "dyhdc.db"
+    
+    @property
+    def dyhdc_quote_index_path(self) -> Path:
+        """《汉语大词典》例证引文倒排索引（另有同名 .post/.docs 文件）"""
+        return self.data_processed_dir / "dyhdc_quotes.bin"
+    
+    @property
+    def dyhdc_jiajie_index_path(self) -> Path:
+        """《汉语大词典》假借关系索引（记录在同名 .jsonl 中）"""
+        return self.data_processed_dir / "dyhdc_jiajie.bin"
+    
+    @property
+    def dyhdc_parquet_dir(self) -> Path:
+        """《汉语大词典》列式导出目录（entries/senses/examples 三张Parquet表）"""
+        return self.data_processed_dir / "dyhdc_parquet"
+    
     @property
     def data_test_dir(self) -> Path:
         return self.project_root / "data" / "test"
@@ -5,17 +5,52 @@
 
 包含：
 - 音韵数据解析器 (phonology_parser)
+- MDict词典读取器 (mdict_reader)
+- 音韵紧凑存储 (phonology_store)
+- 拟音音段切分与发音特征 (phonemes)
+- 全字表音近矩阵与 top-k 音近字 (phonetic_similarity，依赖 numpy，需从子模块导入)
+- 繁简单字对照表 (char_convert)
 - 《汉语大词典》索引构建器 (dyhdc_index_builder)
+- 二进制偏移量索引 (binary_index)
+- 压缩分块存储 (block_store)
+- 词条缓存 (entry_cache)
+- 例证引文倒排索引 (quote_index)
+- 假借关系索引 (jiajie_index)
+- 注疏语料训诂句抽取 (xungu_miner)
+- 列式导出与查询 (parquet_export)
+- JSONL解码层 (jsonl_codec)
 """
 
 from .phonology_parser import (
     parse_panwuyun_txt,
     parse_baxter_sagart_xlsx,
+    parse_panwuyun_mdx,
+    parse_baxter_sagart_mdx,
+    parse_wangli_mdx,
+    parse_starostin_mdx,
+    parse_zhongyuan_mdx,
+    MDXPhonologySources,
     unify_phonology_data,
     compare_phonology,
     build_phonology_index,
     load_phonology_data,
     save_phonology_data,
+    export_phonology_json,
+)
+
+from .phonology_store import (
+    PhonologyStore,
+    Reading,
+)
+
+from .char_convert import (
+    CharConverter,
+    get_converter,
+)
+
+from .mdict_reader import (
+    MDXReader,
+    MDDReader,
 )
 
 from .dyhdc_index_builder import (
@@ -23,20 +58,90 @@ from .dyhdc_index_builder import (
     DYHDCIndexLoader,
     DYHDCSQLiteLoader,
     build_dyhdc_index,
+    get_shared_loader,
+)
+
+from .entry_cache import EntryCache
+
+from .jsonl_codec import (
+    Entry,
+    decode_entry,
+)
+
+from .binary_index import (
+    BinaryIndex,
+    write_binary_index,
+)
+
+from .block_store import (
+    BlockStore,
+    convert_jsonl_to_store,
+)
+
+from .quote_index import (
+    QuoteIndex,
+    build_quote_index,
+)
+
+from .jiajie_index import (
+    JiajieIndex,
+    build_jiajie_index,
+)
+
+from .xungu_miner import (
+    build_xungu_corpus,
+    extract_xungu,
+    mine_corpus,
+)
+
+from .parquet_export import (
+    ParquetDictionary,
+    export_parquet,
 )
 
 __all__ = [
     # 音韵解析
     "parse_panwuyun_txt",
     "parse_baxter_sagart_xlsx",
+    "parse_panwuyun_mdx",
+    "parse_baxter_sagart_mdx",
+    "parse_wangli_mdx",
+    "parse_starostin_mdx",
+    "parse_zhongyuan_mdx",
+    "MDXPhonologySources",
     "unify_phonology_data",
     "compare_phonology",
     "build_phonology_index",
     "load_phonology_data",
     "save_phonology_data",
+    "export_phonology_json",
+    "PhonologyStore",
+    "Reading",
+    "CharConverter",
+    "get_converter",
+    "MDXReader",
+    "MDDReader",
     # 词典索引
     "DYHDCIndexBuilder",
     "DYHDCIndexLoader",
     "DYHDCSQLiteLoader",
     "build_dyhdc_index",
+    "get_shared_loader",
+    "EntryCache",
+    "BinaryIndex",
+    "write_binary_index",
+    "BlockStore",
+    "convert_jsonl_to_store",
+    "QuoteIndex",
+    "build_quote_index",
+    "JiajieIndex",
+    "build_jiajie_index",
+    "build_xungu_corpus",
+    "extract_xungu",
+    "mine_corpus",
+    "ParquetDictionary",
+    "export_parquet",
+    # JSONL解码
+    "Entry",
+    "decode_entry",
 ]
@@ -0,0 +1,259 @@
+"""
+紧凑二进制偏移量索引（mmap + 二分查找）
+
+负责人：成员E（数据工程）
+
+文件布局（本机字节序，各段按8字节对齐）：
+    header       魔数、版本、字节序、条数、各段位置
+    key_offsets  (n+1) × uint32，第 i 个键位于 keys[key_offsets[i]:key_offsets[i+1]]
+    keys         按 UTF-8 字节序排序后拼接的键
+    offsets      n × uint64，记录在数据文件中的字节偏移
+    lengths      n × uint32，记录的字节长度
+    meta         UTF-8 JSON（统计信息等）
+    exact        m × 3 × uint32，单字键表：(码位, 首条记录下标, 记录数)，按码位排序
+
+UTF-8 的字节序与码位序一致，所以排序后的键既可精确查找，也可按前缀取连续区间。
+单字键另有精确表，首次使用时展开为字典，之后单字查询为 O(1)，无需在首字区间内过滤复合词。
+打开索引只需 mmap 和解析定长头部，不随词条数增长；多个进程打开同一文件时共享页缓存。
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+MAGIC = b"DYHDCIDX"
+VERSION = 2
+
+# 魔数, 版本, 字节序(0=little,1=big), 条数, key_offsets/keys/offsets/lengths/meta 起始位置, meta 长度
+_HEADER_V1 = struct.Struct("<8sIIQQQQQQQ")
+# v2 在 v1 之后追加：exact 起始位置, 单字键数
+_HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+_HEADER_SIZE = _HEADER.size
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def is_binary_index(path) -> bool:
+    """判断文件是否为二进制索引（检查魔数）"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_binary_index(
+    path,
+    records: Iterable[Tuple[str, int, int]],
+    meta: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    写出二进制索引
+
+    Args:
+        path: 输出路径
+        records: (键, 偏移量, 长度) 序列，顺序任意；同键记录保持输入顺序
+        meta: 附加元信息（须可JSON序列化）
+
+    Returns:
+        写入的记录数
+    """
+    items = [(key.encode('utf-8'), offset, length) for key, offset, length in records]
+    # 稳定排序：同一词头的多条记录保持原文件顺序
+    items.sort(key=lambda item: item[0])
+
+    key_offsets = array('I', [0])
+    offsets = array('Q')
+    lengths = array('I')
+    exact = array('I')
+    keys = bytearray()
+    for i, (key, offset, length) in enumerate(items):
+        keys += key
+        key_offsets.append(len(keys))
+        offsets.append(offset)
+        lengths.append(length)
+        # 单字键（单个码位的UTF-8最多4字节）：同键记录在排序后连续，只需记下首条下标和条数
+        if len(key) <= 4:
+            text = key.decode('utf-8')
+            if len(text) == 1:
+                if exact and exact[-3] == ord(text):
+                    exact[-1] += 1
+                else:
+                    exact.extend((ord(text), i, 1))
+
+    meta_bytes = json.dumps(meta or {}, ensure_ascii=False).encode('utf-8')
+
+    n = len(items)
+    key_offsets_pos = _align(_HEADER_SIZE)
+    keys_pos = _align(key_offsets_pos + key_offsets.itemsize * len(key_offsets))
+    offsets_pos = _align(keys_pos + len(keys))
+    lengths_pos = _align(offsets_pos + offsets.itemsize * n)
+    meta_pos = _align(lengths_pos + lengths.itemsize * n)
+    exact_pos = _align(meta_pos + len(meta_bytes))
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0 if sys.byteorder == 'little' else 1, n,
+        key_offsets_pos, keys_pos, offsets_pos, lengths_pos, meta_pos, len(meta_bytes),
+        exact_pos, len(exact) // 3,
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        for pos, chunk in (
+            (0, header),
+            (key_offsets_pos, key_offsets.tobytes()),
+            (keys_pos, bytes(keys)),
+            (offsets_pos, offsets.tobytes()),
+            (lengths_pos, lengths.tobytes()),
+            (meta_pos, meta_bytes),
+            (exact_pos, exact.tobytes()),
+        ):
+            f.write(b"\0" * (pos - f.tell()))
+            f.write(chunk)
+    # 原子替换，正在使用旧索引的进程不受影响
+    tmp_path.replace(path)
+    return n
+
+
+class BinaryIndex:
+    """
+    二进制索引读取器
+
+    使用方法：
+        index = BinaryIndex("data/processed/dyhdc_index.bin")
+        for i in index.find("崇"):
+            offset, length = index.record(i)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, byteorder, n, key_offsets_pos, keys_pos,
+         offsets_pos, lengths_pos, meta_pos, meta_len) = _HEADER_V1.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"不是二进制索引文件: {self.path}")
+        if version not in (1, VERSION):
+            self._mm.close()
+            raise ValueError(f"不支持的索引版本 {version}: {self.path}")
+        # v1 索引没有单字键表，精确查找退回二分
+        exact_pos, exact_count = _HEADER.unpack_from(self._mm, 0)[-2:] if version >= 2 else (0, 0)
+        if byteorder != (0 if sys.byteorder == 'little' else 1):
+            self._mm.close()
+            raise ValueError(f"索引字节序与本机不一致，请重新构建: {self.path}")
+
+        self._n = n
+        self._keys_pos = keys_pos
+        self._meta_pos = meta_pos
+        self._meta_len = meta_len
+        view = memoryview(self._mm)
+        self._key_offsets = view[key_offsets_pos:key_offsets_pos + 4 * (n + 1)].cast('I')
+        self._offsets = view[offsets_pos:offsets_pos + 8 * n].cast('Q')
+        self._lengths = view[lengths_pos:lengths_pos + 4 * n].cast('I')
+        self._exact = view[exact_pos:exact_pos + 12 * exact_count].cast('I')
+        view.release()
+        self._exact_count = exact_count
+        self._exact_map: Optional[Dict[str, Tuple[int, int]]] = None
+        self._meta: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __enter__(self) -> "BinaryIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """元信息（首次访问时解析）"""
+        if self._meta is None:
+            raw = self._mm[self._meta_pos:self._meta_pos + self._meta_len]
+            self._meta = json.loads(raw.decode('utf-8')) if raw else {}
+        return self._meta
+
+    def key_bytes(self, i: int) -> bytes:
+        start = self._keys_pos + self._key_offsets[i]
+        end = self._keys_pos + self._key_offsets[i + 1]
+        return self._mm[start:end]
+
+    def key(self, i: int) -> str:
+        return self.key_bytes(i).decode('utf-8')
+
+    def record(self, i: int) -> Tuple[int, int]:
+        """返回第 i 条记录的 (偏移量, 长度)"""
+        return self._offsets[i], self._lengths[i]
+
+    def _bisect(self, key: bytes, lo: int = 0) -> int:
+        return bisect_left(_KeyView(self), key, lo, self._n)
+
+    def find(self, key: str) -> range:
+        """精确匹配：返回键等于 key 的记录下标区间"""
+        if len(key) == 1:
+            return self.find_char(key)
+        return self._find_sorted(key)
+
+    def _find_sorted(self, key: str) -> range:
+        encoded = key.encode('utf-8')
+        lo = self._bisect(encoded)
+        # 词头中不含 NUL，排在 key+b"\0" 之前且不小于 key 的只有 key 本身
+        hi = self._bisect(encoded + b"\0", lo)
+        return range(lo, hi)
+
+    def find_char(self, char: str) -> range:
+        """单字精确匹配，查单字键表（O(1)）"""
+        if not self._exact_count:
+            return self._find_sorted(char)
+        if self._exact_map is None:
+            table = self._exact
+            self._exact_map = {
+                chr(table[j]): (table[j + 1], table[j + 2])
+                for j in range(0, 3 * self._exact_count, 3)
+            }
+        start, count = self._exact_map.get(char, (0, 0))
+        return range(start, start + count)
+
+    def prefix_range(self, prefix: str) -> range:
+        """前缀匹配：返回以 prefix 开头的所有记录下标区间"""
+        encoded = prefix.encode('utf-8')
+        lo = self._bisect(encoded)
+        hi = self._bisect(encoded + b"\xff", lo)
+        return range(lo, hi)
+
+    def close(self) -> None:
+        """释放映射"""
+        if self._mm is None:
+            return
+        self._key_offsets.release()
+        self._offsets.release()
+        self._lengths.release()
+        self._exact.release()
+        self._mm.close()
+        self._mm = None
+
+
+class _KeyView:
+    """让 bisect 直接在 mmap 中的排序键上二分"""
+
+    __slots__ = ("_index",)
+
+    def __init__(self, index: BinaryIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._index.key_bytes(i)
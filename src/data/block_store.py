@@ -0,0 +1,254 @@
+"""
+《汉语大词典》压缩分块存储（zstd）
+
+负责人：成员E（数据工程）
+
+把JSONL按整行切成若干块（默认每块约128KB），每块单独压缩成一个zstd帧，并附块表：
+    [可跳过帧: 魔数 + 元信息JSON]
+    [zstd帧: 块0] [zstd帧: 块1] ...
+    [可跳过帧: 块表 (n+1)×uint64 原始偏移 + (n+1)×uint64 文件偏移 + 尾部(块表位置, 块数, 魔数)]
+
+头尾都放在zstd"可跳过帧"里，整个文件仍是合法的zstd流，`zstd -d` 即可还原出原JSONL。
+
+偏移量索引中记录的仍是原JSONL的字节偏移（逻辑偏移），索引无需重建：
+读取时按逻辑偏移二分查找所在块，只解压这一块，最近用过的若干块缓存在内存中。
+
+依赖 zstandard（可选）：pip install zstandard
+"""
+import json
+import mmap
+import struct
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+
+STORE_MAGIC = b"DYHDCZS1"
+DEFAULT_BLOCK_SIZE = 128 * 1024
+DEFAULT_CACHE_BLOCKS = 16
+
+_SKIPPABLE_MAGIC = 0x184D2A50  # zstd 可跳过帧
+_FRAME_HEADER = struct.Struct("<II")  # 帧魔数, 负载长度
+_FOOTER = struct.Struct("<QQ8s")  # 块表位置, 块数, 魔数
+
+
+def is_block_store(path) -> bool:
+    """判断文件是否为压缩分块存储"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_FRAME_HEADER.size + len(STORE_MAGIC))
+    except OSError:
+        return False
+    if len(head) < _FRAME_HEADER.size + len(STORE_MAGIC):
+        return False
+    frame_magic, _ = _FRAME_HEADER.unpack_from(head)
+    return frame_magic == _SKIPPABLE_MAGIC and head[_FRAME_HEADER.size:] == STORE_MAGIC
+
+
+def _require_zstd() -> None:
+    if zstd is None:
+        raise ImportError("读取压缩存储需要 zstandard：pip install zstandard")
+
+
+def convert_jsonl_to_store(
+    jsonl_path: str = None,
+    output_path: str = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    level: int = 9,
+) -> Dict[str, Any]:
+    """
+    把JSONL转换为压缩分块存储
+
+    Args:
+        jsonl_path: 源JSONL（默认 dyhdc.parsed.fixed.v2.jsonl）
+        output_path: 输出路径（默认 data/processed/dyhdc.jsonl.zst）
+        block_size: 每块的目标原始字节数；块越小单次读取越快，压缩率越低
+        level: zstd 压缩级别
+
+    Returns:
+        元信息（块数、原始大小、压缩后大小等）；zstandard 未安装时为空字典
+    """
+    if zstd is None:
+        print("警告: zstandard未安装，无法生成压缩存储（pip install zstandard）")
+        return {}
+
+    project_root = Path(__file__).parent.parent.parent
+    if jsonl_path is None:
+        jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
+    if output_path is None:
+        output_path = project_root / "data/processed/dyhdc.jsonl.zst"
+
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        print(f"错误: 文件不存在: {jsonl_path}")
+        return {}
+
+    stat = jsonl_path.stat()
+    meta = {
+        "block_size": block_size,
+        "level": level,
+        # 源文件指纹，与偏移量索引中的指纹对照判断是否一致
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+    }
+    print(f"正在生成压缩存储: {jsonl_path} -> {output_path}")
+    print(f"文件大小: {stat.st_size / 1024 / 1024:.1f} MB")
+    start_time = time.time()
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    compressor = zstd.ZstdCompressor(level=level)
+    logical = [0]
+    physical = []
+    with open(jsonl_path, 'rb') as src, open(tmp_path, 'wb') as out:
+        header = STORE_MAGIC + json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        out.write(_FRAME_HEADER.pack(_SKIPPABLE_MAGIC, len(header)) + header)
+
+        def flush(chunk: bytes) -> None:
+            physical.append(out.tell())
+            out.write(compressor.compress(chunk))
+            logical.append(logical[-1] + len(chunk))
+            if len(physical) % 2000 == 0:
+                print(f"  已压缩 {logical[-1] / stat.st_size:.0%} ({time.time() - start_time:.1f}s)")
+
+        pending = []
+        pending_size = 0
+        for line in src:
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= block_size:
+                flush(b"".join(pending))
+                pending = []
+                pending_size = 0
+        if pending:
+            flush(b"".join(pending))
+        physical.append(out.tell())
+
+        n_blocks = len(physical) - 1
+        table = struct.pack(f"<{n_blocks + 1}Q", *logical) + struct.pack(f"<{n_blocks + 1}Q", *physical)
+        table_pos = out.tell() + _FRAME_HEADER.size
+        payload = table + _FOOTER.pack(table_pos, n_blocks, STORE_MAGIC)
+        out.write(_FRAME_HEADER.pack(_SKIPPABLE_MAGIC, len(payload)) + payload)
+    tmp_path.replace(output_path)
+
+    compressed = output_path.stat().st_size
+    elapsed = time.time() - start_time
+    print(f"压缩存储完成: {n_blocks} 块, {compressed / 1024 / 1024:.1f} MB, "
+          f"压缩比 {stat.st_size / max(compressed, 1):.1f}x")
+    print(f"耗时: {elapsed:.1f}s")
+    return dict(meta, blocks=n_blocks, raw_bytes=stat.st_size, compressed_bytes=compressed)
+
+
+class BlockStore:
+    """
+    压缩分块存储读取器
+
+    read(offset, length) 与按偏移读原JSONL等价；可被多个线程同时调用。
+
+    使用方法：
+        with BlockStore("data/processed/dyhdc.jsonl.zst") as store:
+            line = store.read(offset, length)
+    """
+
+    def __init__(self, path, cache_blocks: int = DEFAULT_CACHE_BLOCKS):
+        _require_zstd()
+        self.path = Path(path)
+        self.cache_blocks = cache_blocks
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, header_len = _FRAME_HEADER.unpack_from(self._mm, 0)
+        header = self._mm[_FRAME_HEADER.size:_FRAME_HEADER.size + header_len]
+        if not header.startswith(STORE_MAGIC):
+            self._mm.close()
+            raise ValueError(f"不是压缩分块存储: {self.path}")
+        self.meta: Dict[str, Any] = json.loads(header[len(STORE_MAGIC):].decode('utf-8'))
+
+        table_pos, n_blocks, magic = _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+        if magic != STORE_MAGIC:
+            self._mm.close()
+            raise ValueError(f"压缩存储不完整（缺少块表）: {self.path}")
+        view = memoryview(self._mm)
+        table = view[table_pos:table_pos + 16 * (n_blocks + 1)].cast('Q')
+        self._logical = table[:n_blocks + 1]
+        self._physical = table[n_blocks + 1:]
+        view.release()
+        self._n_blocks = n_blocks
+
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 解压器不是线程安全的，每个线程一个
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """块数"""
+        return self._n_blocks
+
+    def __enter__(self) -> "BlockStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def raw_size(self) -> int:
+        """原JSONL的字节数"""
+        return self._logical[self._n_blocks]
+
+    def _decompress(self, block: int) -> bytes:
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = zstd.ZstdDecompressor()
+        start, end = self._physical[block], self._physical[block + 1]
+        return decompressor.decompress(self._mm[start:end])
+
+    def block(self, block: int) -> bytes:
+        """取第 block 块的原始内容（命中缓存则不解压）"""
+        with self._lock:
+            data = self._blocks.get(block)
+            if data is not None:
+                self._blocks.move_to_end(block)
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = self._decompress(block)
+        with self._lock:
+            self._blocks[block] = data
+            while len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+        return data
+
+    def read(self, offset: int, length: int) -> bytes:
+        """按原JSONL中的字节偏移读取；记录按整行分块，通常只落在一块内"""
+        parts = []
+        end = offset + length
+        block = bisect_right(self._logical, offset) - 1
+        while offset < end and 0 <= block < self._n_blocks:
+            block_start = self._logical[block]
+            data = self.block(block)
+            piece = data[offset - block_start:end - block_start]
+            if not piece:
+                break
+            parts.append(piece)
+            offset += len(piece)
+            block += 1
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def close(self) -> None:
+        """释放映射与缓存"""
+        if self._mm is None:
+            return
+        self._logical.release()
+        self._physical.release()
+        self._mm.close()
+        self._mm = None
+        self._blocks.clear()
@@ -0,0 +1,156 @@
+"""
+单字繁简对照表
+
+负责人：成员E（数据工程）
+
+PhonologyTool 每查一个字都要经过 OpenCC('s2t').convert，PatternTool 每句都要 OpenCC('t2s')；
+OpenCC 的构造与逐次调用开销远大于一次字典查询。这里在构建音韵数据时从 OpenCC 的单字词典
+（STCharacters / TSCharacters）一次性导出 简->繁、繁->简 两张单字表，随 phonology.bin 一起存储：
+    干 -> 幹 乾 干      （一简多繁，首个为 OpenCC 的默认转换）
+    乾 -> 干 乾
+运行时转换只是查表（整句用 str.translate），不需要安装 opencc；
+只有音韵文件里没有对照表时才临时退回 OpenCC 构建。
+
+整句按单字转换，不处理 OpenCC 的词组规则（如"乾隆"不转"干"以外的写法），训诂句的简化归一化够用。
+
+使用方法：
+    converter = get_converter()
+    converter.convert("說文解字", "t2s")          # "说文解字"
+    converter.candidates("干", "s2t")            # ["幹", "乾", "干"]
+    converter.convert_batch(["崇", "终"], "s2t")  # ["崇", "終"]
+"""
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DIRECTIONS = ("s2t", "t2s")
+# OpenCC 单字词典文件（opencc-python-reimplemented 随包附带）
+_OPENCC_FILES = {"s2t": "STCharacters.txt", "t2s": "TSCharacters.txt"}
+# 官方 opencc 不附文本词典时逐字转换的范围：CJK 基本区
+_CJK_BASIC = range(0x4E00, 0xA000)
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "processed" / "phonology.bin"
+
+CharTables = Tuple[Dict[str, List[str]], Dict[str, List[str]]]
+
+
+def _read_opencc_dictionary(path: Path) -> Dict[str, List[str]]:
+    table = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, _, values = line.rstrip('\n').partition('\t')
+            if key and values:
+                table[key] = values.split()
+    return table
+
+
+def load_opencc_tables(chars: Iterable[str] = ()) -> CharTables:
+    """
+    从 OpenCC 导出单字对照表（构建时使用）
+
+    优先读 OpenCC 自带的单字词典（含一对多）；没有文本词典时对 CJK 基本区与 chars 逐字转换（只得一对一）。
+    opencc 未安装时返回两张空表。
+
+    Returns:
+        (s2t, t2s)：字 -> 候选列表，只收录与原字不同或有多个候选的字
+    """
+    try:
+        import opencc
+    except ImportError:
+        print("警告: opencc未安装，无法生成繁简对照表")
+        return {}, {}
+
+    dictionary_dir = Path(opencc.__file__).parent / "dictionary"
+    if all((dictionary_dir / name).exists() for name in _OPENCC_FILES.values()):
+        s2t, t2s = (_read_opencc_dictionary(dictionary_dir / _OPENCC_FILES[d]) for d in DIRECTIONS)
+        return s2t, t2s
+
+    universe = sorted({chr(code) for code in _CJK_BASIC} | set(chars))
+    tables = []
+    for direction in DIRECTIONS:
+        cc = opencc.OpenCC(direction)
+        table = {}
+        for char in universe:
+            converted = cc.convert(char)
+            if converted != char and len(converted) == 1:
+                table[char] = [converted]
+        tables.append(table)
+    return tables[0], tables[1]
+
+
+class CharConverter:
+    """
+    单字繁简转换：查表，不依赖 opencc
+
+    表中没有的字原样返回。
+    """
+
+    def __init__(self, s2t: Optional[Dict[str, Sequence[str]]] = None,
+                 t2s: Optional[Dict[str, Sequence[str]]] = None):
+        self._tables: Dict[str, Dict[str, Tuple[str, ...]]] = {
+            "s2t": {k: tuple(v) for k, v in (s2t or {}).items() if v},
+            "t2s": {k: tuple(v) for k, v in (t2s or {}).items() if v},
+        }
+        # str.translate 用的 码位 -> 默认转换 表
+        self._translate = {
+            direction: {ord(k): v[0] for k, v in table.items() if v[0] != k}
+            for direction, table in self._tables.items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self._tables.values())
+
+    @classmethod
+    def from_store(cls, store) -> "CharConverter":
+        """从 PhonologyStore 中的对照表构建"""
+        s2t, t2s = store.char_tables()
+        return cls(s2t, t2s)
+
+    @classmethod
+    def from_opencc(cls) -> "CharConverter":
+        """临时从 OpenCC 构建（音韵文件中没有对照表时的后备）"""
+        return cls(*load_opencc_tables())
+
+    @classmethod
+    def load(cls, path=None) -> "CharConverter":
+        """读音韵文件中的对照表；文件不存在或没有对照表时退回 OpenCC"""
+        from .phonology_store import PhonologyStore, is_phonology_store
+
+        path = Path(path) if path else DEFAULT_STORE_PATH
+        if is_phonology_store(path):
+            with PhonologyStore.open(path) as store:
+                converter = cls.from_store(store)
+            if len(converter):
+                return converter
+        return cls.from_opencc()
+
+    def candidates(self, char: str, direction: str = "s2t") -> List[str]:
+        """某字的全部候选（默认转换在前）；表中没有时为 [原字]"""
+        return list(self._tables[direction].get(char, (char,)))
+
+    def convert_char(self, char: str, direction: str = "s2t") -> str:
+        """单字默认转换"""
+        return self._tables[direction].get(char, (char,))[0]
+
+    def convert(self, text: str, direction: str = "s2t") -> str:
+        """逐字转换一段文本"""
+        return text.translate(self._translate[direction])
+
+    def convert_batch(self, texts: Iterable[str], direction: str = "s2t") -> List[str]:
+        """批量转换"""
+        table = self._translate[direction]
+        return [text.translate(table) for text in texts]
+
+
+_shared_converter: Optional[CharConverter] = None
+_shared_lock = threading.Lock()
+
+
+def get_converter() -> CharConverter:
+    """进程内共享的转换器（首次调用时从 data/processed/phonology.bin 读取对照表）"""
+    global _shared_converter
+    with _shared_lock:
+        if _shared_converter is None:
+            _shared_converter = CharConverter.load()
+        return _shared_converter
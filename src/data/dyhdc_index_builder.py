@@ -4,16 +4,27 @@
 负责人：成员E（数据工程）
 
 解决1.9GB大文件的快速查询问题：
-1. 构建字→文件偏移量索引
+1. 构建字→文件偏移量索引（默认为mmap二进制格式，见 binary_index）
 2. 支持按需加载单个字的条目
 3. 可选：构建SQLite数据库
 """
+import hashlib
 import json
+import os
+import re
 import sqlite3
+import threading
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from dataclasses import dataclass
 import time
+import zlib
+
+from .binary_index import BinaryIndex, is_binary_index, write_binary_index
+from .block_store import BlockStore, is_block_store
+from .entry_cache import DEFAULT_CACHE_BYTES, EntryCache
+from .jsonl_codec import DECODE_ERRORS, decode_entry, loads
 
 
 @dataclass
@@ -25,73 +36,338 @@ class IndexEntry:
     headword: str  # 完整词头
 
 
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024  # 并行构建时每个区间的目标字节数
+_ANCHOR_MASK = 0xF  # 区间边界锚点行的判定掩码
+CHUNKING_VERSION = 2  # 区间切分规则版本，规则不同的旧索引不做增量复用
+
+# process_jsonl 输出的每行以 headword 开头，可直接从字节串中截取
+_HEADWORD_RE = re.compile(rb'^\{\s*"headword"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _is_anchor_line(line: bytes) -> bool:
+    """锚点行：行内容的CRC32低位全为0（约每16行一个），区间边界只落在锚点行首"""
+    return zlib.crc32(line) & _ANCHOR_MASK == 0
+
+
+def split_line_ranges(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    将文件切成按换行对齐的字节区间
+    
+    边界由内容决定：从上一个边界起跳过 chunk_size 字节后，切在第一个锚点行的行首
+    （再过 chunk_size 字节仍无锚点行时直接切在该处）。因此在文件前部插入或删除几行后，
+    只有受影响的区间会变化，之后的区间整体平移，增量构建仍可复用。
+    
+    Returns:
+        [(起始偏移, 结束偏移), ...]，首尾相接覆盖整个文件，每个区间都从行首开始
+    """
+    size = Path(path).stat().st_size
+    bounds = [0]
+    with open(path, 'rb') as f:
+        while bounds[-1] + chunk_size < size:
+            target = bounds[-1] + chunk_size
+            f.seek(target)
+            pos = target + len(f.readline())  # 跳到下一个行首
+            limit = target + chunk_size
+            while pos < size and pos < limit:
+                line = f.readline()
+                if _is_anchor_line(line):
+                    break
+                pos += len(line)
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _extract_headword(line: bytes) -> str:
+    """从一行JSONL中取出词头，能截取就不做完整解析"""
+    match = _HEADWORD_RE.match(line)
+    if match:
+        raw = match.group(1)
+        headword = loads(b'"' + raw + b'"') if b'\\' in raw else raw.decode('utf-8')
+        if headword:
+            return headword
+    # 字段顺序不同、headword 为空（退回 hw）等少数情况
+    try:
+        entry = loads(line)
+    except DECODE_ERRORS:
+        return ""
+    if not isinstance(entry, dict):
+        return ""
+    return entry.get("headword", "") or entry.get("hw", "")
+
+
+# ===== SQLite 全文检索 =====
+
+# 规范化表结构：词条、义项、例证、交叉引用、音韵各占一表，二级索引在批量插入后再建
+_SQLITE_SCHEMA = """
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY,
+    headword TEXT NOT NULL,
+    first_char TEXT NOT NULL,
+    hw TEXT,
+    simplified TEXT,
+    pronunciation TEXT,
+    redirect_to TEXT
+);
+CREATE TABLE senses (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entries(id),
+    seq INTEGER NOT NULL,
+    mean TEXT,
+    see TEXT
+);
+CREATE TABLE examples (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entries(id),
+    sense_id INTEGER NOT NULL REFERENCES senses(id),
+    seq INTEGER NOT NULL,
+    books TEXT,
+    quotes TEXT,
+    text TEXT
+);
+CREATE TABLE cross_refs (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entries(id),
+    sense_id INTEGER REFERENCES senses(id),
+    kind TEXT NOT NULL,
+    text TEXT,
+    target TEXT
+);
+CREATE TABLE yinyun (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entries(id),
+    seq INTEGER NOT NULL,
+    text TEXT,
+    books TEXT
+);
+CREATE VIRTUAL TABLE senses_fts USING fts5(mean, content='');
+CREATE VIRTUAL TABLE examples_fts USING fts5(quotes, content='');
+"""
+
+_SQLITE_INDEXES = """
+CREATE INDEX idx_entries_headword ON entries(headword);
+CREATE INDEX idx_entries_first_char ON entries(first_char);
+CREATE INDEX idx_entries_simplified ON entries(simplified);
+CREATE INDEX idx_senses_entry ON senses(entry_id, seq);
+CREATE INDEX idx_examples_sense ON examples(sense_id, seq);
+CREATE INDEX idx_examples_entry ON examples(entry_id);
+CREATE INDEX idx_cross_refs_entry ON cross_refs(entry_id);
+CREATE INDEX idx_cross_refs_target ON cross_refs(target);
+CREATE INDEX idx_yinyun_entry ON yinyun(entry_id, seq);
+"""
+
+# FTS5 的 unicode61 分词器把连续汉字当作一个词，入库前在每个汉字两侧加空格，
+# 使每个字成为一个词元；检索时把查询串按同样方式切开做短语匹配，即可查任意长度的子串
+_CJK_RE = re.compile(r'([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0003ffff])')
+
+
+def _fts_text(text: Optional[str]) -> str:
+    """把文本转换为按字分词的FTS内容"""
+    return _CJK_RE.sub(r' \1 ', text) if text else ""
+
+
+def _fts_phrase(query: str) -> str:
+    """把查询串转换为FTS5短语（按字相邻匹配）"""
+    tokens = _fts_text(query).split()
+    return '"' + " ".join(tokens).replace('"', '""') + '"'
+
+
+# 义项中标示假借关系的术语
+JIAJIE_TERMS = ("读为", "读曰", "通", "假借", "读如")
+
+
+def format_entry(entry: Dict) -> Dict:
+    """把原始词条整理为工具使用的格式（字、简体、读音、本义、义项、例句、假借标注）"""
+    headword = entry.get("headword", "") or entry.get("hw", "")
+    simplified = entry.get("simp", "")
+    pronunciation = entry.get("pron", "")
+    
+    senses = entry.get("senses", [])
+    meanings = []
+    examples = []
+    jiajie_notes = []
+    
+    for sense in senses:
+        mean = sense.get("mean", "")
+        if mean:
+            meanings.append(mean)
+            
+            # 检查假借标注
+            if any(kw in mean for kw in JIAJIE_TERMS):
+                jiajie_notes.append(mean)
+        
+        # 提取例句
+        for ex in sense.get("examples", []):
+            text = ex.get("text", "")
+            if text:
+                examples.append(text[:200])  # 限制长度
+    
+    return {
+        "字": headword,
+        "简体": simplified,
+        "读音": pronunciation,
+        "本义": meanings[0] if meanings else "",
+        "义项": meanings[:10],  # 限制数量
+        "例句": examples[:5],
+        "假借标注": jiajie_notes,
+    }
+
+
+def _scan_range(task: Tuple[str, int, int]) -> Tuple[List[Tuple[str, int, int]], str]:
+    """进程池任务：扫描一个字节区间，返回 ((词头, 偏移量, 长度) 列表, 区间哈希)"""
+    path, start, end = task
+    records = []
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            length = len(line)
+            digest.update(line)
+            
+            headword = _extract_headword(line)
+            # 跳过元信息行
+            if headword and not headword.startswith('#'):
+                records.append((headword, offset, length))
+            
+            offset += length
+    return records, digest.hexdigest()
+
+
+def _hash_range(task: Tuple[str, int, int]) -> str:
+    """进程池任务：只计算一个字节区间的哈希（增量构建时判断区间是否变化）"""
+    path, start, end = task
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _load_previous_index(index_path, chunk_size: int) -> Optional[Dict[str, Any]]:
+    """
+    读取旧索引的指纹，并把记录按旧区间归组，供增量构建复用
+    
+    Returns:
+        {"chunks": [((起始, 结束, 哈希), [(词头, 偏移量, 长度), ...]), ...]}；
+        旧索引不存在、没有指纹、区间大小或切分规则不同时返回 None
+    """
+    index_path = Path(index_path)
+    if not index_path.exists():
+        return None
+    
+    if is_binary_index(index_path):
+        with BinaryIndex(index_path) as index:
+            fingerprint = index.meta.get("fingerprint")
+            records = [(index.key(i), *index.record(i)) for i in range(len(index))] if fingerprint else []
+    else:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        fingerprint = data.get("fingerprint")
+        records = [
+            (info["headword"], info["offset"], info["length"])
+            for infos in data.get("index", {}).values()
+            for info in infos
+        ]
+    
+    if (not fingerprint or fingerprint.get("chunk_size") != chunk_size
+            or fingerprint.get("chunking") != CHUNKING_VERSION):
+        return None
+    
+    chunks = [tuple(chunk) for chunk in fingerprint["chunks"]]
+    starts = [start for start, _end, _digest in chunks]
+    grouped: List[List[Tuple[str, int, int]]] = [[] for _ in chunks]
+    for record in sorted(records, key=lambda r: r[1]):
+        grouped[bisect_right(starts, record[1]) - 1].append(record)
+    return {"chunks": list(zip(chunks, grouped))}
+
+
 class DYHDCIndexBuilder:
     """
     汉语大词典索引构建器
     
     使用方法：
         builder = DYHDCIndexBuilder("path/to/dyhdc.jsonl")
-        builder.build_index("path/to/index.json")
+        builder.build_index("path/to/index.bin")   # 二进制索引（推荐）
+        builder.build_index("path/to/index.json")  # 旧版JSON索引
     """
     
     def __init__(self, jsonl_path: str):
         self.jsonl_path = Path(jsonl_path)
-        self.index: Dict[str, List[Dict]] = {}  # 字 -> [偏移量列表]
+        self.index: Dict[str, List[Dict]] = {}  # 首字 -> [偏移量列表]（含复合词）
+        self.exact: Dict[str, List[Dict]] = {}  # 单字词头 -> [偏移量列表]
+        self.fingerprint: Dict[str, Any] = {}  # 源文件指纹（大小、修改时间、区间哈希）
     
-    def build_index(self, output_path: str = None) -> Dict:
+    def build_index(
+        self,
+        output_path: str = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        incremental: bool = False,
+    ) -> Dict:
         """
         构建偏移量索引
         
-        遍历JSONL文件，记录每个字的文件偏移位置
+        将JSONL按换行对齐切成若干字节区间，由进程池并行扫描（二进制模式，
+        只抽取 headword，不做完整JSON解析），再按区间顺序合并。
+        索引中会记录源文件指纹（大小、修改时间、各区间哈希）。
+        
+        Args:
+            output_path: 索引输出路径；以 .json 结尾时写旧版JSON格式，否则写二进制格式
+            workers: 进程数，默认为CPU核数；为1时在当前进程内顺序扫描
+            chunk_size: 每个区间的目标字节数
+            incremental: 若 output_path 处已有带指纹的索引，只重新扫描哈希变化的区间，
+                未变化区间的记录直接沿用（按新位置平移偏移量）
         """
         if not self.jsonl_path.exists():
             print(f"错误: 文件不存在: {self.jsonl_path}")
             return {}
         
+        stat = self.jsonl_path.stat()
         print(f"正在构建索引: {self.jsonl_path}")
-        print(f"文件大小: {self.jsonl_path.stat().st_size / 1024 / 1024:.1f} MB")
+        print(f"文件大小: {stat.st_size / 1024 / 1024:.1f} MB")
         
         start_time = time.time()
-        count = 0
-        offset = 0
+        self.index = {}
+        self.exact = {}
         
-        with open(self.jsonl_path, 'r', encoding='utf-8') as f:
-            while True:
-                line = f.readline()
-                if not line:
-                    break
-                
-                line_length = len(line.encode('utf-8'))
-                
-                try:
-                    entry = json.loads(line.strip())
-                    headword = entry.get("headword", "") or entry.get("hw", "")
-                    
-                    # 跳过元信息行
-                    if headword and not headword.startswith('#'):
-                        # 提取第一个字作为索引键
-                        first_char = headword[0]
-                        
-                        if first_char not in self.index:
-                            self.index[first_char] = []
-                        
-                        self.index[first_char].append({
-                            "headword": headword,
-                            "offset": offset,
-                            "length": line_length
-                        })
-                        
-                        count += 1
-                        
-                        if count % 50000 == 0:
-                            elapsed = time.time() - start_time
-                            print(f"  已处理 {count} 条... ({elapsed:.1f}s)")
-                
-                except json.JSONDecodeError:
-                    pass
-                
-                offset += line_length
+        ranges = split_line_ranges(self.jsonl_path, chunk_size)
         
+        previous = None
+        if incremental and output_path:
+            previous = _load_previous_index(output_path, chunk_size)
+            if previous is None:
+                print("  未找到可复用的旧索引（或区间大小、切分规则不同），执行全量构建")
+        
+        if previous is None:
+            hashes = []
+            for records, digest in self._run_ranges(_scan_range, ranges, workers, start_time):
+                hashes.append(digest)
+                for headword, offset, length in records:
+                    self._add_record(headword, offset, length)
+        else:
+            hashes = self._build_incremental(ranges, previous, workers, start_time)
+        
+        self.fingerprint = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunk_size": chunk_size,
+            "chunking": CHUNKING_VERSION,
+            "chunks": [[start, end, digest] for (start, end), digest in zip(ranges, hashes)],
+        }
+        
+        count = sum(len(v) for v in self.index.values())
         elapsed = time.time() - start_time
         print(f"索引构建完成: {count} 条词条, {len(self.index)} 个首字")
         print(f"耗时: {elapsed:.1f}s")
@@ -102,22 +378,135 @@ class DYHDCIndexBuilder:
         
         return self.index
     
-    def _save_index(self, output_path: str):
-        """保存索引到JSON文件"""
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
+    def _build_incremental(
+        self,
+        ranges: List[Tuple[int, int]],
+        previous: Dict[str, Any],
+        workers: Optional[int],
+        start_time: float,
+    ) -> List[str]:
+        """增量构建：复用哈希未变的区间，只扫描变化的区间；返回各区间哈希"""
+        print("  计算区间哈希...")
+        hashes = list(self._run_ranges(_hash_range, ranges, workers, start_time))
+        
+        # 旧索引中 哈希 -> (旧起始偏移, 旧区间内的记录)
+        old_chunks = previous["chunks"]
+        reusable = {digest: (start, records) for (start, _end, digest), records in old_chunks}
+        
+        changed = [r for r, digest in zip(ranges, hashes) if digest not in reusable]
+        print(f"  复用 {len(ranges) - len(changed)}/{len(ranges)} 个区间，重新扫描 {len(changed)} 个")
+        scanned = iter(self._run_ranges(_scan_range, changed, workers, start_time))
+        
+        for (start, _end), digest in zip(ranges, hashes):
+            if digest in reusable:
+                old_start, records = reusable[digest]
+                shift = start - old_start
+                records = [(headword, offset + shift, length) for headword, offset, length in records]
+            else:
+                records, _ = next(scanned)
+            for headword, offset, length in records:
+                self._add_record(headword, offset, length)
+        return hashes
+    
+    def _run_ranges(
+        self,
+        func,
+        ranges: List[Tuple[int, int]],
+        workers: Optional[int],
+        start_time: float,
+    ) -> Iterator[Any]:
+        """在进程池中对各区间执行 func，按区间顺序产出结果，并汇报所有进程的总进度"""
+        if not ranges:
+            return
+        total_bytes = sum(end - start for start, end in ranges) or 1
+        workers = min(workers or os.cpu_count() or 1, len(ranges)) or 1
+        tasks = [(str(self.jsonl_path), start, end) for start, end in ranges]
         
-        # 统计信息
-        stats = {
+        def report(done_bytes: int) -> None:
+            elapsed = time.time() - start_time
+            print(f"  已处理 {done_bytes / total_bytes:.0%} ({elapsed:.1f}s)")
+        
+        done_bytes = 0
+        next_report = 0.1
+        if workers == 1:
+            results = map(func, tasks)
+            pool = None
+        else:
+            from multiprocessing import Pool
+            pool = Pool(workers)
+            # imap 保持区间顺序，已完成的区间可立即合并
+            results = pool.imap(func, tasks)
+        try:
+            for (start, end), result in zip(ranges, results):
+                done_bytes += end - start
+                # 每完成约10%汇报一次
+                if done_bytes / total_bytes >= next_report:
+                    report(done_bytes)
+                    next_report = done_bytes / total_bytes + 0.1
+                yield result
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    
+    def _add_record(self, headword: str, offset: int, length: int) -> None:
+        """将一条记录加入首字桶和单字词头表"""
+        # 提取第一个字作为索引键
+        self.index.setdefault(headword[0], []).append({
+            "headword": headword,
+            "offset": offset,
+            "length": length
+        })
+        
+        # 单字词头另记一份，查单字时无需遍历整个首字桶
+        if len(headword) == 1:
+            self.exact.setdefault(headword, []).append({
+                "offset": offset,
+                "length": length
+            })
+    
+    def _stats(self) -> Dict[str, Any]:
+        """索引统计信息"""
+        return {
             "source": str(self.jsonl_path),
             "total_chars": len(self.index),
+            "total_single_chars": len(self.exact),
             "total_entries": sum(len(v) for v in self.index.values()),
             "build_time": time.strftime("%Y-%m-%d %H:%M:%S"),
         }
+    
+    def _save_index(self, output_path: str):
+        """保存索引，按扩展名选择格式"""
+        if Path(output_path).suffix == ".json":
+            self._save_json_index(output_path)
+        else:
+            self._save_binary_index(output_path)
+    
+    def _save_binary_index(self, output_path: str):
+        """保存为mmap二进制索引（排序词头 + 偏移量/长度数组 + 单字键表）"""
+        path = Path(output_path)
+        records = (
+            (info["headword"], info["offset"], info["length"])
+            for infos in self.index.values()
+            for info in infos
+        )
+        write_binary_index(path, records, meta={"stats": self._stats(), "fingerprint": self.fingerprint})
+        
+        file_size = path.stat().st_size / 1024 / 1024
+        print(f"索引已保存到: {path} ({file_size:.1f} MB)")
+    
+    def _save_json_index(self, output_path: str):
+        """保存索引到JSON文件"""
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        stats = self._stats()
         
         output_data = {
             "stats": stats,
-            "index": self.index
+            "index": self.index,
+            "exact": self.exact,
+            "fingerprint": self.fingerprint
         }
         
         with open(path, 'w', encoding='utf-8') as f:
@@ -126,11 +515,17 @@ class DYHDCIndexBuilder:
         file_size = path.stat().st_size / 1024 / 1024
         print(f"索引已保存到: {path} ({file_size:.1f} MB)")
     
-    def build_sqlite_db(self, db_path: str):
+    def build_sqlite_db(self, db_path: str, batch_size: int = 2000):
         """
-        构建SQLite数据库（可选）
+        构建规范化的SQLite数据库（可选）
+        
+        表：entries / senses / examples / cross_refs / yinyun，
+        另有 senses_fts、examples_fts 两个FTS5全文索引（释义、例证引文）。
+        构建时使用WAL日志、整个导入只开一个事务，二级索引与全文索引在插入完成后统一建立。
         
-        适用于需要更复杂查询的场景
+        Args:
+            db_path: 数据库输出路径
+            batch_size: 每批写入的词条数
         """
         if not self.jsonl_path.exists():
             print(f"错误: 文件不存在: {self.jsonl_path}")
@@ -139,102 +534,115 @@ class DYHDCIndexBuilder:
         path = Path(db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        # 删除已有数据库
-        if path.exists():
-            path.unlink()
+        # 删除已有数据库（含WAL残留文件）
+        for stale in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+            if stale.exists():
+                stale.unlink()
         
         print(f"正在构建SQLite数据库: {db_path}")
+        start_time = time.time()
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # 创建表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                headword TEXT NOT NULL,
-                first_char TEXT NOT NULL,
-                simplified TEXT,
-                pronunciation TEXT,
-                primary_meaning TEXT,
-                senses_json TEXT,
-                raw_json TEXT
-            )
-        ''')
-        
-        # 创建索引
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_headword ON entries(headword)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_first_char ON entries(first_char)')
+        conn = sqlite3.connect(str(path), isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-262144")  # 256MB
+        conn.executescript(_SQLITE_SCHEMA)
+        conn.create_function("fts_text", 1, _fts_text, deterministic=True)
+        
+        rows: Dict[str, List[Tuple]] = {name: [] for name in ("entries", "senses", "examples", "cross_refs", "yinyun")}
+        inserts = {
+            "entries": "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            "senses": "INSERT INTO senses VALUES (?, ?, ?, ?, ?)",
+            "examples": "INSERT INTO examples VALUES (?, ?, ?, ?, ?, ?, ?)",
+            "cross_refs": "INSERT INTO cross_refs (entry_id, sense_id, kind, text, target) VALUES (?, ?, ?, ?, ?)",
+            "yinyun": "INSERT INTO yinyun (entry_id, seq, text, books) VALUES (?, ?, ?, ?)",
+        }
+        
+        def flush() -> None:
+            for name, batch in rows.items():
+                if batch:
+                    conn.executemany(inserts[name], batch)
+                    batch.clear()
         
-        start_time = time.time()
         count = 0
-        batch = []
-        batch_size = 1000
-        
-        with open(self.jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    headword = entry.get("headword", "") or entry.get("hw", "")
-                    
+        sense_id = 0
+        example_id = 0
+        conn.execute("BEGIN")
+        try:
+            with open(self.jsonl_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = decode_entry(line)
+                    except DECODE_ERRORS:
+                        continue
+                    headword = entry.key
                     if not headword or headword.startswith('#'):
                         continue
                     
-                    first_char = headword[0]
-                    simplified = entry.get("simp", "")
-                    pronunciation = entry.get("pron", "")
-                    
-                    # 提取第一个义项作为主要释义
-                    senses = entry.get("senses", [])
-                    primary_meaning = ""
-                    if senses:
-                        primary_meaning = senses[0].get("mean", "")[:500]  # 限制长度
-                    
-                    senses_json = json.dumps(senses, ensure_ascii=False)
-                    raw_json = line.strip()
-                    
-                    batch.append((
-                        headword,
-                        first_char,
-                        simplified,
-                        pronunciation,
-                        primary_meaning,
-                        senses_json,
-                        raw_json
+                    count += 1
+                    entry_id = count
+                    rows["entries"].append((
+                        entry_id, headword, headword[0], entry.hw or None,
+                        entry.simp or None, entry.pron or None,
+                        entry.redirect_to or None,
                     ))
                     
-                    count += 1
+                    for seq, sense in enumerate(entry.senses):
+                        sense_id += 1
+                        rows["senses"].append((
+                            sense_id, entry_id, seq, sense.mean,
+                            "；".join(sense.see) or None,
+                        ))
+                        for ex_seq, ex in enumerate(sense.examples):
+                            example_id += 1
+                            rows["examples"].append((
+                                example_id, entry_id, sense_id, ex_seq,
+                                "；".join(ex.books) or None,
+                                "\n".join(ex.quotes) or None,
+                                ex.text or None,
+                            ))
+                        for ref in sense.see_refs:
+                            rows["cross_refs"].append((entry_id, sense_id, "see", ref.text, ref.target))
+                    
+                    for ref in entry.cross_refs:
+                        rows["cross_refs"].append((entry_id, None, "cross_ref", ref.text, ref.target))
+                    for target in entry.variant_of:
+                        rows["cross_refs"].append((entry_id, None, "variant_of", None, target))
+                    for seq, item in enumerate(entry.yinyun):
+                        rows["yinyun"].append((entry_id, seq, item.text, "；".join(item.books) or None))
                     
-                    if len(batch) >= batch_size:
-                        cursor.executemany('''
-                            INSERT INTO entries 
-                            (headword, first_char, simplified, pronunciation, primary_meaning, senses_json, raw_json)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', batch)
-                        conn.commit()
-                        batch = []
-                        
+                    if count % batch_size == 0:
+                        flush()
                         if count % 50000 == 0:
                             elapsed = time.time() - start_time
                             print(f"  已处理 {count} 条... ({elapsed:.1f}s)")
-                
-                except json.JSONDecodeError:
-                    continue
-        
-        # 插入剩余数据
-        if batch:
-            cursor.executemany('''
-                INSERT INTO entries 
-                (headword, first_char, simplified, pronunciation, primary_meaning, senses_json, raw_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', batch)
-            conn.commit()
+            flush()
+            
+            print("  建立索引与全文索引...")
+            # executescript 会先提交当前事务，这里逐条执行以保持单一事务
+            for statement in _SQLITE_INDEXES.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute("INSERT INTO senses_fts(rowid, mean) SELECT id, fts_text(mean) FROM senses")
+            conn.execute("INSERT INTO examples_fts(rowid, quotes) SELECT id, fts_text(quotes) FROM examples WHERE quotes IS NOT NULL")
+            conn.execute("INSERT INTO senses_fts(senses_fts) VALUES('optimize')")
+            conn.execute("INSERT INTO examples_fts(examples_fts) VALUES('optimize')")
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
+            raise
         
+        conn.execute("ANALYZE")
+        # 构建完成后切回普通日志模式，数据库成为单个文件，可只读打开
+        conn.execute("PRAGMA journal_mode=DELETE")
         conn.close()
         
         elapsed = time.time() - start_time
         db_size = path.stat().st_size / 1024 / 1024
-        print(f"数据库构建完成: {count} 条")
+        print(f"数据库构建完成: {count} 条词条, {sense_id} 个义项, {example_id} 条例证")
         print(f"耗时: {elapsed:.1f}s, 大小: {db_size:.1f} MB")
 
 
@@ -242,30 +650,164 @@ class DYHDCIndexLoader:
     """
     汉语大词典索引加载器
     
-    使用预构建的索引快速查询
+    使用预构建的索引快速查询。加载器在生命周期内只打开一次JSONL文件，
+    之后按偏移量做定位读取（pread），不移动共享的文件位置，可被多个线程同时调用。
+    
+    传入 cache 时，query_single_char 的格式化结果按字缓存；
+    各工具应通过 get_shared_loader 共用同一个加载器和缓存。
+    
+    jsonl_path 也可以指向压缩分块存储（block_store.convert_jsonl_to_store 的输出），
+    索引不变，读取时只解压命中的块。
+    
+    使用方法：
+        with DYHDCIndexLoader(jsonl_path, index_path) as loader:
+            loader.query_single_char("崇")
     """
     
-    def __init__(self, jsonl_path: str, index_path: str = None):
+    def __init__(self, jsonl_path: str, index_path: str = None, cache: Optional[EntryCache] = None):
         self.jsonl_path = Path(jsonl_path)
         self.index_path = Path(index_path) if index_path else None
-        self.index: Dict[str, List[Dict]] = {}
+        self.cache = cache  # 格式化词条缓存
+        self.index: Dict[str, List[Dict]] = {}  # 旧版JSON索引
+        self.exact: Dict[str, List[Dict]] = {}  # JSON索引中的单字词头表
+        self._binary: Optional[BinaryIndex] = None  # 二进制索引
+        self._json_fingerprint: Dict[str, Any] = {}  # JSON索引中的源文件指纹
         self._loaded = False
+        self._fd: Optional[int] = None  # JSONL只读描述符
+        self._fd_lock = threading.Lock()
+        self._store: Optional[BlockStore] = None  # 压缩分块存储
+    
+    def __enter__(self) -> "DYHDCIndexLoader":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """关闭JSONL描述符并释放索引映射"""
+        with self._fd_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+        if self._binary is not None:
+            self._binary.close()
+            self._binary = None
+        self._loaded = False
+    
+    def _data_fd(self) -> int:
+        """惰性打开JSONL，之后一直复用同一个描述符"""
+        if self._fd is None:
+            with self._fd_lock:
+                if self._fd is None:
+                    self._fd = os.open(self.jsonl_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        return self._fd
+    
+    def _block_store(self) -> Optional[BlockStore]:
+        """jsonl_path 为压缩分块存储时惰性打开，否则为 None"""
+        if self._store is None and is_block_store(self.jsonl_path):
+            with self._fd_lock:
+                if self._store is None:
+                    self._store = BlockStore(self.jsonl_path)
+        return self._store
+    
+    def _source_stat(self) -> Optional[Tuple[int, int]]:
+        """数据源对应的原JSONL (大小, 修改时间)；压缩存储取转换时记录的源文件指纹"""
+        if not self.jsonl_path.exists():
+            return None
+        store = self._block_store()
+        if store is not None:
+            source = store.meta.get("source") or {}
+            return source.get("size"), source.get("mtime_ns")
+        stat = self.jsonl_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+    
+    def _read_at(self, offset: int, length: int) -> bytes:
+        """按字节偏移读取一条记录"""
+        store = self._block_store()
+        if store is not None:
+            return store.read(offset, length)
+        fd = self._data_fd()
+        if hasattr(os, "pread"):
+            return os.pread(fd, length, offset)
+        # 没有pread的平台（Windows）：加锁保证 seek+read 原子
+        with self._fd_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.read(fd, length)
     
     def load_index(self) -> bool:
-        """加载索引"""
+        """
+        加载索引
+        
+        二进制索引只做mmap，不解析词条，启动耗时与词条数无关；
+        旧版JSON索引需整体解析，仅为兼容保留。
+        """
         if self._loaded:
             return True
         
         if self.index_path and self.index_path.exists():
+            if is_binary_index(self.index_path):
+                self._binary = BinaryIndex(self.index_path)
+                self._loaded = True
+                print(f"已加载索引: {len(self._binary)} 条词条")
+                return True
+            
             with open(self.index_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 self.index = data.get("index", {})
+                self.exact = data.get("exact", {})
+                self._json_fingerprint = data.get("fingerprint", {})
                 self._loaded = True
                 print(f"已加载索引: {len(self.index)} 个首字")
                 return True
         
         return False
     
+    @property
+    def fingerprint(self) -> Dict[str, Any]:
+        """构建索引时记录的源文件指纹；旧索引没有指纹时为空字典"""
+        if not self._loaded:
+            self.load_index()
+        if self._binary is not None:
+            return self._binary.meta.get("fingerprint") or {}
+        return self._json_fingerprint
+    
+    def is_stale(self) -> bool:
+        """
+        检查索引是否落后于JSONL（大小或修改时间与指纹不一致）
+        
+        没有指纹的旧索引无法判断，视为未过期。
+        """
+        fingerprint = self.fingerprint
+        source = self._source_stat() if fingerprint else None
+        if source is None:
+            return False
+        return source != (fingerprint.get("size"), fingerprint.get("mtime_ns"))
+    
+    def refresh_if_stale(self) -> bool:
+        """
+        索引过期时增量重建并重新加载，避免按旧偏移量读出错误词条
+        
+        Returns:
+            是否执行了重建
+        """
+        if not self.index_path or not self.is_stale():
+            return False
+        if self._block_store() is not None:
+            print(f"警告: 压缩存储与索引不是由同一份JSONL生成，请用源JSONL重建索引: {self.index_path}")
+            return False
+        print(f"检测到JSONL已变化，增量更新索引: {self.index_path}")
+        chunk_size = self.fingerprint.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        self.close()
+        DYHDCIndexBuilder(str(self.jsonl_path)).build_index(
+            str(self.index_path), chunk_size=chunk_size, incremental=True
+        )
+        if self.cache is not None:
+            self.cache.clear()
+        return self.load_index()
+    
     def query(self, char: str) -> List[Dict]:
         """
         查询单个汉字的词条
@@ -274,33 +816,82 @@ class DYHDCIndexLoader:
             char: 要查询的汉字
         
         Returns:
-            该字开头的所有词条列表
+            词头恰为该字的单字词条列表（复合词请用 query_prefix）
         """
         if not self._loaded:
             self.load_index()
         
-        if char not in self.index:
-            return []
+        # 只返回单字条目：直接查单字词头表，不扫描首字桶里的复合词
+        return self._read_entries(self._iter_exact(char))
+    
+    def query_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        查询以 prefix 开头的所有词条（含复合词）
         
+        Args:
+            prefix: 词头前缀，如"崇"或"崇朝"
+            limit: 最多返回条数
+        
+        Returns:
+            原始词条列表
+        """
+        if not self._loaded:
+            self.load_index()
+        
+        if self._binary is not None:
+            indices = self._binary.prefix_range(prefix)
+            records = (self._binary.record(i) for i in indices[:limit])
+        else:
+            records = [
+                (offset, length)
+                for headword, offset, length in self._iter_bucket(prefix[:1])
+                if headword.startswith(prefix)
+            ][:limit]
+        return self._read_entries(records)
+    
+    def _read_entries(self, records) -> List[Dict]:
+        """按 (偏移量, 长度) 读取并解析词条"""
         results = []
-        entries_info = self.index[char]
-        
-        # 使用二进制模式读取，因为offset是字节偏移
-        with open(self.jsonl_path, 'rb') as f:
-            for info in entries_info:
-                # 跳过复合词，只返回单字
-                if len(info["headword"]) == 1:
-                    f.seek(info["offset"])
-                    line_bytes = f.read(info["length"])
-                    try:
-                        line = line_bytes.decode('utf-8')
-                        entry = json.loads(line.strip())
-                        results.append(entry)
-                    except:
-                        pass
+        # offset是字节偏移，直接按字节读取
+        for offset, length in records:
+            line_bytes = self._read_at(offset, length)
+            try:
+                results.append(loads(line_bytes))
+            except DECODE_ERRORS:
+                pass
         
         return results
     
+    def _iter_exact(self, char: str) -> Iterator[Tuple[int, int]]:
+        """遍历词头恰为 char 的索引记录，产出 (偏移量, 长度)"""
+        if len(char) != 1:
+            return
+        if self._binary is not None:
+            for i in self._binary.find_char(char):
+                yield self._binary.record(i)
+            return
+        
+        if self.exact:
+            for info in self.exact.get(char, []):
+                yield info["offset"], info["length"]
+            return
+        
+        # 旧版JSON索引没有单字表，退回首字桶过滤
+        for headword, offset, length in self._iter_bucket(char):
+            if len(headword) == 1:
+                yield offset, length
+    
+    def _iter_bucket(self, char: str) -> Iterator[Tuple[str, int, int]]:
+        """遍历以 char 开头的索引记录，产出 (词头, 偏移量, 长度)"""
+        if self._binary is not None:
+            for i in self._binary.prefix_range(char):
+                offset, length = self._binary.record(i)
+                yield self._binary.key(i), offset, length
+            return
+        
+        for info in self.index.get(char, []):
+            yield info["headword"], info["offset"], info["length"]
+    
     def query_single_char(self, char: str) -> Optional[Dict]:
         """
         查询单个字的详细信息
@@ -309,8 +900,14 @@ class DYHDCIndexLoader:
             char: 单个汉字
         
         Returns:
-            格式化后的字典条目
+            格式化后的字典条目（启用缓存时为共享对象，不要修改）
         """
+        if self.cache is not None:
+            return self.cache.get_or_load(char, self._lookup_single_char)
+        return self._lookup_single_char(char)
+    
+    def _lookup_single_char(self, char: str) -> Optional[Dict]:
+        """读盘并格式化单字条目（不经缓存）"""
         entries = self.query(char)
         
         if not entries:
@@ -327,85 +924,171 @@ class DYHDCIndexLoader:
     
     def _format_entry(self, entry: Dict) -> Dict:
         """格式化词条"""
-        headword = entry.get("headword", "") or entry.get("hw", "")
-        simplified = entry.get("simp", "")
-        pronunciation = entry.get("pron", "")
-        
-        senses = entry.get("senses", [])
-        meanings = []
-        examples = []
-        jiajie_notes = []
-        
-        for sense in senses:
-            mean = sense.get("mean", "")
-            if mean:
-                meanings.append(mean)
-                
-                # 检查假借标注
-                if any(kw in mean for kw in ["读为", "读曰", "通", "假借", "读如"]):
-                    jiajie_notes.append(mean)
-            
-            # 提取例句
-            for ex in sense.get("examples", []):
-                text = ex.get("text", "")
-                if text:
-                    examples.append(text[:200])  # 限制长度
-        
-        return {
-            "字": headword,
-            "简体": simplified,
-            "读音": pronunciation,
-            "本义": meanings[0] if meanings else "",
-            "义项": meanings[:10],  # 限制数量
-            "例句": examples[:5],
-            "假借标注": jiajie_notes,
-        }
+        return format_entry(entry)
 
 
 class DYHDCSQLiteLoader:
     """
     使用SQLite数据库查询
+    
+    query 返回与 DYHDCIndexLoader.query_single_char 相同格式的字典；
+    search_senses / search_examples 在释义、例证引文上做FTS5全文检索。
+    
+    使用方法：
+        with DYHDCSQLiteLoader("data/processed/dyhdc.db") as db:
+            db.query("崇")
+            db.search_examples("崇朝其雨")
     """
     
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
         self.conn = None
     
+    def __enter__(self) -> "DYHDCSQLiteLoader":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
     def connect(self):
-        """连接数据库"""
+        """连接数据库（只读）"""
         if not self.db_path.exists():
             print(f"数据库不存在: {self.db_path}")
             return False
         
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
         return True
     
-    def query(self, char: str) -> Optional[Dict]:
-        """查询单个字"""
+    def _cursor(self) -> Optional[sqlite3.Cursor]:
         if not self.conn:
             if not self.connect():
                 return None
+        return self.conn.cursor()
+    
+    def query(self, char: str) -> Optional[Dict]:
+        """
+        查询单个字
         
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM entries 
-            WHERE headword = ? OR first_char = ?
-            LIMIT 1
-        ''', (char, char))
+        先按词头精确匹配，再按简体词头匹配；同一词头有多条时取文件中的第一条。
+        """
+        cursor = self._cursor()
+        if cursor is None:
+            return None
         
-        row = cursor.fetchone()
-        if not row:
+        row = cursor.execute(
+            "SELECT * FROM entries WHERE headword = ? ORDER BY id LIMIT 1", (char,)
+        ).fetchone()
+        if row is None:
+            row = cursor.execute(
+                "SELECT * FROM entries WHERE simplified = ? ORDER BY id LIMIT 1", (char,)
+            ).fetchone()
+        if row is None:
             return None
         
+        return format_entry(self._load_entry(cursor, row))
+    
+    def _load_entry(self, cursor: sqlite3.Cursor, row: sqlite3.Row) -> Dict:
+        """由规范化的各表还原出原始词条结构（headword/simp/pron/senses[examples]）"""
+        senses = []
+        by_id = {}
+        for sense in cursor.execute(
+            "SELECT id, mean FROM senses WHERE entry_id = ? ORDER BY seq", (row["id"],)
+        ):
+            item = {"mean": sense["mean"], "examples": []}
+            by_id[sense["id"]] = item
+            senses.append(item)
+        for ex in cursor.execute(
+            "SELECT sense_id, text FROM examples WHERE entry_id = ? ORDER BY sense_id, seq", (row["id"],)
+        ):
+            by_id[ex["sense_id"]]["examples"].append({"text": ex["text"] or ""})
+        
         return {
-            "字": row["headword"],
-            "简体": row["simplified"],
-            "读音": row["pronunciation"],
-            "本义": row["primary_meaning"],
-            "义项": json.loads(row["senses_json"]) if row["senses_json"] else [],
+            "headword": row["headword"],
+            "simp": row["simplified"] or "",
+            "pron": row["pronunciation"] or "",
+            "senses": senses,
         }
     
+    def search_senses(self, query: str, headword: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        全文检索释义
+        
+        Args:
+            query: 要查找的字串（按字相邻匹配，如"通终"）
+            headword: 只在该词头的义项中查找（此时按原文子串匹配，不经FTS）
+            limit: 最多返回条数
+        
+        Returns:
+            [{"headword": "...", "mean": "..."}, ...]，按文件顺序
+        """
+        cursor = self._cursor()
+        if cursor is None or not _fts_text(query).strip():
+            return []
+        
+        if headword is not None:
+            # 限定词头时从 entries 出发走 idx_entries_headword，只在该词头的少量义项中按子串过滤；
+            # 若交给FTS，单字查询要遍历该字的整张倒排表
+            sql = """
+                SELECT e.headword, s.mean
+                FROM entries e
+                CROSS JOIN senses s ON s.entry_id = e.id
+                WHERE e.headword = ? AND instr(s.mean, ?) > 0
+                ORDER BY s.id LIMIT ?
+            """
+            params: List[Any] = [headword, query, limit]
+        else:
+            sql = """
+                SELECT e.headword, s.mean
+                FROM senses_fts
+                JOIN senses s ON s.id = senses_fts.rowid
+                JOIN entries e ON e.id = s.entry_id
+                WHERE senses_fts MATCH ?
+                ORDER BY s.id LIMIT ?
+            """
+            params = [_fts_phrase(query), limit]
+        return [dict(row) for row in cursor.execute(sql, params)]
+    
+    def search_examples(self, query: str, headword: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        全文检索例证引文
+        
+        Args:
+            query: 要查找的字串，如上下文"崇朝其雨"
+            headword: 只在该词头的例证中查找（此时按原文子串匹配，不经FTS）
+            limit: 最多返回条数
+        
+        Returns:
+            [{"headword", "mean", "books", "quotes", "text"}, ...]，按文件顺序
+        """
+        cursor = self._cursor()
+        if cursor is None or not _fts_text(query).strip():
+            return []
+        
+        if headword is not None:
+            # 同 search_senses：限定词头时走词头索引，按子串过滤该词头的例证
+            sql = """
+                SELECT e.headword, s.mean, x.books, x.quotes, x.text
+                FROM entries e
+                CROSS JOIN examples x ON x.entry_id = e.id
+                JOIN senses s ON s.id = x.sense_id
+                WHERE e.headword = ? AND instr(x.quotes, ?) > 0
+                ORDER BY x.id LIMIT ?
+            """
+            params: List[Any] = [headword, query, limit]
+        else:
+            sql = """
+                SELECT e.headword, s.mean, x.books, x.quotes, x.text
+                FROM examples_fts
+                JOIN examples x ON x.id = examples_fts.rowid
+                JOIN senses s ON s.id = x.sense_id
+                JOIN entries e ON e.id = x.entry_id
+                WHERE examples_fts MATCH ?
+                ORDER BY x.id LIMIT ?
+            """
+            params = [_fts_phrase(query), limit]
+        return [dict(row) for row in cursor.execute(sql, params)]
+    
     def close(self):
         """关闭连接"""
         if self.conn:
@@ -415,18 +1098,48 @@ class DYHDCSQLiteLoader:
 
 # ===== 便捷函数 =====
 
+_shared_loaders: Dict[Tuple[str, str], DYHDCIndexLoader] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_loader(
+    jsonl_path: str,
+    index_path: str,
+    cache_bytes: int = DEFAULT_CACHE_BYTES,
+) -> DYHDCIndexLoader:
+    """
+    取进程内共享的加载器（带词条缓存）
+    
+    同一对 (JSONL, 索引) 路径只创建一个加载器，SemanticTool 与 TextualTool 共用，
+    索引只映射一次，同一个字也只读盘、格式化一次。
+    
+    Args:
+        jsonl_path: JSONL文件路径
+        index_path: 索引文件路径
+        cache_bytes: 首次创建时缓存的字节上限
+    """
+    key = (str(Path(jsonl_path).resolve()), str(Path(index_path).resolve()))
+    with _shared_lock:
+        loader = _shared_loaders.get(key)
+        if loader is None:
+            loader = DYHDCIndexLoader(jsonl_path, index_path, cache=EntryCache(cache_bytes))
+            _shared_loaders[key] = loader
+        return loader
+
 def build_dyhdc_index(
     jsonl_path: str = None,
     output_path: str = None,
-    build_sqlite: bool = False
+    build_sqlite: bool = False,
+    incremental: bool = False
 ) -> Dict:
     """
     构建《汉语大词典》索引
     
     Args:
         jsonl_path: JSONL文件路径
-        output_path: 索引输出路径
+        output_path: 索引输出路径（默认 data/processed/dyhdc_index.bin）
         build_sqlite: 是否同时构建SQLite数据库
+        incremental: 复用已有索引中未变化的区间，只重新扫描变化的区间
     """
     project_root = Path(__file__).parent.parent.parent
     
@@ -434,10 +1147,10 @@ def build_dyhdc_index(
         jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
     
     if output_path is None:
-        output_path = project_root / "data/processed/dyhdc_index.json"
+        output_path = project_root / "data/processed/dyhdc_index.bin"
     
     builder = DYHDCIndexBuilder(str(jsonl_path))
-    index = builder.build_index(str(output_path))
+    index = builder.build_index(str(output_path), incremental=incremental)
     
     if build_sqlite:
         db_path = project_root / "data/processed/dyhdc.db"
@@ -453,7 +1166,7 @@ if __name__ == "__main__":
     
     project_root = Path(__file__).parent.parent.parent
     jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
-    index_path = project_root / "data/processed/dyhdc_index.json"
+    index_path = project_root / "data/processed/dyhdc_index.bin"
     
     # 检查是否需要构建索引
     if not index_path.exists():
@@ -0,0 +1,109 @@
+"""
+词条缓存（按字节数限制的LRU）
+
+负责人：成员E（数据工程）
+
+缓存已格式化的词条（DYHDCIndexLoader.query_single_char 的结果），按字为键。
+容量按估算的内存字节数而非条数限制：单字条目大小差别很大（"之""以"等义项上百），
+按条数限制无法控制内存。未收录的字也会缓存（值为 None），避免反复读盘。
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """估算对象（dict/list/str 组成的嵌套结构）占用的内存字节数"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class EntryCache:
+    """
+    线程安全的LRU缓存，总字节数不超过 max_bytes
+
+    使用方法：
+        cache = EntryCache(max_bytes=32 * 1024 * 1024)
+        entry = cache.get_or_load("崇", loader._lookup_single_char)
+        print(cache.stats())
+
+    注意：缓存中的值会被多个调用方共享，取出后不要修改。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()  # 键 -> (值, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """取缓存值并记录命中/未命中"""
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: str, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未用的条目；单个值超过容量时不缓存"""
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+
+    def get_or_load(self, key: str, load: Callable[[str], Any]) -> Any:
+        """命中则直接返回，否则调用 load(key) 并缓存结果（包括 None）"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = load(key)
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """清空缓存（索引重建后调用），计数器保留"""
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """缓存统计：命中、未命中、命中率、条目数、占用字节数"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,246 @@
+"""
+《汉语大词典》假借关系索引
+
+负责人：成员E（数据工程）
+
+一次遍历全部词条，抽取 (借字, 本字, 关系, 出处, 义项原文) 记录：
+1. 义项以"通“X”""读为“X”""读曰“X”""假借为“X”""同“X”"等开头或在句读之后出现 —— 词头借为 X
+2. 复合词或他字条目中写明"A，通“X”"（A 为该词头中的字）—— 第三方条目中的 A 借为 X
+3. redirect_to（"同X"之类纯重定向）与 variant_of（"亦作X"）
+
+记录按 "借字\\t本字" 为键存入二进制索引（binary_index 格式），记录正文在同名 .jsonl 中：
+    data/processed/dyhdc_jiajie.bin    键 -> (记录偏移, 记录长度)
+    data/processed/dyhdc_jiajie.jsonl  每行一条关系记录
+
+词条中单字的简体（simp 字段）同时作为键，"崇-终"与"崇-終"查到同一组记录。
+"""
+import json
+import mmap
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .binary_index import BinaryIndex, write_binary_index
+from .dyhdc_index_builder import DEFAULT_CHUNK_SIZE, split_line_ranges
+from .jsonl_codec import DECODE_ERRORS, loads
+
+
+# 标示假借、通用的术语（长的在前，"假借为"优先于"借为"）
+JIAJIE_RELATION_TERMS = ("假借为", "借为", "读为", "读曰", "读如", "通", "同")
+
+_HAN = r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0003ffff]'
+_TERMS = "|".join(JIAJIE_RELATION_TERMS)
+# 词头自身的关系：义项开头或句读之后的"通“X”"
+_SELF_RE = re.compile(rf'(?:^|[。；;：:）)])\s*(?:亦|或)?({_TERMS})“({_HAN})”')
+# 第三方关系："A，通“X”"
+_OTHER_RE = re.compile(rf'({_HAN})[，,]\s*(?:亦|或)?({_TERMS})“({_HAN})”')
+_BOOK_RE = re.compile(r'《[^》]+》')
+
+
+def _relation_key(jie: str, ben: str) -> str:
+    return f"{jie}\t{ben}"
+
+
+def _sidecar_path(path) -> Path:
+    return Path(path).with_suffix(".jsonl")
+
+
+def _sense_source(sense: Dict) -> str:
+    """义项的出处：取第一条例证的书名，没有则从释义中截取"""
+    for ex in sense.get("examples") or []:
+        books = ex.get("books") or []
+        if books:
+            return books[0]
+    match = _BOOK_RE.search(sense.get("mean") or "")
+    return match.group() if match else ""
+
+
+def extract_relations(entry: Dict) -> List[Dict[str, str]]:
+    """从一个词条中抽取假借关系记录"""
+    headword = entry.get("headword", "") or entry.get("hw", "")
+    if not headword or headword.startswith('#'):
+        return []
+
+    relations = []
+    for sense in entry.get("senses") or []:
+        mean = sense.get("mean") or ""
+        if not mean:
+            continue
+        source = _sense_source(sense)
+        text = mean[:200]
+        if len(headword) == 1:
+            for term, ben in _SELF_RE.findall(mean):
+                if ben != headword:
+                    relations.append({"借字": headword, "本字": ben, "关系": term,
+                                      "词条": headword, "source": source, "text": text})
+        for jie, term, ben in _OTHER_RE.findall(mean):
+            if jie in headword and jie != ben and not (len(headword) == 1 and jie == headword):
+                relations.append({"借字": jie, "本字": ben, "关系": term,
+                                  "词条": headword, "source": source, "text": text})
+
+    redirect = entry.get("redirect_to")
+    if redirect and redirect != headword:
+        relations.append({"借字": headword, "本字": redirect, "关系": "同",
+                          "词条": headword, "source": "", "text": f"同“{redirect}”"})
+    for variant in entry.get("variant_of") or []:
+        if variant and variant != headword:
+            relations.append({"借字": headword, "本字": variant, "关系": "亦作",
+                              "词条": headword, "source": "", "text": f"亦作“{variant}”"})
+    return relations
+
+
+def _extract_range(task: Tuple[str, int, int]) -> Tuple[List[Dict[str, str]], List[Tuple[str, str]]]:
+    """进程池任务：扫描一个字节区间，返回 (关系记录, [(单字词头, 简体)])"""
+    path, start, end = task
+    relations = []
+    simplified = []
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            offset += len(line)
+            try:
+                entry = loads(line)
+            except DECODE_ERRORS:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            relations.extend(extract_relations(entry))
+            headword = entry.get("headword", "")
+            simp = entry.get("simp")
+            if len(headword) == 1 and simp and len(simp) == 1 and simp != headword:
+                simplified.append((headword, simp))
+    return relations, simplified
+
+
+def build_jiajie_index(
+    jsonl_path: str = None,
+    output_path: str = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    构建假借关系索引
+
+    Args:
+        jsonl_path: 词典JSONL路径
+        output_path: 索引路径（默认 data/processed/dyhdc_jiajie.bin，记录写入同名 .jsonl）
+        workers: 进程数，默认为CPU核数
+        chunk_size: 每个区间的目标字节数
+
+    Returns:
+        关系记录条数
+    """
+    project_root = Path(__file__).parent.parent.parent
+    if jsonl_path is None:
+        jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
+    if output_path is None:
+        output_path = project_root / "data/processed/dyhdc_jiajie.bin"
+
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        print(f"错误: 文件不存在: {jsonl_path}")
+        return 0
+
+    print(f"正在抽取假借关系: {jsonl_path}")
+    start_time = time.time()
+    tasks = [(str(jsonl_path), start, end) for start, end in split_line_ranges(jsonl_path, chunk_size)]
+
+    relations: List[Dict[str, str]] = []
+    to_simp: Dict[str, str] = {}
+    if workers == 1 or len(tasks) <= 1:
+        chunks: Iterable = map(_extract_range, tasks)
+        pool = None
+    else:
+        from multiprocessing import Pool
+        pool = Pool(workers)
+        chunks = pool.imap(_extract_range, tasks)
+    try:
+        seen = set()
+        for chunk_relations, simplified in chunks:
+            for relation in chunk_relations:
+                ident = (relation["借字"], relation["本字"], relation["关系"], relation["词条"], relation["text"])
+                if ident not in seen:
+                    seen.add(ident)
+                    relations.append(relation)
+            to_simp.update(simplified)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    records = []
+    with open(_sidecar_path(output_path), 'wb') as f:
+        for relation in relations:
+            offset = f.tell()
+            data = json.dumps(relation, ensure_ascii=False).encode('utf-8') + b"\n"
+            f.write(data)
+            jie, ben = relation["借字"], relation["本字"]
+            keys = {
+                _relation_key(a, b)
+                for a in (jie, to_simp.get(jie, jie))
+                for b in (ben, to_simp.get(ben, ben))
+            }
+            records.extend((key, offset, len(data)) for key in keys)
+    write_binary_index(output_path, records, meta={"relations": len(relations)})
+
+    elapsed = time.time() - start_time
+    print(f"假借关系索引构建完成: {len(relations)} 条关系, {len(records)} 个键")
+    print(f"耗时: {elapsed:.1f}s")
+    return len(relations)
+
+
+class JiajieIndex:
+    """
+    假借关系索引读取器
+
+    使用方法：
+        with JiajieIndex("data/processed/dyhdc_jiajie.bin") as index:
+            index.lookup("崇", "终")
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._keys = BinaryIndex(self.path)
+        with open(_sidecar_path(self.path), 'rb') as f:
+            # 空文件不能mmap
+            self._records_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if len(self._keys) else None
+
+    def __len__(self) -> int:
+        return self._keys.meta.get("relations", 0)
+
+    def __enter__(self) -> "JiajieIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def relations(self, jie: str, ben: str) -> List[Dict[str, Any]]:
+        """借字为 jie、本字为 ben 的记录"""
+        results = []
+        for i in self._keys.find(_relation_key(jie, ben)):
+            offset, length = self._keys.record(i)
+            results.append(loads(self._records_mm[offset:offset + length]))
+        return results
+
+    def lookup(self, char_a: str, char_b: str) -> List[Dict[str, Any]]:
+        """
+        查询两字之间的全部关系（不论方向）
+
+        Returns:
+            关系记录列表，先 char_a 借为 char_b，再 char_b 借为 char_a
+        """
+        return self.relations(char_a, char_b) + self.relations(char_b, char_a)
+
+    def close(self) -> None:
+        """释放映射"""
+        if self._records_mm is not None:
+            self._records_mm.close()
+            self._records_mm = None
+        self._keys.close()
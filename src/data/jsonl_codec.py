@@ -0,0 +1,206 @@
+"""
+JSONL 解码层
+
+负责人：成员E（数据工程）
+
+所有逐行读取词典JSONL的地方统一通过本模块解码：
+- loads(line)：通用解码，返回 dict（依次尝试 orjson、msgspec，都没有则用标准库 json）
+- decode_entry(line)：解码为与《dyhdc_jsonl_schema_zh.md》对应的类型化结构 Entry/Sense/Example…
+  安装了 msgspec 时直接按类型解码，html_clean、examples_rich 等不用的大字段不会被构造；
+  否则先 loads 再转换。字段类型与文档不符的行（如 mean 为 null）退回宽松转换，缺省值补齐。
+
+本模块不依赖项目中的其它模块：词典解析脚本（jsonl_to_text.py、maxjsonl_analysis.py）把 src/data
+加入 sys.path 后直接 import jsonl_codec，不经过 src.data 包的 __init__。
+
+使用方法：
+    from src.data.jsonl_codec import decode_entry, DECODE_ERRORS
+    entry = decode_entry(line)
+    entry.senses[0].examples[0].quotes
+"""
+import json
+import typing
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# ===== 类型化结构（字段与 dyhdc_jsonl_schema_zh.md 一致；html_clean、examples_rich 不解码） =====
+
+@dataclass
+class Link:
+    """交叉引用 / 参见链接 { text, target }"""
+    text: Optional[str] = None
+    target: Optional[str] = None
+
+
+@dataclass
+class Note:
+    """例证注释 { text, html }"""
+    text: str = ""
+    html: str = ""
+
+
+@dataclass
+class Yinyun:
+    """音韵信息 { text, books[] }"""
+    text: str = ""
+    books: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Example:
+    """例证对象（senses[].examples[]）"""
+    books: List[str] = field(default_factory=list)
+    quotes: List[str] = field(default_factory=list)
+    notes: List[Note] = field(default_factory=list)
+    u_texts: List[str] = field(default_factory=list)
+    cross_refs: List[Link] = field(default_factory=list)
+    images: List[str] = field(default_factory=list)
+    text: str = ""
+    html: str = ""
+
+
+@dataclass
+class Sense:
+    """义项对象（senses[]）"""
+    mean: str = ""
+    see: List[str] = field(default_factory=list)
+    see_refs: List[Link] = field(default_factory=list)
+    examples: List[Example] = field(default_factory=list)
+    highlights: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Entry:
+    """一行JSONL（词条行或元信息行）"""
+    headword: str = ""
+    hw: str = ""
+    simp: Optional[str] = None
+    pron: Optional[str] = None
+    yinyun: List[Yinyun] = field(default_factory=list)
+    senses: List[Sense] = field(default_factory=list)
+    images: List[str] = field(default_factory=list)
+    cross_refs: List[Link] = field(default_factory=list)
+    redirect_to: Optional[str] = None
+    variant_of: List[str] = field(default_factory=list)
+    source_class: str = ""
+    alts: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """检索用词头：headword，为空时退回 hw"""
+        return self.headword or self.hw
+
+    @property
+    def is_meta(self) -> bool:
+        """元信息行（#name、#description）"""
+        return self.headword.startswith('#')
+
+
+# ===== 后端 =====
+
+BACKENDS = tuple(name for name, module in (("orjson", orjson), ("msgspec", msgspec), ("json", json)) if module)
+
+# 解码失败时可能抛出的异常（orjson/json 的错误都是 ValueError 子类）
+DECODE_ERRORS: Tuple[type, ...] = (ValueError, TypeError) + ((msgspec.MsgspecError,) if msgspec else ())
+
+_backend = BACKENDS[0]
+_loads: Callable[[Any], Any] = json.loads
+_entry_decoder = None
+
+
+def set_backend(name: str) -> None:
+    """选择解码后端（orjson / msgspec / json），主要用于基准测试与对比"""
+    global _backend, _loads, _entry_decoder
+    if name not in BACKENDS:
+        raise ValueError(f"解码后端不可用: {name}（可用: {', '.join(BACKENDS)}）")
+    _backend = name
+    if name == "orjson":
+        _loads = orjson.loads
+    elif name == "msgspec":
+        _loads = msgspec.json.Decoder().decode
+    else:
+        _loads = json.loads
+    # 类型化解码只有 msgspec 能直接完成；orjson 下仍用 msgspec（若已安装），否则先 loads 再转换
+    _entry_decoder = msgspec.json.Decoder(Entry).decode if msgspec and name != "json" else None
+
+
+def get_backend() -> str:
+    """当前解码后端名称"""
+    return _backend
+
+
+def loads(data: Any) -> Any:
+    """解码一行 JSON（bytes 或 str）"""
+    return _loads(data)
+
+
+# ===== 宽松转换（标准库后端，或类型校验失败时） =====
+
+_Spec = Tuple[str, Any, Optional[type], bool]  # (字段名, 缺省值/工厂, 子结构类型, 是否为列表)
+_SPECS: Dict[type, List[_Spec]] = {}
+
+
+def _specs(cls: type) -> List[_Spec]:
+    specs = _SPECS.get(cls)
+    if specs is None:
+        hints = typing.get_type_hints(cls)
+        specs = []
+        for f in fields(cls):
+            hint = hints[f.name]
+            is_list = typing.get_origin(hint) is list
+            sub = typing.get_args(hint)[0] if is_list else None
+            default = f.default_factory if f.default is MISSING else f.default
+            specs.append((f.name, default, sub if isinstance(sub, type) and sub is not str else None, is_list))
+        _SPECS[cls] = specs
+    return specs
+
+
+def _convert(cls: type, obj: Any) -> Any:
+    """dict -> 类型化结构；缺失或为 null 的字段取缺省值，列表中的非对象项跳过"""
+    if not isinstance(obj, dict):
+        return cls()
+    kwargs = {}
+    for name, default, sub, is_list in _specs(cls):
+        value = obj.get(name)
+        if value is None:
+            continue
+        if is_list:
+            if not isinstance(value, list):
+                continue
+            if sub is not None:
+                value = [_convert(sub, item) for item in value if isinstance(item, dict)]
+        kwargs[name] = value
+    return cls(**kwargs)
+
+
+def to_entry(obj: Dict[str, Any]) -> Entry:
+    """把已解码的 dict 转为 Entry"""
+    return _convert(Entry, obj)
+
+
+def decode_entry(data: Any) -> Entry:
+    """
+    解码一行JSONL为 Entry
+
+    Raises:
+        DECODE_ERRORS 中的异常：JSON语法错误或编码错误
+    """
+    if _entry_decoder is not None:
+        try:
+            return _entry_decoder(data)
+        except msgspec.ValidationError:
+            pass
+    return _convert(Entry, _loads(data))
+
+
+set_backend(_backend)
@@ -0,0 +1,528 @@
+"""
+MDict（.mdx / .mdd）读取器
+
+负责人：成员E（数据工程）
+
+纯Python实现，不依赖 readmdict 等第三方库。打开词典时只读取文件头、词条键索引与记录块表：
+    文件头（UTF-16 XML）→ 键块信息（Encrypted=2 时经 RIPEMD-128 派生密钥解密）→ 键块 → 记录块表
+词条正文按需读取：按记录偏移二分查找所在记录块，只解压这一块，最近用过的若干块缓存在内存中。
+items() 逐块顺序解压，适合一次遍历全部词条而不把整部词典解压进内存。
+
+支持 1.x / 2.x 引擎版本；块压缩类型 0（无）、1（LZO1X）、2（zlib）。
+记录块加密（Encrypted 含 1，需注册码）不支持。
+
+使用方法：
+    with MDXReader("音韵数据/上古音/潘悟云《汉语古音手册》/汉语古音手册/汉语古音手册.mdx") as mdx:
+        mdx.lookup("崇")        # -> ["<html>...", ...]
+        for key, text in mdx.items():
+            ...
+"""
+import mmap
+import re
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+DEFAULT_CACHE_BLOCKS = 8
+
+_LINK_PREFIX = "@@@LINK="
+_ATTR_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+# ===== RIPEMD-128（键块信息解密用） =====
+
+def _rol(x: int, n: int) -> int:
+    x &= 0xFFFFFFFF
+    return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+
+_RMD_R = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+]
+_RMD_RP = [
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+]
+_RMD_S = [
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+]
+_RMD_SP = [
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+]
+_RMD_K = [0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC]
+_RMD_KP = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x00000000]
+
+
+def _rmd_f(j: int, x: int, y: int, z: int) -> int:
+    if j < 16:
+        return x ^ y ^ z
+    if j < 32:
+        return (x & y) | (~x & z)
+    if j < 48:
+        return (x | ~y) ^ z
+    return (x & z) | (y & ~z)
+
+
+def ripemd128(message: bytes) -> bytes:
+    """RIPEMD-128 摘要（hashlib 一般不提供）"""
+    h = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476]
+    length = len(message)
+    message = message + b"\x80" + b"\x00" * ((55 - length) % 64) + struct.pack("<Q", length * 8)
+    for pos in range(0, len(message), 64):
+        x = struct.unpack("<16I", message[pos:pos + 64])
+        a, b, c, d = h
+        ap, bp, cp, dp = h
+        for j in range(64):
+            t = _rol(a + (_rmd_f(j, b, c, d) & 0xFFFFFFFF) + x[_RMD_R[j]] + _RMD_K[j >> 4], _RMD_S[j])
+            a, d, c, b = d, c, b, t
+            t = _rol(ap + (_rmd_f(63 - j, bp, cp, dp) & 0xFFFFFFFF) + x[_RMD_RP[j]] + _RMD_KP[j >> 4], _RMD_SP[j])
+            ap, dp, cp, bp = dp, cp, bp, t
+        t = (h[1] + c + dp) & 0xFFFFFFFF
+        h[1] = (h[2] + d + ap) & 0xFFFFFFFF
+        h[2] = (h[3] + a + bp) & 0xFFFFFFFF
+        h[3] = (h[0] + b + cp) & 0xFFFFFFFF
+        h[0] = t
+    return struct.pack("<4I", *h)
+
+
+def _fast_decrypt(data: bytes, key: bytes) -> bytes:
+    out = bytearray(data)
+    previous = 0x36
+    for i, byte in enumerate(data):
+        t = ((byte >> 4) | (byte << 4)) & 0xFF
+        out[i] = t ^ previous ^ (i & 0xFF) ^ key[i % len(key)]
+        previous = byte
+    return bytes(out)
+
+
+def _decrypt_key_block_info(block: bytes) -> bytes:
+    key = ripemd128(block[4:8] + struct.pack("<I", 0x3695))
+    return block[:8] + _fast_decrypt(block[8:], key)
+
+
+# ===== LZO1X（早期词典的块压缩） =====
+
+def lzo1x_decompress(src: bytes, out_size: int) -> bytes:
+    """LZO1X 解压（MDict 压缩类型 1）"""
+    out = bytearray()
+    ip = 0
+    n = len(src)
+
+    def extended(ip: int, base: int) -> Tuple[int, int]:
+        count = 0
+        while src[ip] == 0:
+            count += 255
+            ip += 1
+        return base + count + src[ip], ip + 1
+
+    def copy_match(dist: int, length: int) -> None:
+        start = len(out) - dist
+        if dist >= length:
+            out.extend(out[start:start + length])
+        else:
+            for k in range(length):
+                out.append(out[start + k])
+
+    state = 0
+    t = src[ip]
+    if t > 17:
+        ip += 1
+        t -= 17
+        out.extend(src[ip:ip + t])
+        ip += t
+        state = 4 if t >= 4 else t
+    while ip < n:
+        t = src[ip]
+        ip += 1
+        if t < 16:
+            if state == 0:
+                # 长字面量串
+                if t == 0:
+                    t, ip = extended(ip, 15)
+                t += 3
+                out.extend(src[ip:ip + t])
+                ip += t
+                state = 4
+                continue
+            if state < 4:
+                # 短匹配：距离 ≤ 1KB，长度 2
+                dist = (t >> 2) + (src[ip] << 2) + 1
+                ip += 1
+                copy_match(dist, 2)
+            else:
+                # 字面量串之后的 3 字节匹配，距离 2KB 起
+                dist = (t >> 2) + (src[ip] << 2) + 2049
+                ip += 1
+                copy_match(dist, 3)
+        elif t >= 64:
+            dist = ((t >> 2) & 7) + (src[ip] << 3) + 1
+            ip += 1
+            copy_match(dist, (t >> 5) + 1)
+        elif t >= 32:
+            length = t & 31
+            if length == 0:
+                length, ip = extended(ip, 31)
+            dist = (src[ip] >> 2) + (src[ip + 1] << 6) + 1
+            state_bits = src[ip] & 3
+            ip += 2
+            copy_match(dist, length + 2)
+            out.extend(src[ip:ip + state_bits])
+            ip += state_bits
+            state = state_bits
+            continue
+        else:
+            length = t & 7
+            if length == 0:
+                length, ip = extended(ip, 7)
+            dist = ((t & 8) << 11) + (src[ip] >> 2) + (src[ip + 1] << 6)
+            state_bits = src[ip] & 3
+            ip += 2
+            if dist == 0:
+                break  # 流结束标记
+            copy_match(dist + 16384, length + 2)
+            out.extend(src[ip:ip + state_bits])
+            ip += state_bits
+            state = state_bits
+            continue
+        state_bits = src[ip - 2] & 3
+        out.extend(src[ip:ip + state_bits])
+        ip += state_bits
+        state = state_bits
+    if len(out) != out_size:
+        raise ValueError(f"LZO解压长度不符: {len(out)} != {out_size}")
+    return bytes(out)
+
+
+def _decompress_block(block: bytes, decomp_size: int) -> bytes:
+    kind = block[:4]
+    checksum = struct.unpack(">I", block[4:8])[0]
+    payload = block[8:]
+    if kind == b"\x00\x00\x00\x00":
+        data = payload
+    elif kind == b"\x01\x00\x00\x00":
+        data = lzo1x_decompress(payload, decomp_size)
+    elif kind == b"\x02\x00\x00\x00":
+        data = zlib.decompress(payload)
+    else:
+        raise ValueError(f"未知的块压缩类型: {kind.hex()}")
+    if zlib.adler32(data) & 0xFFFFFFFF != checksum:
+        raise ValueError("块校验失败（adler32）")
+    return data
+
+
+# ===== 读取器 =====
+
+class MDictReader:
+    """
+    MDict 通用读取器（.mdx 与 .mdd 共用格式，子类决定记录如何解码）
+
+    键按 KeyCaseSensitive / StripKey 规范化后建立 键 -> 词条序号 的索引；
+    同一键可对应多条记录（如异读分条收录）。
+    """
+
+    _force_utf16 = False
+
+    def __init__(self, path, cache_blocks: int = DEFAULT_CACHE_BLOCKS):
+        self.path = Path(path)
+        self.cache_blocks = cache_blocks
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+            pos = self._read_keys(self._key_section_pos)
+            self._read_record_table(pos)
+        except Exception:
+            self._mm.close()
+            raise
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return self._normalize(key) in self._index
+
+    def __enter__(self) -> "MDictReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----- 文件结构 -----
+
+    def _read_header(self) -> None:
+        mm = self._mm
+        size = struct.unpack(">I", mm[:4])[0]
+        text = mm[4:4 + size].decode("utf-16-le").rstrip("\x00")
+        self.header: Dict[str, str] = {k: v for k, v in _ATTR_RE.findall(text)}
+        self._key_section_pos = 4 + size + 4  # 之后是 adler32
+
+        self.version = float(self.header.get("GeneratedByEngineVersion", "2.0"))
+        self._num_fmt, self._num_width = (">Q", 8) if self.version >= 2.0 else (">I", 4)
+
+        encrypted = self.header.get("Encrypted", "0")
+        encrypted = 0 if encrypted in ("No", "") else 1 if encrypted == "Yes" else int(encrypted)
+        if encrypted & 1:
+            raise ValueError(f"不支持需要注册码的加密词典: {self.path}")
+        self._encrypted = encrypted
+
+        encoding = self.header.get("Encoding", "UTF-8").upper()
+        if self._force_utf16 or encoding in ("UTF-16", "UTF16"):
+            self.encoding = "utf-16-le"
+        elif encoding in ("GBK", "GB2312"):
+            self.encoding = "gb18030"
+        elif encoding == "BIG5":
+            self.encoding = "big5"
+        else:
+            self.encoding = "utf-8"
+        self._unit = 2 if self.encoding == "utf-16-le" else 1
+
+        self._case_sensitive = self.header.get("KeyCaseSensitive", "No").lower() == "yes"
+        strip = self.header.get("StripKey", self.header.get("Stripkey", "Yes"))
+        self._strip_key = strip.lower() == "yes"
+
+    def _num(self, pos: int) -> Tuple[int, int]:
+        return struct.unpack(self._num_fmt, self._mm[pos:pos + self._num_width])[0], pos + self._num_width
+
+    def _read_keys(self, pos: int) -> int:
+        mm = self._mm
+        if self.version >= 2.0:
+            num_blocks, num_entries, info_decomp, info_size, blocks_size = struct.unpack(">5Q", mm[pos:pos + 40])
+            pos += 40 + 4
+        else:
+            num_blocks, num_entries, info_size, blocks_size = struct.unpack(">4I", mm[pos:pos + 16])
+            pos += 16
+
+        info = mm[pos:pos + info_size]
+        pos += info_size
+        if self.version >= 2.0:
+            if self._encrypted & 2:
+                info = _decrypt_key_block_info(info)
+            info = _decompress_block(info, info_decomp)
+        block_sizes = self._parse_key_block_info(info)
+        if len(block_sizes) != num_blocks:
+            raise ValueError(f"键块数不符: {len(block_sizes)} != {num_blocks}")
+
+        keys: List[str] = []
+        key_ids: List[int] = []
+        for comp_size, decomp_size in block_sizes:
+            block = _decompress_block(mm[pos:pos + comp_size], decomp_size)
+            pos += comp_size
+            self._split_key_block(block, keys, key_ids)
+        if len(keys) != num_entries:
+            raise ValueError(f"词条数不符: {len(keys)} != {num_entries}")
+
+        self._keys = keys
+        self._key_ids = key_ids
+        self._index: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            self._index.setdefault(self._normalize(key), []).append(i)
+        return pos
+
+    def _parse_key_block_info(self, info: bytes) -> List[Tuple[int, int]]:
+        sizes = []
+        i = 0
+        width = self._num_width
+        v2 = self.version >= 2.0
+        while i < len(info):
+            i += width  # 本块词条数
+            for _ in range(2):  # 首、末键
+                if v2:
+                    size = struct.unpack(">H", info[i:i + 2])[0]
+                    i += 2 + (size + 1) * self._unit
+                else:
+                    size = info[i]
+                    i += 1 + size * self._unit
+            comp_size, decomp_size = struct.unpack(">" + self._num_fmt[1] * 2, info[i:i + 2 * width])
+            i += 2 * width
+            sizes.append((comp_size, decomp_size))
+        return sizes
+
+    def _split_key_block(self, block: bytes, keys: List[str], key_ids: List[int]) -> None:
+        width = self._num_width
+        delimiter = b"\x00" * self._unit
+        i = 0
+        while i < len(block):
+            key_ids.append(struct.unpack(self._num_fmt, block[i:i + width])[0])
+            i += width
+            end = block.find(delimiter, i)
+            while self._unit == 2 and end != -1 and (end - i) % 2:
+                end = block.find(delimiter, end + 1)
+            if end == -1:
+                end = len(block)
+            keys.append(block[i:end].decode(self.encoding, errors="replace"))
+            i = end + self._unit
+
+    def _read_record_table(self, pos: int) -> None:
+        num_blocks, pos = self._num(pos)
+        num_entries, pos = self._num(pos)
+        info_size, pos = self._num(pos)
+        _, pos = self._num(pos)  # 记录块总字节数
+        if num_entries != len(self._keys):
+            raise ValueError(f"记录数不符: {num_entries} != {len(self._keys)}")
+
+        sizes = struct.unpack(f">{2 * num_blocks}{self._num_fmt[1]}", self._mm[pos:pos + info_size])
+        pos += info_size
+        self._comp_offsets = [pos]
+        self._decomp_offsets = [0]
+        self._decomp_sizes = []
+        for b in range(num_blocks):
+            self._comp_offsets.append(self._comp_offsets[-1] + sizes[2 * b])
+            self._decomp_offsets.append(self._decomp_offsets[-1] + sizes[2 * b + 1])
+            self._decomp_sizes.append(sizes[2 * b + 1])
+
+    # ----- 记录 -----
+
+    def _normalize(self, key: str) -> str:
+        if self._strip_key:
+            key = re.sub(r"[ _=,.;:!?@%&#~`()\[\]<>{}/\\$+\-*^'\"\t|]", "", key)
+        if not self._case_sensitive:
+            key = key.lower()
+        return key.strip()
+
+    def _block(self, b: int) -> bytes:
+        with self._lock:
+            data = self._blocks.get(b)
+            if data is not None:
+                self._blocks.move_to_end(b)
+                return data
+        start, end = self._comp_offsets[b], self._comp_offsets[b + 1]
+        data = _decompress_block(self._mm[start:end], self._decomp_sizes[b])
+        with self._lock:
+            self._blocks[b] = data
+            while len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+        return data
+
+    def _record_span(self, i: int) -> Tuple[int, int]:
+        start = self._key_ids[i]
+        end = self._key_ids[i + 1] if i + 1 < len(self._key_ids) else self._decomp_offsets[-1]
+        return start, end
+
+    def _raw_record(self, i: int) -> bytes:
+        start, end = self._record_span(i)
+        parts = []
+        b = bisect_right(self._decomp_offsets, start) - 1
+        while start < end and b < len(self._decomp_sizes):
+            base = self._decomp_offsets[b]
+            piece = self._block(b)[start - base:end - base]
+            if not piece:
+                break
+            parts.append(piece)
+            start += len(piece)
+            b += 1
+        return b"".join(parts)
+
+    def _decode_record(self, raw: bytes):
+        return raw
+
+    def keys(self) -> List[str]:
+        """全部词条键（文件顺序）"""
+        return list(self._keys)
+
+    def record(self, i: int):
+        """第 i 条词条的正文"""
+        return self._decode_record(self._raw_record(i))
+
+    def lookup_raw(self, key: str) -> list:
+        """按键查询，返回全部同键记录（不跟随 @@@LINK 跳转）"""
+        return [self.record(i) for i in self._index.get(self._normalize(key), ())]
+
+    def lookup(self, key: str) -> list:
+        """按键查询，返回全部同键记录"""
+        return self.lookup_raw(key)
+
+    def items(self) -> Iterator[Tuple[str, Union[str, bytes]]]:
+        """
+        按文件顺序遍历 (键, 记录)
+
+        逐个记录块解压，同一时刻只持有一块，不占用块缓存
+        """
+        b = -1
+        data = b""
+        for i, key in enumerate(self._keys):
+            start, end = self._record_span(i)
+            if b < 0 or not (self._decomp_offsets[b] <= start and end <= self._decomp_offsets[b + 1]):
+                nb = bisect_right(self._decomp_offsets, start) - 1
+                if end > self._decomp_offsets[nb + 1]:
+                    yield key, self.record(i)  # 跨块记录（少见）
+                    continue
+                b = nb
+                start_c, end_c = self._comp_offsets[b], self._comp_offsets[b + 1]
+                data = _decompress_block(self._mm[start_c:end_c], self._decomp_sizes[b])
+            base = self._decomp_offsets[b]
+            yield key, self._decode_record(data[start - base:end - base])
+
+    def close(self) -> None:
+        """释放映射与缓存"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._blocks.clear()
+
+
+class MDXReader(MDictReader):
+    """
+    .mdx 读取器：记录为HTML文本
+
+    lookup 会跟随 "@@@LINK=目标" 跳转（最多 max_links 层）
+    """
+
+    def __init__(self, path, cache_blocks: int = DEFAULT_CACHE_BLOCKS, max_links: int = 5):
+        super().__init__(path, cache_blocks)
+        self.max_links = max_links
+
+    def _decode_record(self, raw: bytes) -> str:
+        return raw.decode(self.encoding, errors="replace").rstrip("\x00").strip()
+
+    def lookup(self, key: str) -> List[str]:
+        results = []
+        seen = {self._normalize(key)}
+        pending = self.lookup_raw(key)
+        depth = 0
+        while pending:
+            following = []
+            for text in pending:
+                if text.startswith(_LINK_PREFIX):
+                    target = text[len(_LINK_PREFIX):].strip()
+                    norm = self._normalize(target)
+                    if norm not in seen and depth < self.max_links:
+                        seen.add(norm)
+                        following.extend(self.lookup_raw(target))
+                else:
+                    results.append(text)
+            pending = following
+            depth += 1
+        return results
+
+
+class MDDReader(MDictReader):
+    """.mdd 读取器：资源文件，键为 "\\路径"（UTF-16），记录为原始字节"""
+
+    _force_utf16 = True
+
+    def _normalize(self, key: str) -> str:
+        key = key.replace("/", "\\")
+        if not key.startswith("\\"):
+            key = "\\" + key
+        return key.lower()
+
+    def lookup(self, key: str) -> List[bytes]:
+        return self.lookup_raw(key)
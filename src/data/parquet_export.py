@@ -0,0 +1,252 @@
+"""
+《汉语大词典》列式导出（Parquet）与查询
+
+负责人：成员E（数据工程）
+
+把 process_jsonl 生成的结构化JSONL导出为三张表，每张表按源文件区间分片：
+    <输出目录>/entries/part-00000.parquet   词条：词头、简体、读音、redirect_to、variant_of、义项数、例证数
+    <输出目录>/senses/part-00000.parquet    义项：释义、参见
+    <输出目录>/examples/part-00000.parquet  例证：出处、引文、全文
+
+entry_id 为词条在JSONL中的字节偏移，三张表可按它关联，也可直接用偏移量回读原始词条。
+全书统计（如"含‘通’的义项有多少""哪些词条有 redirect_to"）只读取用到的列、
+用 pyarrow.compute 向量化过滤，不必再逐行 json.loads 整个文件。
+
+依赖 pyarrow（可选）：pip install pyarrow
+"""
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .dyhdc_index_builder import DEFAULT_CHUNK_SIZE, split_line_ranges
+from .jsonl_codec import DECODE_ERRORS, decode_entry
+
+
+TABLES = ("entries", "senses", "examples")
+
+
+def _schemas():
+    import pyarrow as pa
+
+    strings = pa.list_(pa.string())
+    return {
+        "entries": pa.schema([
+            ("entry_id", pa.int64()),
+            ("headword", pa.string()),
+            ("first_char", pa.string()),
+            ("hw", pa.string()),
+            ("simp", pa.string()),
+            ("pron", pa.string()),
+            ("redirect_to", pa.string()),
+            ("variant_of", strings),
+            ("n_senses", pa.int32()),
+            ("n_examples", pa.int32()),
+        ]),
+        "senses": pa.schema([
+            ("entry_id", pa.int64()),
+            ("sense_no", pa.int32()),
+            ("headword", pa.string()),
+            ("mean", pa.string()),
+            ("see", strings),
+        ]),
+        "examples": pa.schema([
+            ("entry_id", pa.int64()),
+            ("sense_no", pa.int32()),
+            ("example_no", pa.int32()),
+            ("headword", pa.string()),
+            ("books", strings),
+            ("quotes", strings),
+            ("text", pa.string()),
+        ]),
+    }
+
+
+def _export_range(task: Tuple[str, int, int, str, int, str]) -> Dict[str, int]:
+    """进程池任务：把一个字节区间的词条写成三张表的一个分片，返回各表行数"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path, start, end, out_dir, part, compression = task
+    columns: Dict[str, Dict[str, List[Any]]] = {
+        name: {field.name: [] for field in schema}
+        for name, schema in _schemas().items()
+    }
+    entries, senses, examples = columns["entries"], columns["senses"], columns["examples"]
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            entry_id = offset
+            offset += len(line)
+            try:
+                entry = decode_entry(line)
+            except DECODE_ERRORS:
+                continue
+            headword = entry.key
+            if not headword or headword.startswith('#'):
+                continue
+
+            n_examples = 0
+            for sense_no, sense in enumerate(entry.senses):
+                senses["entry_id"].append(entry_id)
+                senses["sense_no"].append(sense_no)
+                senses["headword"].append(headword)
+                senses["mean"].append(sense.mean)
+                senses["see"].append(sense.see)
+                for example_no, ex in enumerate(sense.examples):
+                    n_examples += 1
+                    examples["entry_id"].append(entry_id)
+                    examples["sense_no"].append(sense_no)
+                    examples["example_no"].append(example_no)
+                    examples["headword"].append(headword)
+                    examples["books"].append(ex.books)
+                    examples["quotes"].append(ex.quotes)
+                    examples["text"].append(ex.text)
+
+            entries["entry_id"].append(entry_id)
+            entries["headword"].append(headword)
+            entries["first_char"].append(headword[0])
+            entries["hw"].append(entry.hw or None)
+            entries["simp"].append(entry.simp)
+            entries["pron"].append(entry.pron)
+            entries["redirect_to"].append(entry.redirect_to)
+            entries["variant_of"].append(entry.variant_of)
+            entries["n_senses"].append(len(entry.senses))
+            entries["n_examples"].append(n_examples)
+
+    counts = {}
+    for name, schema in _schemas().items():
+        table = pa.Table.from_pydict(columns[name], schema=schema)
+        target = Path(out_dir) / name / f"part-{part:05d}.parquet"
+        pq.write_table(table, target, compression=compression)
+        counts[name] = table.num_rows
+    return counts
+
+
+def export_parquet(
+    jsonl_path: str = None,
+    output_dir: str = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """
+    把结构化JSONL导出为 entries / senses / examples 三张Parquet表
+
+    Args:
+        jsonl_path: process_jsonl 的输出（默认 dyhdc.parsed.fixed.v2.jsonl）
+        output_dir: 输出目录（默认 data/processed/dyhdc_parquet）
+        workers: 进程数，默认为CPU核数；每个区间各写一个分片
+        chunk_size: 每个区间（分片）的目标字节数
+        compression: Parquet压缩算法
+
+    Returns:
+        各表行数，如 {"entries": ..., "senses": ..., "examples": ...}；pyarrow 未安装时为空字典
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("警告: pyarrow未安装，无法导出Parquet（pip install pyarrow）")
+        return {}
+
+    project_root = Path(__file__).parent.parent.parent
+    if jsonl_path is None:
+        jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
+    if output_dir is None:
+        output_dir = project_root / "data/processed/dyhdc_parquet"
+
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        print(f"错误: 文件不存在: {jsonl_path}")
+        return {}
+
+    output_dir = Path(output_dir)
+    for name in TABLES:
+        table_dir = output_dir / name
+        table_dir.mkdir(parents=True, exist_ok=True)
+        # 清掉旧分片，避免分片数减少时残留
+        for old in table_dir.glob("part-*.parquet"):
+            old.unlink()
+
+    print(f"正在导出Parquet: {jsonl_path} -> {output_dir}")
+    start_time = time.time()
+    tasks = [
+        (str(jsonl_path), start, end, str(output_dir), part, compression)
+        for part, (start, end) in enumerate(split_line_ranges(jsonl_path, chunk_size))
+    ]
+
+    totals = dict.fromkeys(TABLES, 0)
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_export_range, tasks)
+        pool = None
+    else:
+        from multiprocessing import Pool
+        pool = Pool(workers)
+        results = pool.imap_unordered(_export_range, tasks)
+    try:
+        for counts in results:
+            for name, count in counts.items():
+                totals[name] += count
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.time() - start_time
+    print(f"导出完成: {totals['entries']} 条词条, {totals['senses']} 个义项, {totals['examples']} 条例证")
+    print(f"耗时: {elapsed:.1f}s")
+    return totals
+
+
+class ParquetDictionary:
+    """
+    列式词典查询
+
+    使用方法：
+        pd_dict = ParquetDictionary("data/processed/dyhdc_parquet")
+        pd_dict.count_senses_with("通“")
+        pd_dict.scan("entries", columns=["headword", "redirect_to"],
+                     filter=pc.field("redirect_to").is_valid())
+    """
+
+    def __init__(self, root: str = None):
+        import pyarrow.dataset as ds
+
+        if root is None:
+            root = Path(__file__).parent.parent.parent / "data/processed/dyhdc_parquet"
+        self.root = Path(root)
+        self._datasets = {name: ds.dataset(self.root / name, format="parquet") for name in TABLES}
+
+    def scan(self, table: str, columns: Optional[Sequence[str]] = None, filter=None):
+        """
+        读取一张表，只解码 columns 中的列，filter 为 pyarrow.dataset 表达式（下推到分片）
+
+        Returns:
+            pyarrow.Table
+        """
+        return self._datasets[table].to_table(columns=list(columns) if columns else None, filter=filter)
+
+    def senses_with(self, term: str, columns: Sequence[str] = ("headword", "mean")):
+        """释义中包含 term 的义项"""
+        import pyarrow.compute as pc
+
+        return self.scan("senses", columns=columns, filter=pc.match_substring(pc.field("mean"), term))
+
+    def count_senses_with(self, term: str) -> int:
+        """释义中包含 term 的义项数"""
+        import pyarrow.compute as pc
+
+        total = 0
+        for batch in self._datasets["senses"].to_batches(columns=["mean"]):
+            total += pc.sum(pc.match_substring(batch.column("mean"), term)).as_py() or 0
+        return total
+
+    def redirect_entries(self):
+        """有 redirect_to 的词条：(headword, redirect_to)"""
+        import pyarrow.compute as pc
+
+        return self.scan("entries", columns=["headword", "redirect_to"], filter=pc.field("redirect_to").is_valid())
@@ -0,0 +1,407 @@
+"""
+上古音拟音的音段切分与发音特征
+
+负责人：成员E（数据工程）
+
+把白一平-沙加尔（*[dz]<r>uŋ、*Cə.[ɢ]am、*kʷˤet-s）、潘悟云（ɡʳa̠ŋs、l̥ʲɯ̠d、sɢˡaŋʔ）
+与斯塔罗斯金（khwǝ́、kwrānh、ʒ(h)rāh）三套写法规整到同一套音段上，再按音节结构切成五个槽位：
+    声干（主声母）  介音（r/l/j/w）  主元音  韵尾  韵尾后附（-s / -ʔ）
+另记一个"A型"标记（潘悟云元音下的 ̠，白-沙的 ˤ，大致对应一、二、四等）。
+
+体系间的对应：白-沙 ə ≈ 潘 ɯ ≈ 斯 ǝ；白-沙 ˤ ≈ 潘 ̠ ≈ 斯长元音（ā）；潘 ʳ ʲ ˡ 为介音 r j l；
+斯塔罗斯金辅音后的 h 为送气（清响音），韵尾 -h 相当于 -s，声调符号不计。
+前置音节（Cə. / ɡ. / s.）与前缀（s- N- m-）不进入槽位，只有最后一个音节的声干参与比较。
+
+每个辅音有 (部位, 方式, 清浊, 送气, 圆唇) 五个特征，元音有 (舌位高低, 前后, 圆唇) 三个特征；
+槽位距离由特征差加权得出，都在 0~1 之间。
+
+两个拟音的相似度用特征编辑距离：替换代价为两音段的特征距离（按音段对缓存），
+增删代价为 1（介音/半元音 r l j w 为 0.5），A型不同另加 0.5，按较长一方的总代价归一化。
+单对比较走带缓存的动态规划（feature_edit_distance）；
+大批量用 feature_edit_distances 把音段编码成整数，按位置对全部拟音对做向量化的动态规划，结果与单对一致。
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# ===== 特征表 =====
+
+# 部位：唇 0，舌尖 1，舌面 2，舌根 3，小舌 3.5，喉 4
+# 方式：塞 0，塞擦 1，擦 2，鼻 3，边/颤 4，半元音 5
+# 辅音 -> (部位, 方式, 浊)
+CONSONANTS: Dict[str, Tuple[float, float, int]] = {
+    "p": (0, 0, 0), "b": (0, 0, 1), "m": (0, 3, 1), "f": (0, 2, 0), "v": (0, 2, 1), "w": (0, 5, 1),
+    "t": (1, 0, 0), "d": (1, 0, 1), "n": (1, 3, 1), "l": (1, 4, 1), "r": (1, 4, 1),
+    "s": (1, 2, 0), "z": (1, 2, 1), "ts": (1, 1, 0), "dz": (1, 1, 1),
+    "c": (2, 0, 0), "j": (2, 5, 1),
+    "k": (3, 0, 0), "g": (3, 0, 1), "ŋ": (3, 3, 1), "x": (3, 2, 0),
+    "q": (3.5, 0, 0), "ɢ": (3.5, 0, 1),
+    "ʔ": (4, 0, 0), "h": (4, 2, 0), "ɦ": (4, 2, 1),
+}
+
+# 元音 -> (高低, 前后, 圆唇)；白-沙 ə 与潘悟云 ɯ 视为同一音位
+VOWELS: Dict[str, Tuple[float, float, int]] = {
+    "i": (3, 0, 0), "e": (2, 0, 0), "a": (0, 1, 0),
+    "ə": (2.5, 1, 0), "ɯ": (2.5, 1, 0), "ɨ": (3, 1, 0),
+    "u": (3, 2, 1), "o": (2, 2, 1), "y": (3, 0, 1),
+}
+
+# 槽位权重（和为 1）
+SLOT_WEIGHTS: Dict[str, float] = {
+    "onset": 0.35,
+    "medial": 0.10,
+    "nucleus": 0.20,
+    "type_a": 0.05,
+    "coda": 0.20,
+    "post": 0.10,
+}
+
+_MEDIALS = {"r", "l", "j", "w"}
+_POST_CODAS = {"s", "ʔ"}
+
+_MODIFIERS = {
+    "ʰ": "aspirated",
+    "̥": "voiceless", "̊": "voiceless",
+    "̠": "type_a", "̄": "type_a",
+}
+# 各体系的特殊字母 -> 统一写法（A 为白-沙的不定元音）
+_LETTERS = str.maketrans({"ɡ": "g", "ǝ": "ə", "ʒ": "dz", "ƛ": "l", "Ł": "l", "A": "a"})
+# 上标介音（潘悟云）
+_SUPERSCRIPT_MEDIALS = {"ʳ": "r", "ʲ": "j", "ˡ": "l"}
+
+_DROP_RE = re.compile(r"[\*\[\]\(\)<>\-\?!'‘’:0-9A-Z]")
+
+
+class Segment(NamedTuple):
+    """一个音段：base 为基本音，其余为附加特征"""
+    base: str
+    aspirated: bool = False
+    voiceless: bool = False
+    labialized: bool = False
+
+    @property
+    def is_vowel(self) -> bool:
+        return self.base in VOWELS
+
+    @property
+    def symbol(self) -> str:
+        return (self.base + ("̥" if self.voiceless else "") + ("ʷ" if self.labialized else "")
+                + ("ʰ" if self.aspirated else ""))
+
+
+class Syllable(NamedTuple):
+    """音节槽位；缺的槽位为 None / 空串"""
+    onset: Optional[Segment]
+    medial: str
+    nucleus: Segment
+    coda: Optional[Segment]
+    post: str
+    type_a: bool
+
+
+def normalize(recon: str) -> str:
+    """
+    规整拟音写法，只保留主音节
+
+    去掉 * [] () <> - 与注释（首个空白之后的内容），多个拟音取第一个；
+    带附加符号的字母拆成 字母 + 附加符号（ā -> a + ̄），特殊字母换成统一写法
+    """
+    text = recon.strip().split(None, 1)[0] if recon.strip() else ""
+    text = re.split(r"[,;~/|]", text)[0]
+    text = unicodedata.normalize("NFD", text).translate(_LETTERS)
+    text = _DROP_RE.sub("", text)
+    # 前置音节（Cə. / ɡ. / s.）不参与比较
+    return text.rsplit(".", 1)[-1]
+
+
+@lru_cache(maxsize=65536)
+def tokenize(recon: str) -> Tuple[Tuple[Segment, ...], bool]:
+    """
+    切分音段
+
+    Returns:
+        (音段序列, 是否A型)；上标介音 ʳ ʲ ˡ 切成独立音段，ʷ 在辅音后为圆唇、在元音后为韵尾 w
+    """
+    text = normalize(recon)
+    segments: List[Segment] = []
+    type_a = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        two = text[i:i + 2]
+        # 词尾的 ts 是韵尾 t 加后附 -s（*kʷˤet-s），不是塞擦音
+        if two in ("ts", "dz") and i + 2 < len(text):
+            segments.append(Segment(two))
+            i += 2
+            continue
+        i += 1
+        in_onset = bool(segments) and not any(seg.is_vowel for seg in segments)
+        if ch == "h" and in_onset:
+            # 斯塔罗斯金：塞音后为送气，响音后为清化
+            if CONSONANTS[segments[-1].base][1] <= 2:
+                segments[-1] = segments[-1]._replace(aspirated=True)
+            else:
+                segments[-1] = segments[-1]._replace(voiceless=True)
+        elif ch == "w" and in_onset and CONSONANTS[segments[-1].base][0] >= 3:
+            # 斯塔罗斯金 kw、qw：圆唇舌根/小舌音
+            segments[-1] = segments[-1]._replace(labialized=True)
+        elif ch in CONSONANTS or ch in VOWELS:
+            segments.append(Segment(ch))
+        elif ch in _SUPERSCRIPT_MEDIALS:
+            segments.append(Segment(_SUPERSCRIPT_MEDIALS[ch]))
+        elif ch == "ˤ":
+            type_a = True
+        elif ch == "ʷ":
+            if segments and not segments[-1].is_vowel:
+                segments[-1] = segments[-1]._replace(labialized=True)
+            else:
+                segments.append(Segment("w"))
+        elif ch in _MODIFIERS and segments:
+            flag = _MODIFIERS[ch]
+            if flag == "type_a":
+                type_a = True
+            else:
+                segments[-1] = segments[-1]._replace(**{flag: True})
+    return tuple(segments), type_a
+
+
+@lru_cache(maxsize=65536)
+def parse_syllable(recon: str) -> Optional[Syllable]:
+    """把拟音切成音节槽位；无法识别主元音时返回 None"""
+    segments, type_a = tokenize(recon)
+    vowel_at = next((k for k, seg in enumerate(segments) if seg.is_vowel), None)
+    if vowel_at is None:
+        return None
+
+    onset = list(segments[:vowel_at])
+    medial = ""
+    if len(onset) >= 2 and onset[-1].base in _MEDIALS:
+        medial = onset.pop().base
+    # 声干为紧靠介音/元音的辅音，其前的 s- 等视为前缀
+    initial = onset[-1] if onset else None
+
+    nucleus = segments[vowel_at]
+    rest = list(segments[vowel_at + 1:])
+    if rest and rest[0].is_vowel:
+        # 元音后的 i/u 作韵尾 j/w
+        rest[0] = Segment({"i": "j", "u": "w"}.get(rest[0].base, rest[0].base))
+    if rest and rest[-1].base == "h":
+        rest[-1] = Segment("s")  # 斯塔罗斯金 -h
+    post = ""
+    if rest and rest[-1].base in _POST_CODAS:
+        post = rest.pop().base
+        if post == "s" and rest and rest[-1].base == "ʔ":
+            post = rest.pop().base + post
+    coda = rest[0] if rest else None
+    return Syllable(initial, medial, nucleus, coda, post, type_a)
+
+
+# ===== 距离 =====
+
+def consonant_distance(a: Optional[Segment], b: Optional[Segment]) -> float:
+    """两个辅音的特征距离（0~1）；一方缺失时为 1"""
+    if a is None or b is None:
+        return 0.0 if a is b else 1.0
+    if a == b:
+        return 0.0
+    pa, ma, va = CONSONANTS[a.base]
+    pb, mb, vb = CONSONANTS[b.base]
+    va = 0 if a.voiceless else va
+    vb = 0 if b.voiceless else vb
+    return (0.4 * min(1.0, abs(pa - pb) / 2)
+            + 0.3 * min(1.0, abs(ma - mb) / 3)
+            + 0.15 * abs(va - vb)
+            + 0.1 * (a.aspirated != b.aspirated)
+            + 0.05 * (a.labialized != b.labialized))
+
+
+def vowel_distance(a: Segment, b: Segment) -> float:
+    """两个元音的特征距离（0~1）"""
+    if a.base == b.base:
+        return 0.0
+    ha, ba, ra = VOWELS[a.base]
+    hb, bb, rb = VOWELS[b.base]
+    return 0.5 * min(1.0, abs(ha - hb) / 3) + 0.35 * min(1.0, abs(ba - bb) / 2) + 0.15 * abs(ra - rb)
+
+
+def segment_distance(a: Optional[Segment], b: Optional[Segment]) -> float:
+    """任意两个音段的距离：元音对元音、辅音对辅音按特征；元音对辅音为 1"""
+    if a is not None and b is not None and a.is_vowel and b.is_vowel:
+        return vowel_distance(a, b)
+    if (a is not None and a.is_vowel) or (b is not None and b.is_vowel):
+        return 1.0
+    return consonant_distance(a, b)
+
+
+def _set_distance(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    sa, sb = set(a), set(b)
+    return 1.0 - len(sa & sb) / len(sa | sb)
+
+
+def slot_distance(slot: str, a, b) -> float:
+    """单个槽位的距离（0~1）"""
+    if slot in ("onset", "coda"):
+        return segment_distance(a, b)
+    if slot == "nucleus":
+        return vowel_distance(a, b)
+    if slot == "type_a":
+        return float(a != b)
+    return _set_distance(a, b)
+
+
+def syllable_distance(a: Syllable, b: Syllable) -> float:
+    """两个音节的加权槽位距离（0~1）"""
+    return sum(weight * slot_distance(slot, getattr(a, slot), getattr(b, slot))
+               for slot, weight in SLOT_WEIGHTS.items())
+
+
+# ===== 特征编辑距离 =====
+
+# 拟音相似度达到此值即视为"音极近"（随机两字约千分之五）
+RECON_SIMILARITY_THRESHOLD = 0.85
+
+INDEL_COST = 1.0
+GLIDE_INDEL_COST = 0.5  # 介音/半元音的增删（如 *dzruŋ 与 *tuŋ 的 r）
+TYPE_A_COST = 0.5
+
+
+@lru_cache(maxsize=None)
+def substitution_cost(a: Segment, b: Segment) -> float:
+    """替换代价（按音段对缓存）"""
+    return segment_distance(a, b)
+
+
+def indel_cost(segment: Segment) -> float:
+    """增删代价"""
+    return GLIDE_INDEL_COST if segment.base in _MEDIALS else INDEL_COST
+
+
+def _edit_distance(recon_a: str, recon_b: str) -> float:
+    segs_a, type_a = tokenize(recon_a)
+    segs_b, type_b = tokenize(recon_b)
+    if not segs_a or not segs_b:
+        return 1.0
+    # 单行滚动的 Levenshtein 动态规划
+    previous = [0.0]
+    for seg in segs_b:
+        previous.append(previous[-1] + indel_cost(seg))
+    for seg_a in segs_a:
+        delete = indel_cost(seg_a)
+        current = [previous[0] + delete]
+        for j, seg_b in enumerate(segs_b, 1):
+            current.append(min(
+                previous[j] + delete,
+                current[j - 1] + indel_cost(seg_b),
+                previous[j - 1] + substitution_cost(seg_a, seg_b),
+            ))
+        previous = current
+    cost = previous[-1] + TYPE_A_COST * (type_a != type_b)
+    norm = max(sum(map(indel_cost, segs_a)), sum(map(indel_cost, segs_b))) + TYPE_A_COST
+    return min(1.0, cost / norm)
+
+
+@lru_cache(maxsize=262144)
+def _cached_edit_distance(recon_a: str, recon_b: str) -> float:
+    return _edit_distance(recon_a, recon_b)
+
+
+def feature_edit_distance(recon_a: str, recon_b: str) -> float:
+    """
+    两个拟音的特征编辑距离（0~1）
+
+    *dzruŋ 与 *tuŋ：dz→t 为同部位塞擦/塞音替换、r 为介音增删，距离远小于按字符比较；
+    任一方切不出音段时为 1
+    """
+    if recon_a > recon_b:
+        recon_a, recon_b = recon_b, recon_a
+    return _cached_edit_distance(recon_a, recon_b)
+
+
+def recon_similarity(recon_a: str, recon_b: str) -> float:
+    """两个拟音的相似度（0~1）：1 - 特征编辑距离；任一方为空时为 0"""
+    if not recon_a or not recon_b:
+        return 0.0
+    if recon_a == recon_b:
+        return 1.0
+    return 1.0 - feature_edit_distance(recon_a, recon_b)
+
+
+def feature_edit_distances(pairs: Iterable[Tuple[str, str]], chunk_size: int = 100000) -> "np.ndarray":
+    """
+    批量特征编辑距离（NumPy 向量化，结果与 feature_edit_distance 相同）
+
+    每个不同的拟音只切分一次，音段编码为整数（音段表通常不过百余项），替换/增删代价查表；
+    动态规划按 (i, j) 位置推进，每一步同时更新一块（chunk_size 对）拟音对。
+    """
+    # numpy 只在批量计算时导入，导入本模块（及 src.data）不加载 numpy
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("feature_edit_distances 需要 numpy") from None
+    recon_ids: Dict[str, int] = {}
+    ids = np.array([recon_ids.setdefault(recon, len(recon_ids)) for pair in pairs for recon in pair],
+                   dtype=np.int64).reshape(-1, 2)
+
+    # 拟音 -> 音段编码行（0 为补位）、音段数、是否A型
+    inventory: Dict[Segment, int] = {}
+    tokenized = [tokenize(recon) for recon in recon_ids]
+    width = max([len(segments) for segments, _ in tokenized] + [0])
+    codes = np.zeros((len(tokenized), width), dtype=np.int64)
+    lengths = np.zeros(len(tokenized), dtype=np.int64)
+    type_a = np.zeros(len(tokenized), dtype=bool)
+    for r, (segments, is_a) in enumerate(tokenized):
+        codes[r, :len(segments)] = [inventory.setdefault(seg, len(inventory) + 1) for seg in segments]
+        lengths[r] = len(segments)
+        type_a[r] = is_a
+
+    # 代价表；编码 0 为补位：增删代价 0、替换代价极大，补位行、列的格子只会沿用前面的值
+    segments = [None] + list(inventory)
+    sub = np.full((len(segments), len(segments)), 1e9, dtype=np.float64)
+    indel = np.zeros(len(segments), dtype=np.float64)
+    for x in range(1, len(segments)):
+        indel[x] = indel_cost(segments[x])
+        for y in range(1, len(segments)):
+            sub[x, y] = substitution_cost(segments[x], segments[y])
+
+    # 按音段数排序后分块，短拟音的块动态规划的格子少
+    order = np.argsort(np.maximum(lengths[ids[:, 0]], lengths[ids[:, 1]]), kind="stable")
+    result = np.zeros(len(ids), dtype=np.float64)
+    for k in range(0, len(ids), chunk_size):
+        rows = order[k:k + chunk_size]
+        a, b = ids[rows, 0], ids[rows, 1]
+        chunk_width = int(max(lengths[a].max(initial=0), lengths[b].max(initial=0)))
+        distances = _batch_edit_distances(codes[a, :chunk_width].T, codes[b, :chunk_width].T,
+                                          lengths[b], sub, indel)
+        distances += TYPE_A_COST * (type_a[a] != type_a[b])
+        norm = np.maximum(indel[codes[a]].sum(axis=1), indel[codes[b]].sum(axis=1)) + TYPE_A_COST
+        distances = np.minimum(1.0, distances / norm)
+        distances[(lengths[a] == 0) | (lengths[b] == 0)] = 1.0
+        result[rows] = distances
+    return result
+
+
+def _batch_edit_distances(codes_a: "np.ndarray", codes_b: "np.ndarray", len_b: "np.ndarray",
+                          sub: "np.ndarray", indel: "np.ndarray") -> "np.ndarray":
+    """一块拟音对的向量化动态规划；codes 按 (位置 × 拟音对) 存放，每一步取的是连续的一行"""
+    import numpy as np
+
+    width, n = codes_a.shape
+    del_a = indel[codes_a]
+    ins_b = indel[codes_b]
+    previous = np.concatenate([np.zeros((1, n)), np.cumsum(ins_b, axis=0)], axis=0)
+    for i in range(width):
+        current = np.empty_like(previous)
+        current[0] = previous[0] + del_a[i]
+        cost = sub[codes_a[i], codes_b]
+        for j in range(1, width + 1):
+            np.minimum(previous[j] + del_a[i], current[j - 1] + ins_b[j - 1], out=current[j])
+            np.minimum(current[j], previous[j - 1] + cost[j - 1], out=current[j])
+        previous = current
+    return previous[len_b, np.arange(n)]
@@ -0,0 +1,311 @@
+"""
+全字表两两音近矩阵与 top-k 音近字
+
+负责人：成员E（数据工程）
+
+PhonologyTool.is_phonetically_close 一次只比较一对字；为假借找候选本字需要对全部字两两打分。
+PhoneticSimilarity 把某一数据源的全部读音编码成整数数组：
+    韵部、声母（类别编码）、声母组、拟音的六个音节槽位（phonemes.parse_syllable 的结果）
+特征完全相同的读音归为一类；各槽位先算好特征距离表，打分时按块对 (块内读音 × 全部读音类)
+用 NumPy 查表、加权，再展开回读音。得分与 PhonologyStore.best_pair 同一口径：
+    韵部相同 0.5 + 声母相同 0.3（同组 0.15）+ 拟音相似度 0.2，按两读都有的项归一化
+拟音相似度一项用槽位对齐的特征距离（1 - syllable_distance）代替逐对的特征编辑距离，
+可以整块查表；两者对同一音节结构的拟音给出相近的值，top-k 候选再用 best_pair 精排即可。
+字与字的得分取两字读音两两组合中的最高分（多音字不漏判），用 np.maximum.reduceat 按字归并。
+
+top_k() 对全字表逐块计算，每字保留得分最高的 k 个字，结果可存为 .npz：
+    build_phonetic_neighbors() -> data/processed/phonology_neighbors.npz
+之后给定借字，一次查表即可得到候选本字。
+
+使用方法：
+    store = PhonologyStore.open("data/processed/phonology.bin")
+    sim = PhoneticSimilarity(store)
+    chars, matrix = sim.matrix(["崇", "終", "衆"])
+    sim.neighbors("崇", k=10)          # 单字现算一行
+    PhoneticNeighbors.load("data/processed/phonology_neighbors.npz").neighbors("崇")
+"""
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .phonemes import SLOT_WEIGHTS, parse_syllable, slot_distance
+from .phonology_store import (
+    SOURCES,
+    WEIGHT_RECON,
+    WEIGHT_SHENGMU,
+    WEIGHT_YUNBU,
+    PhonologyStore,
+)
+
+
+DEFAULT_STORE_PATH = "data/processed/phonology.bin"
+DEFAULT_NEIGHBORS_PATH = "data/processed/phonology_neighbors.npz"
+DEFAULT_K = 20
+# 每块读音数；块内中间数组为 块大小 × 全部读音 个 float32
+DEFAULT_BLOCK_SIZE = 512
+
+_SLOT_PAIRS = (("onset", "medial"), ("nucleus", "type_a"), ("coda", "post"))
+
+
+class PhoneticSimilarity:
+    """
+    某一数据源的全字表音近打分器
+
+    只收录该数据源有读音的字；chars 为排序后的字表，每字的读音在数组中连续存放。
+    """
+
+    def __init__(self, store: PhonologyStore, source: str = "潘悟云"):
+        self.source = source
+        code = SOURCES.index(source)
+        chars: List[str] = []
+        starts: List[int] = []
+        rows: List[int] = []
+        for char in store.chars():
+            span = [i for i in store._span(char) if store._source[i] == code]
+            if span:
+                chars.append(char)
+                starts.append(len(rows))
+                rows.extend(span)
+        self.chars = chars
+        self._char_ids: Dict[str, int] = {char: i for i, char in enumerate(chars)}
+        # 每字读音区间的起点（np.maximum.reduceat 的分段）
+        self._starts = np.array(starts, dtype=np.int64)
+
+        # 读音特征：韵部、声母、声母组、六个拟音槽位；无法切分的拟音记为无拟音
+        syllables = [parse_syllable(store._texts[store._recon[i]]) if store._recon[i] else None for i in rows]
+        features = np.zeros((len(rows), 4 + len(_SLOT_PAIRS)), dtype=np.int64)
+        if rows:
+            idx = np.array(rows, dtype=np.int64)
+            features[:, 0] = np.asarray(store._yunbu)[idx]
+            features[:, 1] = np.asarray(store._shengmu)[idx]
+            features[:, 2] = [store._shengmu_group(int(c)) for c in features[:, 1]]
+            features[:, 3] = [s is not None for s in syllables]
+
+        # 槽位两两合并（声干+介音、主元音+A型、韵尾+后附），每对一张距离表，打分时只需查三次表
+        self._slot_tables: List[np.ndarray] = []
+        for p, (first, second) in enumerate(_SLOT_PAIRS):
+            tables, codes = [], []
+            for slot in (first, second):
+                values: Dict[object, int] = {}
+                slot_codes = [values.setdefault(getattr(s, slot), len(values)) if s is not None else 0
+                              for s in syllables]
+                inventory = list(values) or [None]
+                table = np.array([[slot_distance(slot, a, b) for b in inventory] for a in inventory],
+                                 dtype=np.float32) if values else np.zeros((1, 1), np.float32)
+                tables.append(table * np.float32(SLOT_WEIGHTS[slot]))
+                codes.append(np.array(slot_codes, dtype=np.int64))
+            width = tables[1].shape[0]
+            combined = (tables[0][:, None, :, None] + tables[1][None, :, None, :])
+            size = tables[0].shape[0] * width
+            self._slot_tables.append(combined.reshape(size, size))
+            features[:, 4 + p] = codes[0] * width + codes[1]
+
+        # 特征完全相同的读音归为一类，只对类两两打分（读音数约为类数的三倍）
+        classes, self._reading_class = np.unique(features, axis=0, return_inverse=True)
+        self._reading_class = self._reading_class.reshape(-1)
+        self._yunbu = classes[:, 0].astype(np.int32)
+        self._shengmu = classes[:, 1].astype(np.int32)
+        self._group = classes[:, 2].astype(np.int32)
+        self._has_recon = classes[:, 3].astype(bool)
+        self._slot_codes = [classes[:, 4 + p] for p in range(len(_SLOT_PAIRS))]
+        self._n_readings = len(rows)
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __contains__(self, char: str) -> bool:
+        return char in self._char_ids
+
+    # ----- 打分 -----
+
+    def _class_scores(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """读音类 × 读音类 的得分矩阵"""
+        a = a[:, None]
+        b = b[None, :]
+        ya, yb = self._yunbu[a], self._yunbu[b]
+        both_y = (ya > 0) & (yb > 0)
+        sa, sb = self._shengmu[a], self._shengmu[b]
+        both_s = (sa > 0) & (sb > 0)
+        ga, gb = self._group[a], self._group[b]
+        both_r = self._has_recon[a] & self._has_recon[b]
+
+        total = (WEIGHT_YUNBU * both_y + WEIGHT_SHENGMU * both_s + WEIGHT_RECON * both_r).astype(np.float32)
+        got = WEIGHT_YUNBU * (both_y & (ya == yb)).astype(np.float32)
+        shengmu = np.where(sa == sb, 1.0, np.where((ga > 0) & (ga == gb), 0.5, 0.0)).astype(np.float32)
+        got += WEIGHT_SHENGMU * shengmu * both_s
+
+        distance = np.zeros(total.shape, dtype=np.float32)
+        for codes, table in zip(self._slot_codes, self._slot_tables):
+            distance += table[codes[a], codes[b]]
+        got += WEIGHT_RECON * (1.0 - distance) * both_r
+
+        scores = np.zeros(total.shape, dtype=np.float32)
+        np.divide(got, total, out=scores, where=total > 0)
+        return scores
+
+    def _reading_scores(self, rows: np.ndarray, cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """读音 × 读音 的得分矩阵（cols 缺省为全部读音）"""
+        if cols is None:
+            # 与全部读音类打分后再展开到读音
+            scores = self._class_scores(self._reading_class[rows], np.arange(len(self._yunbu)))
+            return scores[:, self._reading_class]
+        return self._class_scores(self._reading_class[rows], self._reading_class[cols])
+
+    def _char_block(self, char_ids: np.ndarray, col_chars: Optional[np.ndarray] = None) -> np.ndarray:
+        """若干字 × 字 的得分（字间取读音两两组合的最高分）"""
+        rows, row_starts = self._rows_of(char_ids)
+        if col_chars is None:
+            cols, col_starts = None, self._starts
+        else:
+            cols, col_starts = self._rows_of(col_chars)
+        scores = self._reading_scores(rows, cols)
+        scores = np.maximum.reduceat(scores, col_starts, axis=1)
+        return np.maximum.reduceat(scores, row_starts, axis=0)
+
+    def _rows_of(self, char_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ends = np.append(self._starts, self._n_readings)
+        spans = [np.arange(ends[c], ends[c + 1]) for c in char_ids]
+        lengths = np.array([len(s) for s in spans], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(spans) else np.zeros(0, np.int64)
+        rows = np.concatenate(spans) if spans else np.zeros(0, np.int64)
+        return rows, starts
+
+    def matrix(self, chars: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        N 个字两两的得分矩阵
+
+        Args:
+            chars: 字列表（缺省为全字表，约一万五千字时矩阵接近 1GB，全表请用 top_k）
+
+        Returns:
+            (收录的字, N×N float32 矩阵)；未收录（该数据源无读音）的字被略去
+        """
+        known = self.chars if chars is None else [c for c in dict.fromkeys(chars) if c in self._char_ids]
+        ids = np.array([self._char_ids[c] for c in known], dtype=np.int64)
+        if not len(ids):
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return known, self._char_block(ids, ids)
+
+    def neighbors(self, char: str, k: int = 10) -> List[Tuple[str, float]]:
+        """与某字得分最高的 k 个字（现算一行，不含本字）"""
+        cid = self._char_ids.get(char)
+        if cid is None:
+            return []
+        row = self._char_block(np.array([cid]))[0]
+        row[cid] = -1.0
+        top = _top_indices(row[None, :], k)[0]
+        return [(self.chars[j], float(row[j])) for j in top]
+
+    def top_k(self, k: int = DEFAULT_K, block_size: int = DEFAULT_BLOCK_SIZE,
+              verbose: bool = False) -> "PhoneticNeighbors":
+        """
+        全字表每字的 top-k 音近字
+
+        按读音数分块（每块约 block_size 个读音）逐块计算，内存占用与字表大小成线性关系
+        """
+        n = len(self.chars)
+        k = min(k, max(n - 1, 0))
+        index = np.zeros((n, k), dtype=np.int32)
+        scores = np.zeros((n, k), dtype=np.float32)
+        ends = np.append(self._starts, self._n_readings)
+        start = time.time()
+        c0 = 0
+        while c0 < n:
+            c1 = int(np.searchsorted(ends, ends[c0] + block_size, side="right")) - 1
+            c1 = min(max(c1, c0 + 1), n)
+            ids = np.arange(c0, c1)
+            block = self._char_block(ids)
+            block[np.arange(len(ids)), ids] = -1.0  # 不含本字
+            top = _top_indices(block, k)
+            index[c0:c1] = top
+            scores[c0:c1] = np.take_along_axis(block, top, axis=1)
+            if verbose and (c1 * 10 // n) != (c0 * 10 // n):
+                print(f"  已完成 {c1}/{n} 字 ({time.time() - start:.1f}s)")
+            c0 = c1
+        return PhoneticNeighbors(self.chars, index, scores, self.source)
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """每行得分最高的 k 列（按得分降序；第 k 名有并列时取哪几列不定）"""
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int32)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.lexsort((part, -part_scores), axis=1)
+    return np.take_along_axis(part, order, axis=1).astype(np.int32)
+
+
+class PhoneticNeighbors:
+    """预先算好的 top-k 音近字表（top_k() 的结果，可存取 .npz）"""
+
+    def __init__(self, chars: Sequence[str], index: np.ndarray, scores: np.ndarray, source: str = "潘悟云"):
+        self.chars = list(chars)
+        self.index = index
+        self.scores = scores
+        self.source = source
+        self._char_ids = {char: i for i, char in enumerate(self.chars)}
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __contains__(self, char: str) -> bool:
+        return char in self._char_ids
+
+    @property
+    def k(self) -> int:
+        return self.index.shape[1]
+
+    def neighbors(self, char: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """某字的音近字 [(字, 得分)]，得分降序；未收录时为空列表"""
+        cid = self._char_ids.get(char)
+        if cid is None:
+            return []
+        k = self.k if k is None else min(k, self.k)
+        return [(self.chars[j], float(s)) for j, s in zip(self.index[cid, :k], self.scores[cid, :k])]
+
+    def save(self, path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, chars=np.array(self.chars), index=self.index, scores=self.scores,
+                                source=np.array(self.source))
+
+    @classmethod
+    def load(cls, path) -> "PhoneticNeighbors":
+        with np.load(path) as data:
+            return cls(data["chars"].tolist(), data["index"], data["scores"], str(data["source"]))
+
+
+def build_phonetic_neighbors(
+    store_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    k: int = DEFAULT_K,
+    source: str = "潘悟云",
+) -> Optional[PhoneticNeighbors]:
+    """
+    为全字表预计算 top-k 音近字并保存
+
+    Args:
+        store_path: 音韵存储路径（默认 data/processed/phonology.bin）
+        output_path: 输出路径（默认 data/processed/phonology_neighbors.npz）
+        k: 每字保留的音近字数
+        source: 用哪个数据源的读音打分
+    """
+    store_path = Path(store_path or DEFAULT_STORE_PATH)
+    output_path = Path(output_path or DEFAULT_NEIGHBORS_PATH)
+    if not store_path.exists():
+        print(f"错误: 文件不存在: {store_path}")
+        return None
+
+    start = time.time()
+    with PhonologyStore.open(store_path) as store:
+        print(f"正在编码读音: {store_path}（数据源: {source}）")
+        sim = PhoneticSimilarity(store, source)
+    print(f"共 {len(sim)} 字, {sim._n_readings} 个读音, 计算 top-{k}...")
+    neighbors = sim.top_k(k, verbose=True)
+    neighbors.save(output_path)
+    print(f"音近字表已保存: {output_path}")
+    print(f"耗时: {time.time() - start:.1f}s")
+    return neighbors
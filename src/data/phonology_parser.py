@@ -4,16 +4,26 @@
 负责人：成员E（数据工程）
 
 解析多种音韵数据源：
-1. 潘悟云《汉语古音手册》TXT
-2. 白一平-沙加尔 XLSX
-3. 整合为统一格式
+1. 潘悟云《汉语古音手册》TXT / MDX
+2. 白一平-沙加尔 XLSX / MDX（王力字典所附白-沙拟音补缺）
+3. 斯塔罗斯金 Chinese-characters MDX
+4. 中原音韵（unt校正）MDX
+5. 整合为统一格式
+
+MDX 经 mdict_reader 逐块流式读取；MDXPhonologySources 可按字查询而不解析整部词典。
 """
 import re
+import html
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from html.parser import HTMLParser
 
+from .char_convert import load_opencc_tables
+from .mdict_reader import MDXReader
+from .phonemes import RECON_SIMILARITY_THRESHOLD, recon_similarity
+from .phonology_store import SHENGMU_GROUPS, PhonologyStore, is_phonology_store
+
 
 class PanwuyunHTMLParser(HTMLParser):
     """解析潘悟云数据中的HTML表格"""
@@ -56,6 +66,75 @@ class PanwuyunHTMLParser(HTMLParser):
                 self.current_th = None
 
 
+def _panwuyun_entry(char: str, fields: Dict[str, str]) -> Dict[str, Any]:
+    """从潘悟云表格字段（繁体表头）提取关键字段"""
+    entry = {
+        "字": char,
+        "上古韵部": fields.get("上古韻部", ""),
+        "上古音": fields.get("上古音", ""),
+        "声母": fields.get("聲母", ""),
+        "韵": fields.get("韻", ""),
+        "开合": fields.get("開合", ""),
+        "等": fields.get("等", ""),
+        "声调": fields.get("聲調", ""),
+        "反切": fields.get("反切", ""),
+    }
+    
+    # 清理韵部编号（如 "30-月e" -> "月"）
+    yunbu = entry["上古韵部"]
+    if yunbu and '-' in yunbu:
+        yunbu = yunbu.split('-')[1]
+        # 移除末尾的字母标记（如 "歌a" -> "歌"）
+        yunbu = re.sub(r'[a-z]$', '', yunbu)
+        entry["上古韵部"] = yunbu
+    
+    return entry
+
+
+def _panwuyun_fields(section: str) -> Dict[str, str]:
+    """潘悟云一个读音的表格字段"""
+    fields = _th_td(section)
+    if not fields.get("上古音"):
+        # 部分词条的上古音不在表格中，而是以 <u>拟音</u> 给出
+        underlined = re.search(r'<u>(.*?)</u>', section, re.S)
+        if underlined:
+            fields["上古音"] = _text(underlined.group(1))
+    return fields
+
+
+def _panwuyun_readings(char: str, html_content: str) -> List[Dict[str, Any]]:
+    """潘悟云一条记录中的全部读音：正读在前，其后每个 <h4>異讀</h4> 一个读音"""
+    readings = []
+    yunbu = ""
+    for section in html_content.split('<h4>'):
+        fields = _panwuyun_fields(section)
+        # 上古韵部只在正读的表格中给出
+        yunbu = fields.get("上古韻部") or yunbu
+        if not fields.get("上古音") and not fields.get("聲母"):
+            continue
+        fields.setdefault("上古韻部", yunbu)
+        readings.append(_panwuyun_entry(char, fields))
+    return readings
+
+
+def _add_reading(result: Dict[str, Dict[str, Any]], entry: Dict[str, Any]) -> None:
+    """
+    把一个读音并入结果
+    
+    该字的第一个读音作为正读，字段直接放在条目上（与只收一读时的格式相同）；
+    其余不重复的读音依次放入条目的 "异读" 列表（不含 "字"）
+    """
+    char = entry["字"]
+    first = result.get(char)
+    if first is None:
+        result[char] = entry
+        return
+    reading = {k: v for k, v in entry.items() if k != "字"}
+    primary = {k: v for k, v in first.items() if k not in ("字", "异读")}
+    if reading != primary and reading not in first.get("异读", ()):
+        first.setdefault("异读", []).append(reading)
+
+
 def parse_panwuyun_txt(filepath: str) -> Dict[str, Dict[str, Any]]:
     """
     解析潘悟云《汉语古音手册》TXT文件
@@ -64,7 +143,7 @@ def parse_panwuyun_txt(filepath: str) -> Dict[str, Dict[str, Any]]:
         filepath: TXT文件路径
     
     Returns:
-        Dict[str, Dict]: { "崇": {"韵部": "东", "上古音": "*dzruŋ", ...}, ... }
+        Dict[str, Dict]: { "崇": {"韵部": "东", "上古音": "*dzruŋ", ..., "异读": [...]}, ... }
     """
     result = {}
     
@@ -91,37 +170,9 @@ def parse_panwuyun_txt(filepath: str) -> Dict[str, Dict[str, Any]]:
         if not char or len(char) > 2:
             continue
         
-        # 解析HTML
-        parser = PanwuyunHTMLParser()
-        try:
-            parser.feed(html_content)
-        except:
-            continue
-        
-        # 提取关键字段
-        entry = {
-            "字": char,
-            "上古韵部": parser.data.get("上古韻部", ""),
-            "上古音": parser.data.get("上古音", ""),
-            "声母": parser.data.get("聲母", ""),
-            "韵": parser.data.get("韻", ""),
-            "开合": parser.data.get("開合", ""),
-            "等": parser.data.get("等", ""),
-            "声调": parser.data.get("聲調", ""),
-            "反切": parser.data.get("反切", ""),
-        }
-        
-        # 清理韵部编号（如 "30-月e" -> "月"）
-        yunbu = entry["上古韵部"]
-        if yunbu and '-' in yunbu:
-            yunbu = yunbu.split('-')[1]
-            # 移除末尾的字母标记（如 "歌a" -> "歌"）
-            yunbu = re.sub(r'[a-z]$', '', yunbu)
-            entry["上古韵部"] = yunbu
-        
-        # 如果该字已存在，可能是异读，暂时用第一个
-        if char not in result:
-            result[char] = entry
+        # 解析HTML，正读与各异读都保留
+        for entry in _panwuyun_readings(char, html_content):
+            _add_reading(result, entry)
     
     return result
 
@@ -134,7 +185,7 @@ def parse_baxter_sagart_xlsx(filepath: str) -> Dict[str, Dict[str, Any]]:
         filepath: XLSX文件路径
     
     Returns:
-        Dict[str, Dict]: { "崇": {"OC": "*[d]roŋ", "MC": "...", ...}, ... }
+        Dict[str, Dict]: { "崇": {"OC": "*[d]roŋ", "MC": "...", ..., "异读": [...]}, ... }
     """
     try:
         import pandas as pd
@@ -169,15 +220,207 @@ def parse_baxter_sagart_xlsx(filepath: str) -> Dict[str, Dict[str, Any]]:
             if v == 'nan':
                 entry[k] = ''
         
-        if char not in result:
-            result[char] = entry
+        # 同一字的多行即多个读音
+        _add_reading(result, entry)
+    
+    return result
+
+
+# ===== MDX 词典源 =====
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TH_TD_RE = re.compile(r'<th>(.*?)</th>\s*<td>(.*?)</td>', re.S)
+_LI_RE = re.compile(r'<li>(.*?)</li>', re.S)
+_ROW_RE = re.compile(r'<tr>(.*?)</tr>', re.S)
+_CELL_RE = re.compile(r'<td (\w+)[^>]*>(.*?)</td>', re.S)
+
+
+def _text(fragment: str) -> str:
+    return html.unescape(_TAG_RE.sub('', fragment)).strip()
+
+
+def _th_td(html_content: str) -> Dict[str, str]:
+    """表头 -> 单元格文本（同名表头取第一个）"""
+    fields = {}
+    for th, td in _TH_TD_RE.findall(html_content):
+        fields.setdefault(_text(th), _text(td))
+    return fields
+
+
+def _parse_baxter_sagart_record(char: str, html_content: str) -> List[Dict[str, Any]]:
+    # <ul><li>拼音</li><li>中古音</li><li>(声 + 韵 调)</li><li>上古音</li><li>释义</li></ul>
+    items = [_text(li) for li in _LI_RE.findall(html_content)]
+    if len(items) < 5:
+        return []
+    return [{
+        "字": char,
+        "拼音": items[0],
+        "中古音": items[1],
+        "上古音": items[3],
+        "释义": items[4],
+        "GSR": "",
+    }]
+
+
+def _parse_wangli_record(char: str, html_content: str) -> List[Dict[str, Any]]:
+    # 每行一读：<td W>字</td><td py>..</td><td MC>..</td>...<td OC>..</td><td Gl>..</td>
+    readings = []
+    for row in _ROW_RE.findall(html_content):
+        cells = {name: _text(value) for name, value in _CELL_RE.findall(row)}
+        if not cells.get("OC") and not cells.get("MC"):
+            continue
+        readings.append({
+            "字": char,
+            "拼音": cells.get("py", ""),
+            "中古音": cells.get("MC", ""),
+            "上古音": cells.get("OC", ""),
+            "释义": cells.get("Gl", ""),
+            "GSR": "",
+        })
+    return readings
+
+
+def _parse_starostin_record(char: str, html_content: str) -> List[Dict[str, Any]]:
+    fields = _th_td(html_content)
+    if not fields.get("Classic Old Chinese") and not fields.get("Middle Chinese"):
+        return []
+    return [{
+        "字": char,
+        "拼音": fields.get("Modern (Beijing) reading", ""),
+        "前上古音": fields.get("Preclassic Old Chinese", ""),
+        "上古音": fields.get("Classic Old Chinese", ""),
+        "中古音": fields.get("Middle Chinese", ""),
+        "释义": fields.get("English meaning", ""),
+    }]
+
+
+def _parse_zhongyuan_record(char: str, html_content: str) -> List[Dict[str, Any]]:
+    fields = _th_td(html_content)
+    if not fields.get("聲母") and not fields.get("韻母"):
+        return []
+    return [{
+        "字": char,
+        "小韵": fields.get("小韻", ""),
+        "声母": fields.get("聲母", ""),
+        "韵部": fields.get("韻母", ""),
+        "声调": fields.get("聲調", ""),
+        "杨耐思": fields.get("楊耐思", ""),
+        "宁继福": fields.get("寧繼福", ""),
+        "拟音": fields.get("unt(音值)", ""),
+    }]
+
+
+# 数据源名 -> (默认路径（相对项目根目录）, 记录解析函数)
+MDX_SOURCES: Dict[str, tuple] = {
+    "潘悟云": (
+        "音韵数据/上古音/潘悟云《汉语古音手册》/汉语古音手册/汉语古音手册.mdx",
+        _panwuyun_readings,
+    ),
+    "白一平沙加尔": (
+        "音韵数据/上古音/白一平-沙加尔的汉语拟音体系/白一平-沙加尔汉语拟音.mdx",
+        _parse_baxter_sagart_record,
+    ),
+    "王力": (
+        "王力古漢語字典 (2000)/王力字典 上古擬音 (Baxter-Sagart).mdx",
+        _parse_wangli_record,
+    ),
+    "斯塔罗斯金": (
+        "音韵数据/上古音/斯塔罗斯金汉语拟音/Chinese-characters/Chinese-characters.mdx",
+        _parse_starostin_record,
+    ),
+    "中原音韵": (
+        "音韵数据/近代音/中原音韵（unt校正，附四家拟音推导）/中原音韵（unt校正，附四家拟音推导）.mdx",
+        _parse_zhongyuan_record,
+    ),
+}
+
+
+def _mdx_path(source: str, root: Path = None) -> Path:
+    root = root or Path(__file__).parent.parent.parent
+    return root / MDX_SOURCES[source][0]
+
+
+def parse_mdx_source(
+    filepath: str,
+    record_parser: Callable[[str, str], List[Dict[str, Any]]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    流式解析一部音韵MDX词典
+    
+    逐个记录块解压（同一时刻只持有一块），跳过 @@@LINK 跳转与多字词条。
+    同一字的多条记录、一条记录中的多个读音都保留（见 _add_reading）。
     
+    Args:
+        filepath: MDX文件路径
+        record_parser: (字, 记录HTML) -> 该记录中的读音列表
+    
+    Returns:
+        Dict[str, Dict]: { "崇": {..., "异读": [...]}, ... }
+    """
+    result = {}
+    with MDXReader(filepath) as mdx:
+        for char, html_content in mdx.items():
+            char = char.strip()
+            if not char or len(char) > 2 or html_content.startswith("@@@LINK="):
+                continue
+            for entry in record_parser(char, html_content):
+                _add_reading(result, entry)
     return result
 
 
+def parse_panwuyun_mdx(filepath: str) -> Dict[str, Dict[str, Any]]:
+    """解析潘悟云《汉语古音手册》MDX（字段同 parse_panwuyun_txt）"""
+    return parse_mdx_source(filepath, _panwuyun_readings)
+
+
+def parse_baxter_sagart_mdx(filepath: str) -> Dict[str, Dict[str, Any]]:
+    """解析白一平-沙加尔汉语拟音MDX（字段同 parse_baxter_sagart_xlsx，GSR为空）"""
+    return parse_mdx_source(filepath, _parse_baxter_sagart_record)
+
+
+def parse_wangli_mdx(filepath: str) -> Dict[str, Dict[str, Any]]:
+    """解析《王力古汉语字典》所附白一平-沙加尔上古拟音MDX（字段同 parse_baxter_sagart_xlsx）"""
+    return parse_mdx_source(filepath, _parse_wangli_record)
+
+
+def parse_starostin_mdx(filepath: str) -> Dict[str, Dict[str, Any]]:
+    """
+    解析斯塔罗斯金 Chinese-characters MDX
+    
+    Returns:
+        Dict[str, Dict]: { "崇": {"上古音": "ʒ(h)ruŋ", "中古音": "...", "释义": "...", ...}, ... }
+    """
+    return parse_mdx_source(filepath, _parse_starostin_record)
+
+
+def parse_zhongyuan_mdx(filepath: str) -> Dict[str, Dict[str, Any]]:
+    """
+    解析《中原音韵》（unt校正，附四家拟音推导）MDX
+    
+    Returns:
+        Dict[str, Dict]: { "行": {"声母": "曉", "韵部": "庚青齊", "声调": "陽", "拟音": "xiŋ", ...}, ... }
+    """
+    return parse_mdx_source(filepath, _parse_zhongyuan_record)
+
+
+def _project_readings(entry: Dict[str, Any], project: Callable[[Dict], Dict]) -> Dict[str, Any]:
+    """按 project 取正读的字段；异读同样提取，去掉与正读或彼此重复的，放入 "异读" """
+    primary = project(entry)
+    extra = []
+    for reading in entry.get("异读", ()):
+        fields = project(reading)
+        if fields != primary and fields not in extra:
+            extra.append(fields)
+    if extra:
+        primary["异读"] = extra
+    return primary
+
+
 def unify_phonology_data(
     panwuyun_data: Dict[str, Dict],
-    baxter_data: Dict[str, Dict]
+    baxter_data: Dict[str, Dict],
+    starostin_data: Optional[Dict[str, Dict]] = None,
+    zhongyuan_data: Optional[Dict[str, Dict]] = None
 ) -> Dict[str, Dict[str, Any]]:
     """
     整合多源音韵数据为统一格式
@@ -185,43 +428,131 @@ def unify_phonology_data(
     Args:
         panwuyun_data: 潘悟云数据
         baxter_data: 白一平-沙加尔数据
+        starostin_data: 斯塔罗斯金数据（可选）
+        zhongyuan_data: 中原音韵数据（可选）
     
     Returns:
-        统一格式的音韵数据
+        统一格式的音韵数据；某源有多个读音时，该源子字典带 "异读" 列表（字段相同）
     """
     result = {}
+    starostin_data = starostin_data or {}
+    zhongyuan_data = zhongyuan_data or {}
     
     # 获取所有字符
-    all_chars = set(panwuyun_data.keys()) | set(baxter_data.keys())
+    all_chars = (set(panwuyun_data.keys()) | set(baxter_data.keys())
+                 | set(starostin_data.keys()) | set(zhongyuan_data.keys()))
     
     for char in all_chars:
         entry = {"字": char}
         
         # 添加潘悟云数据
         if char in panwuyun_data:
-            pan = panwuyun_data[char]
-            entry["潘悟云"] = {
+            entry["潘悟云"] = _project_readings(panwuyun_data[char], lambda pan: {
                 "韵部": pan.get("上古韵部", ""),
                 "上古音": pan.get("上古音", ""),
                 "声母": pan.get("声母", ""),
                 "韵": pan.get("韵", ""),
                 "声调": pan.get("声调", ""),
-            }
+            })
         
         # 添加白一平-沙加尔数据
         if char in baxter_data:
-            bax = baxter_data[char]
-            entry["白一平沙加尔"] = {
+            entry["白一平沙加尔"] = _project_readings(baxter_data[char], lambda bax: {
                 "上古音": bax.get("上古音", ""),
                 "中古音": bax.get("中古音", ""),
                 "释义": bax.get("释义", ""),
-            }
+                "GSR": bax.get("GSR", ""),
+            })
+        
+        # 添加斯塔罗斯金数据
+        if char in starostin_data:
+            entry["斯塔罗斯金"] = _project_readings(starostin_data[char], lambda sta: {
+                "上古音": sta.get("上古音", ""),
+                "中古音": sta.get("中古音", ""),
+                "释义": sta.get("释义", ""),
+            })
+        
+        # 添加中原音韵数据
+        if char in zhongyuan_data:
+            entry["中原音韵"] = _project_readings(zhongyuan_data[char], lambda zy: {
+                "声母": zy.get("声母", ""),
+                "韵部": zy.get("韵部", ""),
+                "声调": zy.get("声调", ""),
+                "拟音": zy.get("拟音", ""),
+            })
         
         result[char] = entry
     
     return result
 
 
+class MDXPhonologySources:
+    """
+    按字查询MDX音韵词典（惰性）
+    
+    打开词典只读文件头与键索引；查询时只解压该字所在的记录块，
+    适合只查少量字、不想先生成整张统一表的场景。结果格式同 unify_phonology_data 的单字条目。
+    
+    使用方法：
+        with MDXPhonologySources() as sources:
+            sources.query("崇")  # -> {"字": "崇", "潘悟云": {...}, "白一平沙加尔": {...}, ...}
+    """
+    
+    def __init__(self, paths: Optional[Dict[str, str]] = None, cache_blocks: int = 4):
+        """
+        Args:
+            paths: 数据源名 -> MDX路径，覆盖 MDX_SOURCES 中的默认路径
+            cache_blocks: 每部词典缓存的记录块数
+        """
+        self.paths = {name: Path(paths[name]) if paths and name in paths else _mdx_path(name)
+                      for name in MDX_SOURCES}
+        self.cache_blocks = cache_blocks
+        self._readers: Dict[str, Optional[MDXReader]] = {}
+    
+    def __enter__(self) -> "MDXPhonologySources":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def _reader(self, source: str) -> Optional[MDXReader]:
+        if source not in self._readers:
+            path = self.paths[source]
+            self._readers[source] = MDXReader(path, self.cache_blocks) if path.exists() else None
+        return self._readers[source]
+    
+    def lookup(self, char: str, source: str) -> Optional[Dict[str, Any]]:
+        """查询单个数据源，返回该源解析后的字段（含全部读音，格式同 parse_mdx_source 的单字条目）"""
+        reader = self._reader(source)
+        if reader is None:
+            return None
+        record_parser = MDX_SOURCES[source][1]
+        result = {}
+        for html_content in reader.lookup(char):
+            for entry in record_parser(char, html_content):
+                _add_reading(result, entry)
+        return result.get(char)
+    
+    def query(self, char: str) -> Optional[Dict[str, Any]]:
+        """查询全部数据源并整合为统一格式；各源均未收录时返回 None"""
+        found = {name: self.lookup(char, name) for name in MDX_SOURCES}
+        baxter = found["白一平沙加尔"] or found["王力"]
+        unified = unify_phonology_data(
+            {char: found["潘悟云"]} if found["潘悟云"] else {},
+            {char: baxter} if baxter else {},
+            {char: found["斯塔罗斯金"]} if found["斯塔罗斯金"] else {},
+            {char: found["中原音韵"]} if found["中原音韵"] else {},
+        )
+        return unified.get(char)
+    
+    def close(self) -> None:
+        """关闭已打开的词典"""
+        for reader in self._readers.values():
+            if reader is not None:
+                reader.close()
+        self._readers.clear()
+
+
 def compare_phonology(
     char_a: str,
     char_b: str,
@@ -230,6 +561,9 @@ def compare_phonology(
     """
     比较两个字的音韵关系
     
+    多音字的各个读音两两比较，详情中给出得分最高的一对读音及其得分；
+    各数据源另给出最相近一对拟音的特征编辑距离相似度，达到阈值即 "拟音相近"。
+    
     Args:
         char_a: 第一个字
         char_b: 第二个字
@@ -246,6 +580,7 @@ def compare_phonology(
         "音近": False,
         "韵部相同": False,
         "声母相近": False,
+        "拟音相近": False,
         "详情": {}
     }
     
@@ -253,96 +588,130 @@ def compare_phonology(
         result["详情"]["error"] = "缺少音韵数据"
         return result
     
-    data_a = data[char_a]
-    data_b = data[char_b]
-    
-    # 比较潘悟云数据
-    if "潘悟云" in data_a and "潘悟云" in data_b:
-        pan_a = data_a["潘悟云"]
-        pan_b = data_b["潘悟云"]
-        
-        yunbu_a = pan_a.get("韵部", "")
-        yunbu_b = pan_b.get("韵部", "")
-        
-        shengmu_a = pan_a.get("声母", "")
-        shengmu_b = pan_b.get("声母", "")
+    # 潘悟云数据：两字全部读音两两比较，取得分最高的一对
+    store = PhonologyStore.from_unified({char_a: data[char_a], char_b: data[char_b]})
+    match = store.best_pair(char_a, char_b, source="潘悟云")
+    if match:
+        pan_a, pan_b = match.a, match.b
         
         result["详情"]["潘悟云"] = {
-            "韵部_A": yunbu_a,
-            "韵部_B": yunbu_b,
-            "声母_A": shengmu_a,
-            "声母_B": shengmu_b,
-            "上古音_A": pan_a.get("上古音", ""),
-            "上古音_B": pan_b.get("上古音", ""),
+            "韵部_A": pan_a.yunbu,
+            "韵部_B": pan_b.yunbu,
+            "声母_A": pan_a.shengmu,
+            "声母_B": pan_b.shengmu,
+            "上古音_A": pan_a.recon,
+            "上古音_B": pan_b.recon,
+            "得分": round(match.score, 3),
         }
         
         # 判断韵部是否相同
-        if yunbu_a and yunbu_b and yunbu_a == yunbu_b:
+        if pan_a.yunbu and pan_a.yunbu == pan_b.yunbu:
             result["韵部相同"] = True
         
-        # 判断声母是否相近（简化判断：相同则相近）
-        if shengmu_a and shengmu_b:
-            # 声母相近规则（可扩展）
-            similar_shengmu = [
-                {"端", "透", "定", "泥"},  # 舌头音
-                {"知", "彻", "澄", "娘"},  # 舌上音
-                {"精", "清", "从", "心", "邪"},  # 齿头音
-                {"庄", "初", "崇", "山"},  # 正齿音
-                {"章", "昌", "常", "书", "船"},  # 正齿音
-                {"见", "溪", "群", "疑"},  # 牙音
-                {"帮", "滂", "並", "明"},  # 唇音
-                {"非", "敷", "奉", "微"},  # 轻唇音
-                {"影", "晓", "匣", "喻", "云"},  # 喉音
-                {"来", "日"},  # 半舌半齿
-            ]
-            
-            for group in similar_shengmu:
-                if shengmu_a in group and shengmu_b in group:
-                    result["声母相近"] = True
-                    break
-            
-            if shengmu_a == shengmu_b:
+        # 判断声母是否相近（相同或同组）
+        if pan_a.shengmu and pan_b.shengmu:
+            if pan_a.shengmu == pan_b.shengmu or any(
+                    pan_a.shengmu in group and pan_b.shengmu in group for group in SHENGMU_GROUPS):
                 result["声母相近"] = True
     
+    # 各数据源拟音的特征编辑距离相似度（取两字最相近的一对拟音）
+    for source in ("潘悟云", "白一平沙加尔"):
+        best = None
+        for a in store.readings(char_a, source):
+            for b in store.readings(char_b, source):
+                if a.recon and b.recon:
+                    similarity = recon_similarity(a.recon, b.recon)
+                    if best is None or similarity > best[0]:
+                        best = (similarity, a.recon, b.recon)
+        if best:
+            detail = result["详情"].setdefault(source, {})
+            detail.setdefault("上古音_A", best[1])
+            detail.setdefault("上古音_B", best[2])
+            detail["拟音相似度"] = round(best[0], 3)
+            if best[0] >= RECON_SIMILARITY_THRESHOLD:
+                result["拟音相近"] = True
+    
     # 综合判断是否音近
-    if result["韵部相同"] or result["声母相近"]:
+    if result["韵部相同"] or result["声母相近"] or result["拟音相近"]:
         result["音近"] = True
     
     return result
 
 
-def save_phonology_data(data: Dict, output_path: str) -> None:
-    """保存音韵数据到JSON文件"""
+def save_phonology_data(data: Dict, output_path: str, as_json: bool = False,
+                        char_tables: Optional[tuple] = None) -> None:
+    """
+    保存音韵数据
+    
+    默认写紧凑二进制格式（PhonologyStore，可 mmap 直接读取）；
+    as_json=True 时写缩进JSON，便于人工查看与调试。
+    char_tables 为繁简单字对照表 (s2t, t2s)，只写入二进制格式。
+    """
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if as_json:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    else:
+        store = PhonologyStore.from_unified(data)
+        if char_tables:
+            store.set_char_tables(*char_tables)
+        store.save(path)
     
     print(f"音韵数据已保存到: {path}")
     print(f"共 {len(data)} 个字")
 
 
 def load_phonology_data(filepath: str) -> Dict:
-    """从JSON文件加载音韵数据"""
+    """加载音韵数据（二进制或JSON，按文件头自动识别），返回统一格式的字典"""
+    if is_phonology_store(filepath):
+        with PhonologyStore.open(filepath) as store:
+            return store.to_unified()
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def export_phonology_json(store_path: str = None, output_path: str = None) -> Dict:
+    """
+    从二进制音韵存储导出统一格式的缩进JSON（旧版 phonology_unified.json，供人工查看或旧脚本使用）
+    
+    Args:
+        store_path: 二进制存储路径，默认 data/processed/phonology.bin
+        output_path: JSON输出路径，默认 data/processed/phonology_unified.json
+    """
+    project_root = Path(__file__).parent.parent.parent
+    if store_path is None:
+        store_path = project_root / "data/processed/phonology.bin"
+    if output_path is None:
+        output_path = project_root / "data/processed/phonology_unified.json"
+    
+    data = load_phonology_data(str(store_path))
+    save_phonology_data(data, str(output_path), as_json=True)
+    return data
+
+
 # ===== 主函数 =====
 
 def build_phonology_index(
     panwuyun_path: str = None,
     baxter_path: str = None,
-    output_path: str = None
+    output_path: str = None,
+    mdx_paths: Optional[Dict[str, str]] = None,
+    as_json: bool = False
 ) -> Dict[str, Dict]:
     """
     构建完整的音韵索引
     
+    潘悟云优先读TXT，缺失时读MDX；白一平-沙加尔以XLSX为主，
+    MDX与王力字典所附拟音只补XLSX未收的字。
+    
     Args:
         panwuyun_path: 潘悟云数据路径
         baxter_path: 白一平-沙加尔数据路径
         output_path: 输出路径
+        mdx_paths: 数据源名 -> MDX路径，覆盖 MDX_SOURCES 中的默认路径
+        as_json: 输出缩进JSON（调试用）而非二进制存储
     
     Returns:
         统一的音韵数据
@@ -357,37 +726,72 @@ def build_phonology_index(
         baxter_path = project_root / "音韵数据/上古音/白一平-沙加尔的汉语拟音体系/BaxterSagartOC2015-10-13.xlsx"
     
     if output_path is None:
-        output_path = project_root / "data/processed/phonology_unified.json"
+        output_path = project_root / ("data/processed/phonology_unified.json" if as_json
+                                      else "data/processed/phonology.bin")
+    
+    mdx = {name: Path(mdx_paths[name]) if mdx_paths and name in mdx_paths else _mdx_path(name, project_root)
+           for name in MDX_SOURCES}
+    
+    def parse_mdx(name: str, parser: Callable[[str], Dict[str, Dict]]) -> Dict[str, Dict]:
+        if not mdx[name].exists():
+            print(f"  → 文件不存在，跳过: {mdx[name]}")
+            return {}
+        data = parser(str(mdx[name]))
+        print(f"  → {mdx[name].name}: 解析了 {len(data)} 个字")
+        return data
     
     print("=" * 50)
     print("构建音韵数据索引")
     print("=" * 50)
     
     # 解析潘悟云数据
-    print(f"\n[1/3] 解析潘悟云数据: {panwuyun_path}")
+    print(f"\n[1/6] 解析潘悟云数据: {panwuyun_path}")
     panwuyun_data = {}
     if Path(panwuyun_path).exists():
         panwuyun_data = parse_panwuyun_txt(str(panwuyun_path))
         print(f"  → 解析了 {len(panwuyun_data)} 个字")
     else:
-        print(f"  → 文件不存在，跳过")
+        print(f"  → 文件不存在，改读MDX")
+        panwuyun_data = parse_mdx("潘悟云", parse_panwuyun_mdx)
     
     # 解析白一平-沙加尔数据
-    print(f"\n[2/3] 解析白一平-沙加尔数据: {baxter_path}")
+    print(f"\n[2/6] 解析白一平-沙加尔数据: {baxter_path}")
     baxter_data = {}
     if Path(baxter_path).exists():
         baxter_data = parse_baxter_sagart_xlsx(str(baxter_path))
         print(f"  → 解析了 {len(baxter_data)} 个字")
     else:
         print(f"  → 文件不存在，跳过")
+    for name, parser in (("白一平沙加尔", parse_baxter_sagart_mdx), ("王力", parse_wangli_mdx)):
+        added = 0
+        for char, entry in parse_mdx(name, parser).items():
+            if char not in baxter_data:
+                baxter_data[char] = entry
+                added += 1
+        print(f"  → 补充了 {added} 个字")
+    
+    # 解析斯塔罗斯金数据
+    print(f"\n[3/6] 解析斯塔罗斯金数据")
+    starostin_data = parse_mdx("斯塔罗斯金", parse_starostin_mdx)
+    
+    # 解析中原音韵数据
+    print(f"\n[4/6] 解析中原音韵数据")
+    zhongyuan_data = parse_mdx("中原音韵", parse_zhongyuan_mdx)
     
     # 整合数据
-    print(f"\n[3/3] 整合数据...")
-    unified_data = unify_phonology_data(panwuyun_data, baxter_data)
+    print(f"\n[5/6] 整合数据...")
+    unified_data = unify_phonology_data(panwuyun_data, baxter_data, starostin_data, zhongyuan_data)
     print(f"  → 整合了 {len(unified_data)} 个字")
     
+    # 繁简单字对照表（运行时查表转换，不再逐次调用OpenCC）
+    char_tables = None
+    if not as_json:
+        print(f"\n[6/6] 生成繁简对照表...")
+        char_tables = load_opencc_tables(unified_data)
+        print(f"  → 简转繁 {len(char_tables[0])} 字, 繁转简 {len(char_tables[1])} 字")
+    
     # 保存
-    save_phonology_data(unified_data, str(output_path))
+    save_phonology_data(unified_data, str(output_path), as_json=as_json, char_tables=char_tables)
     
     return unified_data
 
@@ -0,0 +1,502 @@
+"""
+音韵数据的紧凑存储（一读一行的并列数组）
+
+负责人：成员E（数据工程）
+
+统一音韵数据是 字 -> 数据源 -> 字段 的嵌套字典，异读再嵌一层列表。
+PhonologyStore 把全部读音摊平为一读一行：
+    字表（排序）+ 每字读音区间的偏移数组
+    每个读音：数据源、声母、韵部、声调（类别表中的小整数编码）、拟音、中古音（字符串表下标）
+重复的声母、韵部、拟音字符串各只存一份，每个读音只占几个整数。
+
+best_pair(字A, 字B) 在同一数据源内枚举两字读音的全部组合，返回得分最高的一对，
+多音字不会因为只比较第一个读音而漏判。
+
+谐声索引：白一平-沙加尔读音的 GSR 编号（如 "1172d'"）前四位为高本汉《修订汉文典》的声系号。
+构建时按声系号排好 声系 -> 成员字 的区间表，与读音数组一起存入文件：
+same_series(字A, 字B) 只看两字各自的几个读音，series_mates(字) 直接切出同声系的字。
+
+繁简对照：构建时把 OpenCC 的单字对照表（char_convert.load_opencc_tables）一并写入，
+每条为 "原字 + 全部候选" 的字符串，按原字排序；char_tables() 读回，供 char_convert.CharConverter 查表转换。
+
+save() 把各数组原样写入二进制文件，open() 以 mmap 映射后直接在映射上读取（不解析、不复制），
+多个进程打开同一文件时共享页缓存：
+    [头: 魔数 + 段数] [段表: 每段 (偏移, 字节数)] [各段，8字节对齐]
+
+使用方法：
+    PhonologyStore.from_unified(unified_data).save("data/processed/phonology.bin")
+    store = PhonologyStore.open("data/processed/phonology.bin")
+    match = store.best_pair("行", "航", source="潘悟云")
+    match.a, match.b, match.score
+"""
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .phonemes import recon_similarity
+
+
+STORE_MAGIC = b"PHONSTO1"
+_HEADER = struct.Struct("<8sI")  # 魔数, 段数
+_SECTION = struct.Struct("<QQ")  # 段偏移, 段字节数
+# 段名 -> 元素类型（array/memoryview 类型码）
+_SECTIONS = {
+    "chars": "I", "char_blob": "B", "offsets": "I",
+    "source": "B", "shengmu": "H", "yunbu": "H", "shengdiao": "H", "yun": "H",
+    "recon": "I", "mc": "I", "gloss": "I",
+    "gsr": "I", "series": "H", "series_offsets": "I", "series_chars": "I",
+    "categories": "I", "category_blob": "B", "texts": "I", "text_blob": "B",
+    "s2t": "I", "s2t_blob": "B", "t2s": "I", "t2s_blob": "B",
+}
+_CONVERT_DIRECTIONS = ("s2t", "t2s")
+
+# 数据源字段 -> 读音字段；顺序即 to_unified() 输出的字段顺序
+SOURCE_FIELDS: Dict[str, Dict[str, str]] = {
+    "潘悟云": {"yunbu": "韵部", "recon": "上古音", "shengmu": "声母", "yun": "韵", "shengdiao": "声调"},
+    "白一平沙加尔": {"recon": "上古音", "mc": "中古音", "gloss": "释义", "gsr": "GSR"},
+    "斯塔罗斯金": {"recon": "上古音", "mc": "中古音", "gloss": "释义"},
+    "中原音韵": {"shengmu": "声母", "yunbu": "韵部", "shengdiao": "声调", "recon": "拟音"},
+}
+_CATEGORY_FIELDS = ("shengmu", "yunbu", "shengdiao", "yun")
+_TEXT_FIELDS = ("recon", "mc", "gloss", "gsr")
+SOURCES = tuple(SOURCE_FIELDS)
+
+# 声母相近分组（中古声纽；数据中为繁体，简体写法一并列出）
+SHENGMU_GROUPS = [
+    {"端", "透", "定", "泥"},  # 舌头音
+    {"知", "徹", "彻", "澄", "娘"},  # 舌上音
+    {"精", "清", "從", "从", "心", "邪"},  # 齿头音
+    {"莊", "庄", "初", "崇", "生", "山", "俟"},  # 正齿音（庄组）
+    {"章", "昌", "常", "禪", "禅", "書", "书", "船"},  # 正齿音（章组）
+    {"見", "见", "溪", "群", "疑"},  # 牙音
+    {"幫", "帮", "滂", "並", "明"},  # 唇音
+    {"非", "敷", "奉", "微"},  # 轻唇音
+    {"影", "曉", "晓", "匣", "喻", "云", "雲", "以"},  # 喉音
+    {"來", "来", "日"},  # 半舌半齿
+]
+
+# 得分中各项的权重；两读中都缺的项不计入分母
+WEIGHT_YUNBU = 0.5
+WEIGHT_SHENGMU = 0.3
+WEIGHT_RECON = 0.2
+
+
+class Reading(NamedTuple):
+    """一个读音（缺的字段为空串）"""
+    source: str
+    shengmu: str = ""
+    yunbu: str = ""
+    shengdiao: str = ""
+    recon: str = ""  # 拟音（中原音韵为近代音拟音，其余为上古音）
+    mc: str = ""  # 中古音
+    yun: str = ""  # 中古韵（潘悟云）
+    gloss: str = ""  # 释义
+    gsr: str = ""  # 《修订汉文典》编号（白一平-沙加尔）
+
+
+class PairMatch(NamedTuple):
+    """两字得分最高的一对读音"""
+    a: Reading
+    b: Reading
+    score: float
+
+
+def gsr_series(gsr: str) -> int:
+    """GSR 编号的声系号（"1172d'" -> 1172）；无编号（"" / "--"）为 0"""
+    head = gsr[:4]
+    return int(head) if head.isdigit() else 0
+
+
+def is_phonology_store(path) -> bool:
+    """判断文件是否为二进制音韵存储"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(STORE_MAGIC)) == STORE_MAGIC
+    except OSError:
+        return False
+
+
+def _pack_strings(strings) -> tuple:
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in strings:
+        blob += value.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+class _StringTable:
+    """映射中的字符串表：(n+1) 个 uint32 偏移 + UTF-8 数据，按下标解码"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class PhonologyStore:
+    """
+    一读一行的音韵存储
+
+    类别字段（声母、韵部、声调、中古韵）存为 uint16 编码，拟音、中古音、释义存为字符串表下标（uint32）；
+    编码 0 与下标 0 都表示空。open() 得到的实例只读。
+    """
+
+    def __init__(self):
+        self._chars = []
+        self._offsets = array('I', [0])
+        self._categories: List[str] = [""]
+        self._category_ids: Dict[str, int] = {"": 0}
+        self._texts = [""]
+        self._text_ids: Dict[str, int] = {"": 0}
+        self._source = array('B')
+        for name in _CATEGORY_FIELDS:
+            setattr(self, "_" + name, array('H'))
+        for name in _TEXT_FIELDS:
+            setattr(self, "_" + name, array('I'))
+        self._series = array('H')
+        self._series_offsets = array('I', [0])
+        self._series_chars = array('I')
+        self._convert: Dict[str, Any] = {direction: {} for direction in _CONVERT_DIRECTIONS}
+        self._groups: Optional[List[int]] = None
+        self._mm = None
+        self._views: List[memoryview] = []
+
+    def __enter__(self) -> "PhonologyStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """收录字数"""
+        return len(self._chars)
+
+    def __contains__(self, char: str) -> bool:
+        return self._char_id(char) is not None
+
+    @property
+    def reading_count(self) -> int:
+        """读音总数"""
+        return len(self._source)
+
+    # ----- 构建 -----
+
+    def _category(self, value: str) -> int:
+        code = self._category_ids.get(value)
+        if code is None:
+            code = self._category_ids[value] = len(self._categories)
+            self._categories.append(value)
+        return code
+
+    def _text(self, value: str) -> int:
+        index = self._text_ids.get(value)
+        if index is None:
+            index = self._text_ids[value] = len(self._texts)
+            self._texts.append(value)
+        return index
+
+    def _append(self, source: int, fields: Dict[str, str]) -> None:
+        self._source.append(source)
+        for name in _CATEGORY_FIELDS:
+            getattr(self, "_" + name).append(self._category(fields.get(name, "")))
+        for name in _TEXT_FIELDS:
+            getattr(self, "_" + name).append(self._text(fields.get(name, "")))
+        self._series.append(gsr_series(fields.get("gsr", "")))
+
+    def _build_series_index(self) -> None:
+        """声系号 -> 成员字（字表下标，升序）的区间表：声系 s 的成员为 series_chars[offsets[s]:offsets[s+1]]"""
+        members: Dict[int, set] = {}
+        for cid in range(len(self._chars)):
+            for i in range(self._offsets[cid], self._offsets[cid + 1]):
+                if self._series[i]:
+                    members.setdefault(self._series[i], set()).add(cid)
+        size = max(members, default=0) + 1
+        self._series_offsets = array('I', [0])
+        self._series_chars = array('I')
+        for series in range(size):
+            self._series_chars.extend(sorted(members.get(series, ())))
+            self._series_offsets.append(len(self._series_chars))
+
+    @classmethod
+    def from_unified(cls, data: Dict[str, Dict[str, Any]]) -> "PhonologyStore":
+        """从统一格式的音韵数据（unify_phonology_data 的结果）构建，正读在前、异读在后"""
+        store = cls()
+        for char in sorted(data):
+            entry = data[char]
+            for code, source in enumerate(SOURCES):
+                sub = entry.get(source)
+                if not sub:
+                    continue
+                mapping = SOURCE_FIELDS[source]
+                for reading in [sub] + list(sub.get("异读", ())):
+                    fields = {name: str(reading.get(key) or "") for name, key in mapping.items()}
+                    store._append(code, fields)
+            if len(store._source) > store._offsets[-1]:
+                store._chars.append(char)
+                store._offsets.append(len(store._source))
+        store._build_series_index()
+        return store
+
+    def to_unified(self) -> Dict[str, Dict[str, Any]]:
+        """还原为统一格式的嵌套字典（from_unified 的逆操作，用于导出JSON与兼容旧接口）"""
+        result = {}
+        for cid, char in enumerate(self._chars):
+            entry = {"字": char}
+            for i in range(self._offsets[cid], self._offsets[cid + 1]):
+                reading = self._reading(i)
+                fields = {key: getattr(reading, name) for name, key in SOURCE_FIELDS[reading.source].items()}
+                sub = entry.get(reading.source)
+                if sub is None:
+                    entry[reading.source] = fields
+                else:
+                    sub.setdefault("异读", []).append(fields)
+            result[char] = entry
+        return result
+
+    def set_char_tables(self, s2t: Dict[str, List[str]], t2s: Dict[str, List[str]]) -> None:
+        """设置繁简单字对照表（字 -> 候选列表，默认转换在前），随 save() 写入"""
+        self._convert = {"s2t": dict(s2t), "t2s": dict(t2s)}
+
+    # ----- 二进制文件 -----
+
+    def save(self, path) -> None:
+        """写入二进制文件（先写临时文件再替换）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        chars, char_blob = _pack_strings(self._chars)
+        categories, category_blob = _pack_strings(self._categories)
+        texts, text_blob = _pack_strings(self._texts)
+        sections = {
+            "chars": chars, "char_blob": char_blob, "offsets": self._offsets,
+            "categories": categories, "category_blob": category_blob, "texts": texts, "text_blob": text_blob,
+        }
+        for direction, table in zip(_CONVERT_DIRECTIONS, self.char_tables()):
+            entries = (key + "".join(table[key]) for key in sorted(table))
+            sections[direction], sections[direction + "_blob"] = _pack_strings(entries)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(STORE_MAGIC, len(_SECTIONS)) + b"\0" * (_SECTION.size * len(_SECTIONS)))
+            table = []
+            for name in _SECTIONS:
+                data = sections.get(name)
+                if data is None:
+                    data = getattr(self, "_" + name)
+                data = bytes(data)
+                f.write(b"\0" * (-f.tell() % 8))
+                table.append(_SECTION.pack(f.tell(), len(data)))
+                f.write(data)
+            f.seek(_HEADER.size)
+            f.write(b"".join(table))
+        tmp_path.replace(path)
+
+    @classmethod
+    def open(cls, path) -> "PhonologyStore":
+        """以 mmap 打开二进制文件；各数组直接是映射上的视图"""
+        store = cls()
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_sections = _HEADER.unpack_from(mm, 0)
+        if magic != STORE_MAGIC or n_sections != len(_SECTIONS):
+            mm.close()
+            raise ValueError(f"不是音韵存储文件（或版本不符）: {path}")
+
+        base = memoryview(mm)
+        views = {}
+        for k, (name, typecode) in enumerate(_SECTIONS.items()):
+            offset, length = _SECTION.unpack_from(mm, _HEADER.size + k * _SECTION.size)
+            views[name] = base[offset:offset + length].cast(typecode)
+        store._mm = mm
+        store._views = [base] + list(views.values())
+
+        store._chars = _StringTable(views["chars"], views["char_blob"])
+        store._offsets = views["offsets"]
+        store._source = views["source"]
+        store._series = views["series"]
+        store._series_offsets = views["series_offsets"]
+        store._series_chars = views["series_chars"]
+        for name in _CATEGORY_FIELDS + _TEXT_FIELDS:
+            setattr(store, "_" + name, views[name])
+        # 类别表很小，解码成列表；字符串表按需解码
+        store._categories = list(_StringTable(views["categories"], views["category_blob"]))
+        store._category_ids = {value: code for code, value in enumerate(store._categories)}
+        store._texts = _StringTable(views["texts"], views["text_blob"])
+        store._text_ids = {}
+        store._convert = {direction: _StringTable(views[direction], views[direction + "_blob"])
+                          for direction in _CONVERT_DIRECTIONS}
+        return store
+
+    def close(self) -> None:
+        """释放映射（仅 open() 得到的实例需要）"""
+        if self._mm is None:
+            return
+        self._chars = self._texts = None
+        self._convert = {direction: {} for direction in _CONVERT_DIRECTIONS}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mm.close()
+        self._mm = None
+
+    # ----- 查询 -----
+
+    def _char_id(self, char: str) -> Optional[int]:
+        i = bisect_left(self._chars, char)
+        return i if i < len(self._chars) and self._chars[i] == char else None
+
+    def _reading(self, i: int) -> Reading:
+        categories = self._categories
+        return Reading(
+            source=SOURCES[self._source[i]],
+            shengmu=categories[self._shengmu[i]],
+            yunbu=categories[self._yunbu[i]],
+            shengdiao=categories[self._shengdiao[i]],
+            recon=self._texts[self._recon[i]],
+            mc=self._texts[self._mc[i]],
+            yun=categories[self._yun[i]],
+            gloss=self._texts[self._gloss[i]],
+            gsr=self._texts[self._gsr[i]],
+        )
+
+    def _span(self, char: str, source: Optional[str] = None) -> List[int]:
+        cid = self._char_id(char)
+        if cid is None:
+            return []
+        rows = range(self._offsets[cid], self._offsets[cid + 1])
+        if source is None:
+            return list(rows)
+        code = SOURCES.index(source)
+        return [i for i in rows if self._source[i] == code]
+
+    def readings(self, char: str, source: Optional[str] = None) -> List[Reading]:
+        """某字的全部读音（可只取一个数据源），正读在前"""
+        return [self._reading(i) for i in self._span(char, source)]
+
+    def readings_many(self, chars, source: Optional[str] = None) -> Dict[str, List[Reading]]:
+        """
+        多个字的读音（一次批量查询：请求的字排序后顺着字表查找）
+
+        结果按请求顺序排列；未收录的字不出现在结果中，收录但没有该数据源读音的字为空列表。
+        """
+        code = None if source is None else SOURCES.index(source)
+        found = {}
+        lo = 0
+        for char in sorted(set(chars)):
+            lo = bisect_left(self._chars, char, lo)
+            if lo == len(self._chars):
+                break
+            if self._chars[lo] != char:
+                continue
+            rows = range(self._offsets[lo], self._offsets[lo + 1])
+            found[char] = [self._reading(i) for i in rows if code is None or self._source[i] == code]
+        return {char: found[char] for char in chars if char in found}
+
+    def chars(self) -> List[str]:
+        """全部收录字（已排序）"""
+        return list(self._chars)
+
+    def char_tables(self) -> tuple:
+        """繁简单字对照表 (s2t, t2s)：字 -> 候选列表（默认转换在前）；未写入对照表时为两个空字典"""
+        tables = []
+        for table in self._convert.values():
+            # 构建中的实例为字典，open() 得到的实例为映射上的字符串表
+            if isinstance(table, dict):
+                tables.append({key: list(values) for key, values in table.items()})
+            else:
+                tables.append({entry[0]: list(entry[1:]) for entry in table})
+        return tables[0], tables[1]
+
+    # ----- 谐声 -----
+
+    def series_of(self, char: str) -> List[int]:
+        """某字所属的声系号（按读音顺序去重；无 GSR 编号时为空）"""
+        cid = self._char_id(char)
+        if cid is None:
+            return []
+        found = []
+        for i in range(self._offsets[cid], self._offsets[cid + 1]):
+            series = self._series[i]
+            if series and series not in found:
+                found.append(series)
+        return found
+
+    def series_members(self, series: int) -> List[str]:
+        """某声系的全部成员字"""
+        if not 0 < series < len(self._series_offsets) - 1:
+            return []
+        start, end = self._series_offsets[series], self._series_offsets[series + 1]
+        return [self._chars[cid] for cid in self._series_chars[start:end]]
+
+    def same_series(self, char_a: str, char_b: str) -> Optional[int]:
+        """两字同属的声系号（第一个共同声系）；不同声系或缺编号时为 None"""
+        series_b = self.series_of(char_b)
+        return next((series for series in self.series_of(char_a) if series in series_b), None)
+
+    def series_mates(self, char: str) -> Dict[int, List[str]]:
+        """某字全部声系的同声系字（不含本字）：{声系号: [字, ...]}"""
+        return {series: [c for c in self.series_members(series) if c != char]
+                for series in self.series_of(char)}
+
+    # ----- 比较 -----
+
+    def _shengmu_group(self, code: int) -> int:
+        if self._groups is None:
+            self._groups = [0] * len(self._categories)
+            for gid, group in enumerate(SHENGMU_GROUPS, 1):
+                for name in group:
+                    if name in self._category_ids:
+                        self._groups[self._category_ids[name]] = gid
+        return self._groups[code]
+
+    def _score(self, i: int, j: int) -> float:
+        total = got = 0.0
+        ya, yb = self._yunbu[i], self._yunbu[j]
+        if ya and yb:
+            total += WEIGHT_YUNBU
+            if ya == yb:
+                got += WEIGHT_YUNBU
+        sa, sb = self._shengmu[i], self._shengmu[j]
+        if sa and sb:
+            total += WEIGHT_SHENGMU
+            if sa == sb:
+                got += WEIGHT_SHENGMU
+            elif self._shengmu_group(sa) and self._shengmu_group(sa) == self._shengmu_group(sb):
+                got += WEIGHT_SHENGMU / 2
+        ra, rb = self._recon[i], self._recon[j]
+        if ra and rb:
+            total += WEIGHT_RECON
+            got += WEIGHT_RECON * (1.0 if ra == rb else recon_similarity(self._texts[ra], self._texts[rb]))
+        return got / total if total else 0.0
+
+    def best_pair(self, char_a: str, char_b: str, source: Optional[str] = None) -> Optional[PairMatch]:
+        """
+        两字得分最高的一对读音
+
+        只比较同一数据源的读音；得分为韵部相同、声母相同/同组、拟音相似度（phonemes 的特征编辑距离）的加权和，
+        按两读都有的项归一化到 0~1。任一字没有（该源的）读音时返回 None。
+        """
+        rows_a = self._span(char_a, source)
+        rows_b = self._span(char_b, source)
+        best = None
+        best_score = -1.0
+        for i in rows_a:
+            for j in rows_b:
+                if self._source[i] != self._source[j]:
+                    continue
+                score = self._score(i, j)
+                if score > best_score:
+                    best, best_score = (i, j), score
+        if best is None:
+            return None
+        return PairMatch(self._reading(best[0]), self._reading(best[1]), best_score)
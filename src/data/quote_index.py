@@ -0,0 +1,371 @@
+"""
+《汉语大词典》例证引文倒排索引（异文检索）
+
+负责人：成员E（数据工程）
+
+把词典中全部例证引文（senses[].examples[].quotes）按汉字二元组（bigram）建立倒排表，
+用于查找"某段上下文中 A 字换成 B 字"的平行文句，即异文。
+
+文件（共用同一前缀，如 data/processed/dyhdc_quotes.bin）：
+    .bin    二元组 -> (倒排表起点, 文档数)，沿用 binary_index 格式（mmap + 二分查找）
+    .post   (n+1) × uint64 文档偏移，之后为各二元组的 uint32 文档号列表（升序）
+    .docs   每行一条引文：["词头", "出处", "引文"]
+
+检索时只取覆盖替换位置的二元组求候选（保证 B 字与上下文中的邻字相连），从最短的倒排表出发求交集，
+候选过多时再用其余上下文二元组按由短到长的顺序收窄，并以 MAX_CANDIDATES 封顶；
+再按上下文二元组的命中比例排序，只读取排在前面的引文，整个过程与语料大小基本无关。
+
+引文是繁体，查询常为简体：上下文按默认转换补一份繁体写法，A、B 两字展开为全部繁体候选（CharConverter）。
+"""
+import heapq
+import json
+import mmap
+import re
+import time
+from array import array
+from collections import Counter
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .binary_index import BinaryIndex, write_binary_index
+from .char_convert import CharConverter, get_converter
+from .dyhdc_index_builder import DEFAULT_CHUNK_SIZE, split_line_ranges
+from .jsonl_codec import DECODE_ERRORS, decode_entry, loads
+
+
+MAX_CANDIDATES = 20000  # 每个替换位置参与打分的候选引文上限
+
+# 连续汉字串；二元组不跨越标点
+_HAN_RUN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0003ffff]+')
+
+
+def _sidecar_paths(path) -> Tuple[Path, Path, Path]:
+    path = Path(path)
+    return path, path.with_suffix(".post"), path.with_suffix(".docs")
+
+
+def _bigrams(text: str) -> Iterator[str]:
+    for match in _HAN_RUN_RE.finditer(text):
+        run = match.group()
+        for i in range(len(run) - 1):
+            yield run[i:i + 2]
+
+
+def _extract_quotes(task: Tuple[str, int, int]) -> List[Tuple[str, str, str]]:
+    """进程池任务：从一个字节区间中取出所有例证引文 (词头, 出处, 引文)"""
+    path, start, end = task
+    quotes = []
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            offset += len(line)
+            try:
+                entry = decode_entry(line)
+            except DECODE_ERRORS:
+                continue
+            headword = entry.key
+            if not headword or headword.startswith('#'):
+                continue
+            for sense in entry.senses:
+                for ex in sense.examples:
+                    books = "；".join(ex.books)
+                    for quote in ex.quotes:
+                        if quote:
+                            quotes.append((headword, books, quote))
+    return quotes
+
+
+def build_quote_index(
+    jsonl_path: str = None,
+    output_path: str = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    构建例证引文倒排索引
+
+    Args:
+        jsonl_path: 词典JSONL路径
+        output_path: 索引路径（默认 data/processed/dyhdc_quotes.bin，另生成 .post/.docs）
+        workers: 解析JSONL的进程数，默认为CPU核数
+        chunk_size: 每个区间的目标字节数
+
+    Returns:
+        收录的引文条数
+    """
+    project_root = Path(__file__).parent.parent.parent
+    if jsonl_path is None:
+        jsonl_path = project_root / "《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl"
+    if output_path is None:
+        output_path = project_root / "data/processed/dyhdc_quotes.bin"
+
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        print(f"错误: 文件不存在: {jsonl_path}")
+        return 0
+
+    index_path, post_path, docs_path = _sidecar_paths(output_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"正在构建引文倒排索引: {jsonl_path}")
+    start_time = time.time()
+
+    ranges = split_line_ranges(jsonl_path, chunk_size)
+    tasks = [(str(jsonl_path), start, end) for start, end in ranges]
+
+    postings: Dict[str, array] = {}
+    doc_offsets = array('Q', [0])
+    with open(docs_path, 'wb') as docs:
+        if workers == 1 or len(tasks) <= 1:
+            chunks = map(_extract_quotes, tasks)
+            pool = None
+        else:
+            from multiprocessing import Pool
+            pool = Pool(workers)
+            chunks = pool.imap(_extract_quotes, tasks)
+        try:
+            for quotes in chunks:
+                for headword, books, quote in quotes:
+                    doc_id = len(doc_offsets) - 1
+                    docs.write(json.dumps([headword, books, quote], ensure_ascii=False).encode('utf-8') + b"\n")
+                    doc_offsets.append(docs.tell())
+                    for gram in set(_bigrams(quote)):
+                        posting = postings.get(gram)
+                        if posting is None:
+                            posting = postings[gram] = array('I')
+                        posting.append(doc_id)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    n_docs = len(doc_offsets) - 1
+    print(f"  引文 {n_docs} 条, 二元组 {len(postings)} 个 ({time.time() - start_time:.1f}s)")
+
+    # 文档号按插入顺序递增，倒排表天然有序
+    records = []
+    with open(post_path, 'wb') as post:
+        post.write(doc_offsets.tobytes())
+        pos = 0
+        for gram, posting in postings.items():
+            post.write(posting.tobytes())
+            records.append((gram, pos, len(posting)))
+            pos += len(posting)
+    write_binary_index(index_path, records, meta={
+        "docs": n_docs,
+        "postings_pos": doc_offsets.itemsize * len(doc_offsets),
+        "ngram": 2,
+    })
+
+    elapsed = time.time() - start_time
+    print(f"引文索引构建完成: {index_path}")
+    print(f"耗时: {elapsed:.1f}s")
+    return n_docs
+
+
+class QuoteIndex:
+    """
+    例证引文倒排索引读取器
+
+    使用方法：
+        with QuoteIndex("data/processed/dyhdc_quotes.bin") as index:
+            index.search_variants("崇朝其雨", "崇", "終")
+    """
+
+    def __init__(self, path, converter: Optional[CharConverter] = None):
+        index_path, post_path, docs_path = _sidecar_paths(path)
+        self.path = index_path
+        self._converter = converter  # 繁简单字对照，默认首次检索时取进程内共享的转换器
+        self._keys = BinaryIndex(index_path)
+        meta = self._keys.meta
+        self._n_docs = meta["docs"]
+
+        with open(post_path, 'rb') as f:
+            self._post_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(docs_path, 'rb') as f:
+            # 空文件不能mmap
+            self._docs_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._n_docs else None
+        view = memoryview(self._post_mm)
+        self._doc_offsets = view[:8 * (self._n_docs + 1)].cast('Q')
+        self._postings = view[meta["postings_pos"]:].cast('I')
+        view.release()
+
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __enter__(self) -> "QuoteIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def postings(self, gram: str) -> memoryview:
+        """二元组的文档号列表（升序）"""
+        found = self._keys.find(gram)
+        if not found:
+            return self._postings[0:0]
+        start, count = self._keys.record(found.start)
+        return self._postings[start:start + count]
+
+    def doc(self, doc_id: int) -> Tuple[str, str, str]:
+        """读取一条引文：(词头, 出处, 引文)"""
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        return tuple(loads(self._docs_mm[start:end]))
+
+    def search_variants(
+        self,
+        context: str,
+        char_a: str,
+        char_b: str,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        查找上下文中 char_a 所在位置换成 char_b 的引文
+
+        上下文和两字可以是简体：char_a 的任一繁体候选都算作替换位置，char_b 的每个繁体候选都会尝试。
+
+        Args:
+            context: 上下文，如"崇朝其雨"
+            char_a: 上下文中的字（被释字）
+            char_b: 替换字（释字）
+            limit: 最多返回条数
+
+        Returns:
+            [{"headword", "source", "text", "score"}, ...]，score 为替换后上下文二元组的命中比例，
+            按 score 降序；引文相同的只保留一条
+        """
+        forms_a = set(self._forms(char_a))
+        forms_b = self._forms(char_b)
+        scores: Dict[int, float] = {}
+        # 原文与逐字转换后的繁体写法长度相同，替换位置按原文判断
+        for text in dict.fromkeys([context, self.converter.convert(context, "s2t")]):
+            for pos, char in enumerate(text):
+                if char not in forms_a and context[pos] not in forms_a:
+                    continue
+                for form in forms_b:
+                    variant = text[:pos] + form + text[pos + 1:]
+                    for doc_id, score in self._score_variant(variant, pos).items():
+                        if score > scores.get(doc_id, 0):
+                            scores[doc_id] = score
+
+        # 只对排在前面的少量候选读引文；去重后不够再扩大范围
+        results = []
+        k = 4 * limit
+        while True:
+            ranked = heapq.nsmallest(k, scores, key=lambda d: (-scores[d], d))
+            results = []
+            seen = set()
+            for doc_id in ranked:
+                headword, books, quote = self.doc(doc_id)
+                if quote in seen:
+                    continue
+                seen.add(quote)
+                results.append({
+                    "headword": headword,
+                    "source": books,
+                    "text": quote,
+                    "score": round(scores[doc_id], 3),
+                })
+                if len(results) >= limit:
+                    return results
+            if k >= len(scores):
+                return results
+            k *= 4
+
+    def _score_variant(self, variant: str, pos: int) -> Dict[int, float]:
+        """对替换后的上下文打分：候选须含覆盖替换位置的二元组"""
+        run = next((m for m in _HAN_RUN_RE.finditer(variant) if m.start() <= pos < m.end()), None)
+        if run is None or run.end() - run.start() < 2:
+            return {}
+        lo, hi = run.start(), run.end()
+        grams = list(dict.fromkeys(variant[i:i + 2] for i in range(lo, hi - 1)))
+        anchors = [variant[i:i + 2] for i in (pos - 1, pos) if lo <= i and i + 2 <= hi]
+
+        # 替换字两侧的邻字都对得上的优先；没有再放宽到只对上一侧
+        anchor_postings = [self.postings(gram) for gram in anchors]
+        others = sorted((self.postings(gram) for gram in grams if gram not in anchors), key=len)
+        candidates = _select_candidates(anchor_postings, others)
+        if not candidates and len(anchor_postings) > 1:
+            for posting in anchor_postings:
+                candidates |= _select_candidates([posting], others)
+        if not candidates:
+            return {}
+
+        hits: Counter = Counter()
+        for gram in grams:
+            hits.update(_filter(candidates, self.postings(gram)))
+        return {doc_id: count / len(grams) for doc_id, count in hits.items()}
+
+    @property
+    def converter(self) -> CharConverter:
+        """繁简单字对照"""
+        if self._converter is None:
+            self._converter = get_converter()
+        return self._converter
+
+    def _forms(self, char: str) -> List[str]:
+        """字的各种写法：原字及其全部繁体候选"""
+        return list(dict.fromkeys([char] + self.converter.candidates(char, "s2t")))
+
+    def close(self) -> None:
+        """释放映射"""
+        if self._post_mm is None:
+            return
+        self._doc_offsets.release()
+        self._postings.release()
+        self._post_mm.close()
+        self._post_mm = None
+        if self._docs_mm is not None:
+            self._docs_mm.close()
+            self._docs_mm = None
+        self._keys.close()
+
+
+def _contains(posting: memoryview, doc_id: int) -> bool:
+    i = bisect_left(posting, doc_id)
+    return i < len(posting) and posting[i] == doc_id
+
+
+
+
+def _filter(docs: set, posting: memoryview) -> set:
+    """docs 中也出现在 posting 里的文档号"""
+    if len(posting) > 64 * len(docs):
+        # 长倒排表：逐个文档号二分查找，避免遍历整张表
+        return {d for d in docs if _contains(posting, d)}
+    return docs.intersection(posting)
+
+
+def _select_candidates(required: List[memoryview], optional: List[memoryview]) -> set:
+    """
+    求同时出现在 required 各倒排表中的文档号，最多 MAX_CANDIDATES 个
+
+    只把最短的表读成集合，再到其余表中过滤：required 中最短的表超过上限时，
+    先改从比它更短的 optional 表（上下文其余二元组，由短到长）出发，交集为空再换下一张；
+    结果仍超过上限时依次用其余 optional 表收窄（交集为空的跳过），最后按文档号截断。
+    """
+    required = sorted(required, key=len)
+    sources = [required[0]]
+    if len(required[0]) > MAX_CANDIDATES:
+        sources = [p for p in optional if len(p) < len(required[0])] + sources
+    result: set = set()
+    for source in sources:
+        result = set(source)
+        for posting in required:
+            if posting is not source and result:
+                result = _filter(result, posting)
+        if result:
+            break
+
+    for posting in optional:
+        if len(result) <= MAX_CANDIDATES:
+            break
+        if posting is not source:
+            result = _filter(result, posting) or result
+    if len(result) > MAX_CANDIDATES:
+        result = set(heapq.nsmallest(MAX_CANDIDATES, result))
+    return result
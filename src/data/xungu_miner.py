@@ -0,0 +1,212 @@
+"""
+注疏语料训诂句抽取
+
+负责人：成员E（数据工程）
+
+各工具的入口都要求切好的训诂句（如"崇，终也"）。这里从整部注疏文本中流式抽出候选训诂句：
+1. 每行按句读（。？！）、分句（；：）与引号切成小句，记下小句在行内的位置
+2. 小句交给 PatternTool.identify（XUNSHI_PATTERNS 训式规则，先按术语预筛），识别出格式的留下
+3. 被释字、释字过长的（多为叙述文字碰巧套上"A，B也"）丢弃
+
+语料可以是纯文本（一行一段），也可以是 JSONL（取 text_field 字段）。
+多个文件按换行对齐切成字节区间，进程池并行抽取，结果按文件、区间顺序以生成器逐条产出，
+可直接写成 JSONL 交给批量分类：
+    data/processed/xungu_candidates.jsonl  每行一条候选训诂句
+
+每条候选：
+    {"训诂句": "貉，读为十百之百。", "被释字": "貉", "释字": "十百之百", "格式": "读为",
+     "暗示类型": "假借", "置信度": "极高", "文件": "...", "偏移": 行首字节偏移, "位置": 行内字符位置}
+被释字、释字为简体（识别前整句转简体），训诂句为原文。
+
+使用方法：
+    for item in mine_corpus(["参考资料/参考资料3.txt"], workers=4):
+        print(item["格式"], item["训诂句"])
+    build_xungu_corpus()  # 抽取 参考资料/ 下全部文本，写入 data/processed/xungu_candidates.jsonl
+"""
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dyhdc_index_builder import split_line_ranges
+from .jsonl_codec import DECODE_ERRORS, loads
+
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 并行抽取时每个区间的目标字节数
+MAX_CHAR_A = 4  # 被释字最长字数
+MAX_CHAR_B = 12  # 释字最长字数
+
+# 小句：到句读（含）为止，遇分句号、引号、括号截断
+_CLAUSE_RE = re.compile(r'[^。？！?!；;：:“”‘’「」『』（）()\n]+[。？！?!]?')
+_LEADING = "，,、 \t\r\u3000"
+_HAN_RE = re.compile(r'^[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0003ffff]+$')
+
+_tool = None  # 进程内共享的 PatternTool
+
+
+def _pattern_tool():
+    global _tool
+    if _tool is None:
+        from ..tools.pattern_tool import PatternTool
+        _tool = PatternTool()
+    return _tool
+
+
+def split_clauses(text: str) -> Iterator[Tuple[int, str]]:
+    """把一段文本切成小句，产出 (小句在文本中的字符位置, 小句)；去掉首尾空白与句首残留的逗号"""
+    for match in _CLAUSE_RE.finditer(text):
+        clause = match.group()
+        stripped = clause.lstrip(_LEADING)
+        if stripped.strip():
+            yield match.start() + len(clause) - len(stripped), stripped.rstrip()
+
+
+def extract_xungu(text: str, max_char_a: int = MAX_CHAR_A,
+                  max_char_b: int = MAX_CHAR_B) -> Iterator[Dict[str, Any]]:
+    """从一段文本中抽出候选训诂句（不含 文件/偏移 字段），按出现顺序产出"""
+    tool = _pattern_tool()
+    for position, clause in split_clauses(text):
+        result = tool.identify(clause)
+        if result.pattern_name == "未知":
+            continue
+        if not (0 < len(result.char_a) <= max_char_a and _HAN_RE.match(result.char_a)):
+            continue
+        if len(result.char_b) > max_char_b:
+            continue
+        yield {
+            "训诂句": clause,
+            "被释字": result.char_a,
+            "释字": result.char_b,
+            "格式": result.pattern_name,
+            "暗示类型": result.implied_type,
+            "置信度": result.confidence,
+            "位置": position,
+        }
+
+
+def _iter_lines(path: str, start: int, end: int, text_field: Optional[str]) -> Iterator[Tuple[int, str]]:
+    """逐行读取一个字节区间，产出 (行首字节偏移, 文本)；JSONL 取 text_field 字段"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            line_offset, offset = offset, offset + len(line)
+            if text_field is None:
+                yield line_offset, line.decode('utf-8', errors='replace')
+                continue
+            try:
+                record = loads(line)
+            except DECODE_ERRORS:
+                continue
+            text = record.get(text_field) if isinstance(record, dict) else None
+            if isinstance(text, str):
+                yield line_offset, text
+
+
+def _extract_range(task: Tuple[str, int, int, Optional[str], int, int]) -> List[Dict[str, Any]]:
+    """进程池任务：抽取一个字节区间内的候选训诂句"""
+    path, start, end, text_field, max_char_a, max_char_b = task
+    found = []
+    for line_offset, text in _iter_lines(path, start, end, text_field):
+        for item in extract_xungu(text, max_char_a, max_char_b):
+            item["文件"] = path
+            item["偏移"] = line_offset
+            found.append(item)
+    return found
+
+
+def mine_corpus(
+    paths: Iterable,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    text_field: str = "text",
+    max_char_a: int = MAX_CHAR_A,
+    max_char_b: int = MAX_CHAR_B,
+) -> Iterator[Dict[str, Any]]:
+    """
+    并行抽取多个语料文件中的候选训诂句（生成器）
+
+    Args:
+        paths: 语料文件；.jsonl 文件逐行解析取 text_field 字段，其余按纯文本逐行读取
+        workers: 进程数（None 为 CPU 核数，1 为在本进程中顺序抽取）
+        chunk_size: 每个并行区间的目标字节数
+        text_field: JSONL 语料的正文字段
+        max_char_a / max_char_b: 被释字、释字的最长字数，超出的视为误配丢弃
+
+    Yields:
+        候选训诂句，按文件、行序产出
+    """
+    tasks = []
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            print(f"  → 文件不存在，跳过: {path}")
+            continue
+        field = text_field if path.suffix == ".jsonl" else None
+        tasks.extend((str(path), start, end, field, max_char_a, max_char_b)
+                     for start, end in split_line_ranges(path, chunk_size))
+
+    if workers == 1 or len(tasks) <= 1:
+        chunks: Iterable = map(_extract_range, tasks)
+        pool = None
+    else:
+        from multiprocessing import Pool
+        pool = Pool(workers)
+        chunks = pool.imap(_extract_range, tasks)
+    try:
+        for chunk in chunks:
+            yield from chunk
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def build_xungu_corpus(
+    paths: Optional[Iterable] = None,
+    output_path: str = None,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    text_field: str = "text",
+) -> Dict[str, int]:
+    """
+    抽取候选训诂句并写入JSONL
+
+    Args:
+        paths: 语料文件（默认 参考资料/ 下全部 .txt）
+        output_path: 输出路径（默认 data/processed/xungu_candidates.jsonl）
+
+    Returns:
+        各格式的候选数 {"读为": 12, ...}
+    """
+    project_root = Path(__file__).parent.parent.parent
+    if paths is None:
+        paths = sorted((project_root / "参考资料").glob("*.txt"))
+    if output_path is None:
+        output_path = project_root / "data/processed/xungu_candidates.jsonl"
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"正在抽取训诂句: {output_path}")
+    start_time = time.time()
+
+    counts: Dict[str, int] = {}
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        for item in mine_corpus(paths, workers=workers, chunk_size=chunk_size, text_field=text_field):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            counts[item["格式"]] = counts.get(item["格式"], 0) + 1
+
+    elapsed = time.time() - start_time
+    print(f"训诂句抽取完成: {sum(counts.values())} 条候选")
+    print(f"耗时: {elapsed:.1f}s")
+    return counts
+
+
+if __name__ == "__main__":
+    counts = build_xungu_corpus()
+    for name, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {name}: {count}")
@@ -6,11 +6,12 @@
 数据文件：《汉语大词典》结构化/dyhdc.parsed.fixed.v2.jsonl
 文件大小：1.9GB
 """
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional, Iterator
 from dataclasses import dataclass
 
+from ..data.dyhdc_index_builder import DYHDCIndexBuilder, DYHDCIndexLoader, get_shared_loader
+
 
 @dataclass
 class DictionaryEntry:
@@ -32,37 +33,50 @@ class DictionaryLoader:
     
     使用方法：
         loader = DictionaryLoader("path/to/dyhdc.jsonl")
-        loader.load()  # 或 loader.load_lazy() 延迟加载
+        loader.load()  # 打开偏移量索引（不存在时先构建一次）
         entry = loader.query("崇")
     
     注意：
-        - 文件很大(1.9GB)，建议使用延迟加载或只加载索引
-        - 可以先用 build_index() 建立索引文件，加速后续查询
+        - 查询基于偏移量索引（src/data/dyhdc_index_builder），每次只二分查找并读取命中的词条，
+          不再整表载入内存，也不再逐行扫描1.9GB的JSONL
+        - 可以先用 build_index_file() 建立索引文件，避免首次查询时构建
     """
     
-    def __init__(self, jsonl_path: Optional[str] = None):
+    def __init__(self, jsonl_path: Optional[str] = None, index_path: Optional[str] = None):
         """
         初始化加载器
         
         Args:
             jsonl_path: JSONL文件路径，默认使用配置中的路径
+            index_path: 偏移量索引路径，默认使用配置中的路径
         """
+        from ..config import get_settings
+        settings = get_settings()
         if jsonl_path is None:
-            from ..config import get_settings
-            jsonl_path = str(get_settings().dyhdc_path)
+            jsonl_path = str(settings.dyhdc_path)
+        if index_path is None:
+            index_path = str(settings.dyhdc_index_path)
         
         self.jsonl_path = Path(jsonl_path)
-        self._index: Dict[str, Any] = {}  # 字 -> 条目
+        self.index_path = Path(index_path)
+        self._cache_bytes = settings.dyhdc_cache_mb * 1024 * 1024
+        self._loader: Optional[DYHDCIndexLoader] = None
         self._loaded = False
     
     def load(self, max_entries: Optional[int] = None) -> None:
         """
-        加载全部数据到内存
+        打开偏移量索引，之后的查询按需读取词条
         
         Args:
-            max_entries: 最多加载多少条（用于测试）
+            max_entries: 已不再使用（不再整表载入内存），保留参数以兼容旧调用
+        """
+        self.load_lazy()
+    
+    def load_lazy(self) -> None:
+        """
+        打开偏移量索引（只做mmap，与词条数无关）；索引不存在时先构建一次
         
-        警告：完整加载会占用大量内存！
+        JSONL与索引都不存在时只打印警告，之后的查询返回 None
         """
         if self._loaded:
             return
@@ -71,88 +85,40 @@ class DictionaryLoader:
             print(f"警告: 数据文件不存在: {self.jsonl_path}")
             return
         
-        print(f"正在加载字典数据: {self.jsonl_path}")
-        count = 0
-        
-        with open(self.jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if max_entries and count >= max_entries:
-                    break
-                
-                try:
-                    entry = json.loads(line.strip())
-                    self._process_entry(entry)
-                    count += 1
-                    
-                    if count % 10000 == 0:
-                        print(f"  已加载 {count} 条...")
-                        
-                except json.JSONDecodeError:
-                    continue
-        
-        print(f"加载完成，共 {count} 条")
-        self._loaded = True
-    
-    def load_lazy(self) -> None:
-        """
-        延迟加载模式 - 只在查询时才读取
+        if not self.index_path.exists():
+            print(f"索引不存在，先构建偏移量索引: {self.index_path}")
+            self.build_index_file(str(self.index_path))
         
-        适用于内存有限或只需要查询少量字的场景
-        """
-        self._loaded = True  # 标记为已初始化，查询时动态加载
-    
-    def _process_entry(self, entry: dict) -> None:
-        """处理单条数据，加入索引"""
-        # 提取词头
-        headword = entry.get("headword", "") or entry.get("hw", "")
-        if not headword:
+        loader = get_shared_loader(str(self.jsonl_path), str(self.index_path), self._cache_bytes)
+        if not loader.load_index():
+            print(f"警告: 无法加载索引: {self.index_path}")
             return
-        
-        # 提取第一个字作为索引键
-        first_char = headword[0] if headword else ""
-        
-        # 存入索引
-        if first_char not in self._index:
-            self._index[first_char] = []
-        self._index[first_char].append(entry)
+        loader.refresh_if_stale()
+        self._loader = loader
+        self._loaded = True
     
     def query(self, char: str) -> Optional[Dict[str, Any]]:
         """
         查询单个汉字
         
+        先查词头恰为该字的单字条目，没有再取以该字开头的第一个词条；
+        两者都是对索引的二分查找加一次定位读取，耗时与词典大小无关。
+        
         Args:
             char: 要查询的汉字
             
         Returns:
-            dict: 包含本义、义项、例句等信息
+            dict: 包含本义、义项、例句等信息；未收录或数据不可用时为 None
         """
         if not self._loaded:
             self.load_lazy()
+        if self._loader is None or not char:
+            return None
         
-        # 从索引查找
-        if char in self._index:
-            entries = self._index[char]
-            # 返回处理后的结果
-            return self._format_result(char, entries)
-        
-        # 延迟加载模式：动态搜索文件
-        if self.jsonl_path.exists():
-            return self._search_in_file(char)
-        
-        return None
-    
-    def _search_in_file(self, char: str) -> Optional[Dict[str, Any]]:
-        """在文件中搜索指定字（延迟加载模式）"""
-        with open(self.jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    headword = entry.get("headword", "") or entry.get("hw", "")
-                    if headword and headword[0] == char:
-                        return self._format_result(char, [entry])
-                except:
-                    continue
-        return None
+        entries = self._loader.query(char) or self._loader.query_prefix(char, limit=1)
+        if not entries:
+            return None
+        return self._format_result(char, entries)
     
     def _format_result(self, char: str, entries: list) -> Dict[str, Any]:
         """格式化查询结果"""
@@ -203,15 +169,28 @@ class DictionaryLoader:
             "raw": main_entry  # 保留原始数据
         }
     
-    def build_index_file(self, output_path: str) -> None:
+    def build_index_file(self, output_path: Optional[str] = None, incremental: bool = False) -> Dict[str, Any]:
         """
-        构建索引文件，加速后续查询
+        构建偏移量索引文件，加速后续查询
         
-        TODO: 实现此方法
-        - 遍历JSONL，为每个字建立偏移量索引
-        - 保存为JSON文件
+        Args:
+            output_path: 索引路径，默认为本加载器的 index_path；
+                         .bin 为二进制索引（推荐），.json 为旧版JSON索引
+            incremental: 复用已有索引中未变化的区间，只重新扫描变化的区间
+        
+        Returns:
+            首字 -> 词条记录列表
         """
-        pass
+        if output_path is None:
+            output_path = str(self.index_path)
+        index = DYHDCIndexBuilder(str(self.jsonl_path)).build_index(output_path, incremental=incremental)
+        if self._loader is not None and Path(output_path).resolve() == self.index_path.resolve():
+            # 重建了正在使用的索引：重新映射，并丢弃按旧偏移量缓存的词条
+            self._loader.close()
+            if self._loader.cache is not None:
+                self._loader.cache.clear()
+            self._loader.load_index()
+        return index
 
 
 # ===== 便捷函数 =====
@@ -238,7 +217,7 @@ if __name__ == "__main__":
     # 测试加载器
     loader = DictionaryLoader()
     
-    # 尝试延迟加载模式
+    # 打开偏移量索引
     loader.load_lazy()
     
     # 查询测试
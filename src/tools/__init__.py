@@ -10,7 +10,7 @@
 """
 
 from .semantic_tool import query_word_meaning, SemanticTool
-from .phonology_tool import query_phonology, PhonologyTool, check_phonetic_relation
+from .phonology_tool import query_phonology, PhonologyTool, check_phonetic_relation, find_similar_chars, find_series_mates
 from .textual_tool import search_textual_evidence, TextualTool
 from .pattern_tool import identify_pattern, PatternTool
 from .context_tool import analyze_context, ContextTool
@@ -20,6 +20,8 @@ __all__ = [
     "query_word_meaning",
     "query_phonology",
     "check_phonetic_relation",
+    "find_similar_chars",
+    "find_series_mates",
     "search_textual_evidence",
     "identify_pattern",
     "analyze_context",
@@ -6,14 +6,8 @@
 实现者：成员D
 """
 import re
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
-# ===== 繁简转换工具 =====
-try:
-    from opencc import OpenCC
-    cc = OpenCC('t2s') # 繁转简
-except:
-    cc = None
 
 @dataclass
 class PatternResult:
@@ -29,10 +23,12 @@ class PatternResult:
 # ===== 训式规则表 =====
 # 核心知识库：定义了如何用正则捕捉训诂术语
 # 优化点：使用 (.+?) 非贪婪匹配，避免吞噬逗号
+# keywords：该正则能匹配的句子必含其中之一的术语（必要条件），用于先筛出候选格式
 XUNSHI_PATTERNS = {
     # ===== A类：直接判假借（高置信度 - 铁证）=====
     "读为": {
         "regex": r"^(.+?)[，,]\s*读为\s*(.+?)[。？]?$",
+        "keywords": ["读为"],
         "type": "假借",
         "confidence": "极高",
         "direct_judge": True,
@@ -40,6 +36,7 @@ XUNSHI_PATTERNS = {
     },
     "读曰": {
         "regex": r"^(.+?)[，,]\s*读曰\s*(.+?)[。？]?$",
+        "keywords": ["读曰"],
         "type": "假借",
         "confidence": "极高",
         "direct_judge": True,
@@ -47,6 +44,7 @@ XUNSHI_PATTERNS = {
     },
     "读当为": {
         "regex": r"^(.+?)[，,]\s*读?当为\s*(.+?)[。？]?$",
+        "keywords": ["当为"],
         "type": "假借",
         "confidence": "高",
         "direct_judge": True,
@@ -54,6 +52,7 @@ XUNSHI_PATTERNS = {
     },
     "当为": {
         "regex": r"^(.+?)[，,]\s*当为\s*(.+?)[。？]?$",
+        "keywords": ["当为"],
         "type": "假借",
         "confidence": "高",
         "direct_judge": True,
@@ -61,6 +60,7 @@ XUNSHI_PATTERNS = {
     },
     "当作": {
         "regex": r"^(.+?)[，,]\s*当作\s*(.+?)[。？]?$",
+        "keywords": ["当作"],
         "type": "假借",
         "confidence": "高",
         "direct_judge": True,
@@ -68,6 +68,7 @@ XUNSHI_PATTERNS = {
     },
     "通": {
         "regex": r"^(.+?)[与与跟](.+?)通$",
+        "keywords": ["通"],
         "type": "假借",
         "confidence": "高",
         "direct_judge": True,
@@ -75,6 +76,7 @@ XUNSHI_PATTERNS = {
     },
     "古字通": {
         "regex": r"^(.+?)[、,，]\s*(.+?)[，,]?\s*古字通[。？]?$",
+        "keywords": ["古字通"],
         "type": "假借",
         "confidence": "高",
         "direct_judge": True,
@@ -82,6 +84,7 @@ XUNSHI_PATTERNS = {
     },
     "假借字": {
         "regex": r"^(.+?)[，,]\s*.*假借字.*",
+        "keywords": ["假借字"],
         "type": "假借",
         "confidence": "极高",
         "direct_judge": True,
@@ -89,6 +92,7 @@ XUNSHI_PATTERNS = {
     },
     "借为": {
         "regex": r"^(.+?)[，,]\s*借为\s*(.+?)[。？]?$",
+        "keywords": ["借为"],
         "type": "假借",
         "confidence": "极高",
         "direct_judge": True,
@@ -98,6 +102,7 @@ XUNSHI_PATTERNS = {
     # ===== B类：可能假借（中置信度 - 需结合音韵）=====
     "读若": {
         "regex": r"^(.+?)[，,]\s*读若\s*(.+?)[。？]?$",
+        "keywords": ["读若"],
         "type": "可能假借",
         "confidence": "中",
         "direct_judge": False,
@@ -105,6 +110,7 @@ XUNSHI_PATTERNS = {
     },
     "读如": {
         "regex": r"^(.+?)[，,]\s*读如\s*(.+?)[。？]?$",
+        "keywords": ["读如"],
         "type": "可能假借",
         "confidence": "中",
         "direct_judge": False,
@@ -112,6 +118,7 @@ XUNSHI_PATTERNS = {
     },
     "或作": {
         "regex": r"^(.+?)[，,]\s*或作\s*(.+?)[。？]?$",
+        "keywords": ["或作"],
         "type": "可能假借",
         "confidence": "中",
         "direct_judge": False,
@@ -119,6 +126,7 @@ XUNSHI_PATTERNS = {
     },
     "声近": {
         "regex": r"^(.+?)[，,]\s*.*声近.*",
+        "keywords": ["声近"],
         "type": "可能假借",
         "confidence": "中",
         "direct_judge": False,
@@ -129,6 +137,7 @@ XUNSHI_PATTERNS = {
     "之言": {
         # 注意：这里不能太严格限制逗号，因为可能是 "海之言晦也"（无逗号）
         "regex": r"^(.+?)之(?:为)?言\s*(.+?)也?[。？]?$",
+        "keywords": ["之言", "之为言"],
         "type": "以声通义",
         "confidence": "高",
         "direct_judge": False,
@@ -138,6 +147,7 @@ XUNSHI_PATTERNS = {
     # ===== D类：直接判语义解释（义训）=====
     "犹": {
         "regex": r"^(.+?)[，,]\s*犹\s*(.+?)[也。？]?$",
+        "keywords": ["犹"],
         "type": "语义解释",
         "confidence": "高",
         "direct_judge": True,
@@ -145,6 +155,7 @@ XUNSHI_PATTERNS = {
     },
     "犹言": {
         "regex": r"^(.+?)[，,]\s*犹言\s*(.+?)[。？]?$",
+        "keywords": ["犹言"],
         "type": "语义解释",
         "confidence": "高",
         "direct_judge": True,
@@ -152,6 +163,7 @@ XUNSHI_PATTERNS = {
     },
     "谓之": {
         "regex": r"^(.+?)[，,]\s*谓之\s*(.+?)[。？]?$",
+        "keywords": ["谓之"],
         "type": "语义解释",
         "confidence": "高",
         "direct_judge": True,
@@ -159,6 +171,7 @@ XUNSHI_PATTERNS = {
     },
     "之貌": {
         "regex": r"^(.+?)[，,]\s*(.+?)之貌[。？]?$",
+        "keywords": ["之貌"],
         "type": "语义解释",
         "confidence": "极高",
         "direct_judge": True,
@@ -166,6 +179,7 @@ XUNSHI_PATTERNS = {
     },
     "貌": {
         "regex": r"^(.+?)[，,]\s*(.+?)貌[。？]?$",
+        "keywords": ["貌"],
         "type": "语义解释",
         "confidence": "高",
         "direct_judge": True,
@@ -173,6 +187,7 @@ XUNSHI_PATTERNS = {
     },
     "所以": {
         "regex": r"^(.+?)[，,]\s*所以(.+)也?[。？]?$",
+        "keywords": ["所以"],
         "type": "语义解释",
         "confidence": "高",
         "direct_judge": True,
@@ -182,6 +197,7 @@ XUNSHI_PATTERNS = {
     # ===== E类：不确定（最常见的 A，B也）=====
     "者也": {
         "regex": r"^(.+?)者[，,]?\s*(.+?)也[。？]?$",
+        "keywords": ["者"],
         "type": "不确定",
         "confidence": "低",
         "direct_judge": False,
@@ -189,6 +205,7 @@ XUNSHI_PATTERNS = {
     },
     "即": {
         "regex": r"^(.+?)[，,]\s*即\s*(.+?)[。？]?$",
+        "keywords": ["即"],
         "type": "不确定",
         "confidence": "低",
         "direct_judge": False,
@@ -197,6 +214,7 @@ XUNSHI_PATTERNS = {
     "A也": {
         # 这是兜底规则，必须非常小心，只匹配简单的 A,B也
         "regex": r"^([^，,]+?)[，,]\s*([^，,]+?)也[。？]?$",
+        "keywords": ["也"],
         "type": "不确定",
         "confidence": "低",
         "direct_judge": False,
@@ -204,13 +222,40 @@ XUNSHI_PATTERNS = {
     },
 }
 
+# 定义匹配优先级：A类(假借铁证) > C类(声训) > D类(义训) > B类(疑似) > E类(通用)
+# 这个顺序非常重要，避免"读为"被"A也"抢先匹配
+PRIORITY_ORDER = [
+    # 1. 强假借
+    "读为", "读曰", "读当为", "当为", "当作", "通", "古字通", 
+    "假借字", "借为",
+    # 2. 强语义/声训
+    "之言", "谓之", "之貌", "貌", "所以", "犹", "犹言",
+    # 3. 弱假借
+    "读若", "读如", "或作", "声近",
+    # 4. 兜底/通用
+    "者也", "即", "A也"
+]
+
+# _clean_char 去除的常见标点
+_PUNCT_TABLE = str.maketrans("", "", "。，、；：""''「」『』【】《》（）()")
+
 class PatternTool:
     """
     训式识别工具类
+
+    识别时先用一个合并的术语正则扫描一遍句子，找出句中出现的全部术语，
+    只对这些术语对应的候选格式按优先级逐个尝试完整正则；结果与逐个尝试全部格式相同。
     """
     
-    def __init__(self):
-        """初始化，编译正则表达式"""
+    def __init__(self, prefilter: bool = True):
+        """
+        初始化，编译正则表达式
+
+        Args:
+            prefilter: 先按术语筛选候选格式；False 时按优先级逐个尝试全部格式（对照用）
+        """
+        self.prefilter = prefilter
+        self._converter = None  # 繁简单字对照（首次识别时加载）
         self.patterns = {}
         # 预编译所有正则
         for name, config in XUNSHI_PATTERNS.items():
@@ -221,31 +266,45 @@ class PatternTool:
                 }
             except re.error as e:
                 print(f"[PatternTool] Error compiling regex for {name}: {e}")
+        self._build_keyword_index()
+
+    def _build_keyword_index(self) -> None:
+        """术语 -> 候选格式 的索引，以及一次扫出全部术语的合并正则"""
+        keywords = {kw for config in self.patterns.values() for kw in config.get("keywords", ())}
+        # 没有声明术语的格式总是候选
+        self._always = {name for name, config in self.patterns.items() if not config.get("keywords")}
+        # 长术语在前：同一位置只报最长的术语，它包含的短术语（读当为 ⊃ 当为）的格式一并列为候选
+        ordered = sorted(keywords, key=lambda kw: (-len(kw), kw))
+        self._keyword_patterns = {
+            kw: {name for name, config in self.patterns.items()
+                 if any(k in kw for k in config.get("keywords", ()))}
+            for kw in ordered
+        }
+        # 零宽前瞻：在每个位置都尝试，重叠的术语（谓之言 中的 谓之、之言）都能找到
+        alternation = "|".join(re.escape(kw) for kw in ordered)
+        self._keyword_regex = re.compile(f"(?=({alternation}))") if ordered else None
+
+    def _candidates(self, sentence: str) -> List[str]:
+        """句中出现的术语对应的候选格式，按优先级排列"""
+        if not self.prefilter or self._keyword_regex is None:
+            return PRIORITY_ORDER
+        found = set(self._always)
+        for kw in set(self._keyword_regex.findall(sentence)):
+            found |= self._keyword_patterns[kw]
+        return [name for name in PRIORITY_ORDER if name in found]
 
     def identify(self, sentence: str) -> PatternResult:
         """
         识别训诂句的格式（核心逻辑）
         """
-        # 自动归一化为简体
-        if cc:
-            sentence = cc.convert(sentence)
+        # 自动归一化为简体（逐字查音韵文件中预生成的繁简对照表，不需要 OpenCC）
+        if self._converter is None:
+            from ..data.char_convert import get_converter
+            self._converter = get_converter()
+        sentence = self._converter.convert(sentence, "t2s")
         sentence = sentence.strip()
         
-        # 定义匹配优先级：A类(假借铁证) > C类(声训) > D类(义训) > B类(疑似) > E类(通用)
-        # 这个顺序非常重要，避免"读为"被"A也"抢先匹配
-        priority_order = [
-            # 1. 强假借
-            "读为", "读曰", "读当为", "当为", "当作", "通", "古字通", 
-            "假借字", "借为",
-            # 2. 强语义/声训
-            "之言", "谓之", "之貌", "貌", "所以", "犹", "犹言",
-            # 3. 弱假借
-            "读若", "读如", "或作", "声近",
-            # 4. 兜底/通用
-            "者也", "即", "A也"
-        ]
-        
-        for name in priority_order:
+        for name in self._candidates(sentence):
             if name not in self.patterns:
                 continue
             
@@ -301,9 +360,7 @@ class PatternTool:
         """清理提取的字符，去除标点等"""
         if not text: return ""
         # 去除常见标点
-        for punct in "。，、；：""''「」『』【】《》（）()":
-            text = text.replace(punct, "")
-        return text.strip()
+        return text.translate(_PUNCT_TABLE).strip()
     
     def _extract_first_char(self, sentence: str) -> str:
         """兜底：从句子中提取第一个汉字"""
@@ -1,8 +1,8 @@
 """
 音韵查询工具 (Phonology Tool) 
 功能：
-1. 读取 data/processed/phonology_unified.json 
-2. 提供繁简转换 (OpenCC)
+1. 读取 data/processed/phonology.bin（mmap 映射的紧凑存储；也兼容统一格式的 JSON）
+2. 提供繁简转换 (查音韵文件中预生成的单字对照表，运行时不需要 OpenCC)
 3. 动态展示拟音来源 (白一平/潘悟云)
 4. 实现声训判定的核心逻辑
 
@@ -10,23 +10,17 @@
 """
 import json
 import os
-from typing import Dict, Optional, Any
-from dataclasses import dataclass
-
-# === 1. 第三方库引用 ===
-try:
-    from opencc import OpenCC
-except ImportError:
-    print("⚠️ 警告: 未安装 opencc-python-reimplemented。无法查询繁体索引。")
-    print("👉 请运行: pip install opencc-python-reimplemented")
-    OpenCC = None
-
-# === 2. 路径配置 ===
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, replace
+
+# === 路径配置 ===
 # 当前文件: src/tools/phonology_tool.py
-# 目标文件: data/processed/phonology_unified.json
+# 目标文件: data/processed/phonology.bin
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 # 向上两层找到根目录，再进 data/processed
-DATA_FILE_PATH = os.path.normpath(os.path.join(CURRENT_DIR, "../../data/processed/phonology_unified.json"))
+DATA_FILE_PATH = os.path.normpath(os.path.join(CURRENT_DIR, "../../data/processed/phonology.bin"))
+# 预计算的 top-k 音近字表（build_phonetic_neighbors 生成；缺失时现算）
+NEIGHBORS_FILE_PATH = os.path.normpath(os.path.join(CURRENT_DIR, "../../data/processed/phonology_neighbors.npz"))
 
 
 @dataclass
@@ -42,85 +36,128 @@ class PhonologyInfo:
 class PhonologyTool:
     def __init__(self, data_path: Optional[str] = None):
         self.data_path = data_path if data_path else DATA_FILE_PATH
-        self._index: Dict[str, Any] = {}
+        self._store = None  # 全部读音（含异读）的紧凑存储
+        self._neighbors = None  # 音近字表（PhoneticNeighbors 或 PhoneticSimilarity）
+        self._converter = None  # 繁简单字对照（CharConverter）
+        self._candidates: Dict[str, List[str]] = {}  # 简体 -> 收录的繁体候选（缓存）
         self._loaded = False
-        self.cc = OpenCC('s2t') if OpenCC else None
 
     def load(self) -> None:
-        """加载 JSON 数据"""
+        """加载音韵数据（二进制存储直接 mmap；JSON 则解析后转为存储）"""
         if self._loaded:
             return
         
+        from ..data.phonology_store import PhonologyStore, is_phonology_store
         print(f"[PhonologyTool] 正在加载数据: {self.data_path}")
         
         if os.path.exists(self.data_path):
             try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    self._index = json.load(f)
-                print(f"[PhonologyTool] ✅ 加载成功，共 {len(self._index)} 条数据。")
+                if is_phonology_store(self.data_path):
+                    self._store = PhonologyStore.open(self.data_path)
+                else:
+                    with open(self.data_path, 'r', encoding='utf-8') as f:
+                        self._store = PhonologyStore.from_unified(json.load(f))
+                print(f"[PhonologyTool] ✅ 加载成功，共 {len(self._store)} 条数据。")
                 self._loaded = True
             except Exception as e:
                 print(f"[PhonologyTool] ❌ 加载失败: {e}")
-                self._index = {}
+                self._store = PhonologyStore()
         else:
             print(f"[PhonologyTool] ⚠️ 文件不存在: {self.data_path}")
-            print("👉 请先让成员 E 运行数据处理脚本生成 json")
-            self._index = self._get_mock_data() # 兜底
+            print("👉 请先让成员 E 运行数据处理脚本生成数据")
+            self._store = PhonologyStore.from_unified(self._get_mock_data()) # 兜底
             self._loaded = True
 
-    def query(self, char: str) -> PhonologyInfo:
-        """查询单字 (含繁简转换)"""
+    def trad_candidates(self, char: str) -> List[str]:
+        """
+        索引用的繁体候选（一简多繁全部展开，如 干 -> 幹、乾、干），按 OpenCC 默认转换在前
+
+        只保留音韵存储收录的字；都未收录时为 [默认转换]。结果按字缓存。
+        """
+        cached = self._candidates.get(char)
+        if cached is not None:
+            return cached
         if not self._loaded:
             self.load()
+        if self._converter is None:
+            from ..data.char_convert import CharConverter, get_converter
+            # 音韵文件自带对照表时直接用；JSON 或兜底数据没有对照表，用共享转换器
+            self._converter = CharConverter.from_store(self._store)
+            if not len(self._converter):
+                self._converter = get_converter()
+        # 原字兜底：查不到繁体查简体
+        candidates = list(dict.fromkeys(self._converter.candidates(char, "s2t") + [char]))
+        found = [c for c in candidates if c in self._store]
+        cached = self._candidates[char] = found or candidates[:1]
+        return cached
 
-        # 1. 繁简转换
-        if self.cc:
-            char_trad = self.cc.convert(char)
-        else:
-            char_trad = char
-            
-        # 2. 查询
-        data = self._index.get(char_trad)
-        
-        # 兜底：查不到繁体查简体
-        if not data:
-            data = self._index.get(char)
-            if data:
-                char_trad = char
-
-        if data:
-            # 解析嵌套结构 (适配成员 E 的数据格式)
-            pan = data.get("潘悟云", {})
-            bs = data.get("白一平沙加尔", {})
-            
-            return PhonologyInfo(
-                char=char,
-                char_trad=char_trad,
-                shengmu=pan.get("声母", "未知"),
-                yunbu=pan.get("韵部", "未知"),
-                pan_reconstruction=pan.get("上古音", "未知"),
-                bs_reconstruction=bs.get("上古音", "未知")
-            )
-        else:
-            return PhonologyInfo(
+    def query_candidates(self, char: str) -> List[PhonologyInfo]:
+        """查询单字的全部繁体候选（一次批量查音韵存储），每个候选一条，默认转换在前"""
+        if not self._loaded:
+            self.load()
+
+        candidates = self.trad_candidates(char)
+        found = self._store.readings_many(candidates)
+        if not found:
+            return [PhonologyInfo(
                 char=char,
-                char_trad=char_trad,
+                char_trad=candidates[0],
                 shengmu="未收录",
                 yunbu="未收录",
                 pan_reconstruction="未收录",
                 bs_reconstruction="未收录"
-            )
+            )]
+
+        infos = []
+        for char_trad, readings in found.items():
+            # 各数据源取正读（第一个读音）
+            pan = [r for r in readings if r.source == "潘悟云"]
+            bs = [r for r in readings if r.source == "白一平沙加尔"]
+            infos.append(PhonologyInfo(
+                char=char,
+                char_trad=char_trad,
+                shengmu=pan[0].shengmu if pan else "未知",
+                yunbu=pan[0].yunbu if pan else "未知",
+                pan_reconstruction=pan[0].recon if pan else "未知",
+                bs_reconstruction=bs[0].recon if bs else "未知"
+            ))
+        return infos
+
+    def query(self, char: str) -> PhonologyInfo:
+        """查询单字 (含繁简转换)；一简多繁时取第一个收录的候选，全部候选见 query_candidates()"""
+        return self.query_candidates(char)[0]
 
     def is_phonetically_close(self, char1: str, char2: str) -> Dict[str, Any]:
         """
         判断音近逻辑 - 最终精简版
         逻辑标准：
         1. 【金标准】韵部相同 (叠韵) -> 直接判定 True
-        2. 【银标准】拟音相似度 > 0.75 (发音极像) -> 判定 True
-        3. 其他情况 -> False
+        2. 【银标准】拟音相似度 >= 0.85 (特征编辑距离，发音极像) -> 判定 True
+        3. 【谐声】同属一个 GSR 声系 (同声必同部) -> 判定 True
+        4. 其他情况 -> False
+
+        一简多繁（如 干 -> 幹/乾/干）：两字的繁体候选两两判定，取最好的一对
+        （音近优先，其次叠韵、同谐声、读音得分）；"candidates" 给出两字参与比较的全部候选。
         """
-        p1 = self.query(char1)
-        p2 = self.query(char2)
+        candidates1 = self.query_candidates(char1)
+        candidates2 = self.query_candidates(char2)
+        best, best_rank = None, None
+        for p1 in candidates1:
+            for p2 in candidates2:
+                result = self._judge(char1, char2, p1, p2)
+                scores = [pair["score"] for pair in result.get("best_pair", {}).values()]
+                rank = (result["is_close"], result.get("same_yunbu", False),
+                        result.get("same_series", False), max(scores, default=0.0))
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = result, rank
+        best["candidates"] = {"char1": [p.char_trad for p in candidates1],
+                              "char2": [p.char_trad for p in candidates2]}
+        return best
+
+    def _judge(self, char1: str, char2: str, p1: PhonologyInfo, p2: PhonologyInfo) -> Dict[str, Any]:
+        """对一对繁体候选做音近判定（is_phonetically_close 的核心逻辑）"""
+        # 多音字：各数据源内取两字最匹配的一对读音参与判定
+        p1, p2, best_pair = self._apply_best_readings(p1, p2)
 
         # 1. 检查数据缺失
         if p1.yunbu == "未收录" or p2.yunbu == "未收录":
@@ -145,15 +182,24 @@ class PhonologyTool:
         
         # 判定 2: 拟音相似度 (兜底逻辑)
         # 即使韵部不同，如果发音高度相似 (比如同部位旁转)，也算音近
-        recon1 = self._clean_ipa(p1.bs_reconstruction if p1.bs_reconstruction != "未知" else p1.pan_reconstruction)
-        recon2 = self._clean_ipa(p2.bs_reconstruction if p2.bs_reconstruction != "未知" else p2.pan_reconstruction)
+        from ..data.phonemes import RECON_SIMILARITY_THRESHOLD
+        raw1 = p1.bs_reconstruction if p1.bs_reconstruction != "未知" else p1.pan_reconstruction
+        raw2 = p2.bs_reconstruction if p2.bs_reconstruction != "未知" else p2.pan_reconstruction
+        recon1, recon2 = self._clean_ipa(raw1), self._clean_ipa(raw2)
         
-        sim_score = self._calculate_similarity(recon1, recon2)
+        sim_score = self._calculate_similarity(raw1, raw2)
         
-        if not is_close and sim_score >= 0.75: # 相似度门槛
+        if not is_close and sim_score >= RECON_SIMILARITY_THRESHOLD: # 相似度门槛
             is_close = True
             reasons.append(f"✅ 【音极近】(拟音相似度{int(sim_score*100)}%)")
         
+        # 判定 3: 同谐声 - 声系索引中直接查两字的声系号
+        series = self._store.same_series(p1.char_trad, p2.char_trad)
+        same_series = series is not None
+        if same_series:
+            is_close = True
+            reasons.append(f"✅ 【同谐声】(同属GSR {series:04d} 声系)")
+        
         # 辅助信息：双声 (仅作为补充描述，不单独作为True的依据，除非结合拟音相似)
         same_shengmu = (p1.shengmu == p2.shengmu) and (p1.shengmu != "未知")
         if same_shengmu:
@@ -171,11 +217,60 @@ class PhonologyTool:
             "is_close": is_close,  # 最终结论：True / False
             "same_yunbu": same_yunbu,
             "same_shengmu": same_shengmu,
+            "same_series": same_series,
+            "series": series,
             "char1_info": self._format_info(p1),
             "char2_info": self._format_info(p2),
+            "best_pair": best_pair,
             "analysis": analysis_str
         }
 
+    def series_mates(self, char: str) -> Dict[int, List[str]]:
+        """同谐声字：{GSR声系号: [同声系的字, ...]}（不含本字；未收录或无 GSR 编号时为空）"""
+        info = self.query(char)
+        return self._store.series_mates(info.char_trad)
+
+    def similar_chars(self, char: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        音近字候选（为借字找本字用）
+
+        优先查预计算的音近字表，没有时按潘悟云读音现算一行；返回 [{"字", "得分"}]，得分降序
+        """
+        if not self._loaded:
+            self.load()
+        char_trad = self.trad_candidates(char)[0]
+
+        if self._neighbors is None:
+            from ..data.phonetic_similarity import PhoneticNeighbors, PhoneticSimilarity
+            if os.path.exists(NEIGHBORS_FILE_PATH) and self.data_path == DATA_FILE_PATH:
+                self._neighbors = PhoneticNeighbors.load(NEIGHBORS_FILE_PATH)
+            else:
+                self._neighbors = PhoneticSimilarity(self._store)
+
+        return [{"字": c, "得分": round(score, 3)} for c, score in self._neighbors.neighbors(char_trad, k)]
+
+    def _apply_best_readings(self, p1: PhonologyInfo, p2: PhonologyInfo):
+        """
+        用两字得分最高的一对读音替换 query() 给出的正读
+        
+        潘悟云（声母、韵部、拟音）与白一平-沙加尔（拟音）分别选取；
+        返回替换后的 p1、p2 以及 {数据源: {"char1": 拟音, "char2": 拟音, "score": 得分}}
+        """
+        chosen = {}
+        pan = self._store.best_pair(p1.char_trad, p2.char_trad, source="潘悟云")
+        if pan:
+            p1 = replace(p1, shengmu=pan.a.shengmu or "未知", yunbu=pan.a.yunbu or "未知",
+                         pan_reconstruction=pan.a.recon or "未知")
+            p2 = replace(p2, shengmu=pan.b.shengmu or "未知", yunbu=pan.b.yunbu or "未知",
+                         pan_reconstruction=pan.b.recon or "未知")
+            chosen["潘悟云"] = {"char1": pan.a.recon, "char2": pan.b.recon, "score": round(pan.score, 3)}
+        bs = self._store.best_pair(p1.char_trad, p2.char_trad, source="白一平沙加尔")
+        if bs:
+            p1 = replace(p1, bs_reconstruction=bs.a.recon or "未知")
+            p2 = replace(p2, bs_reconstruction=bs.b.recon or "未知")
+            chosen["白一平沙加尔"] = {"char1": bs.a.recon, "char2": bs.b.recon, "score": round(bs.score, 3)}
+        return p1, p2, chosen
+
     # === 判断音近的两个辅助小函数 ===
     def _clean_ipa(self, ipa: str) -> str:
         """清洗拟音，只保留核心字母，去掉符号干扰"""
@@ -185,11 +280,10 @@ class PhonologyTool:
         return re.sub(r'[\*\[\]\(\)\<\>\-\s]', '', ipa)
 
     def _calculate_similarity(self, s1: str, s2: str) -> float:
-        """计算字符串相似度 (0~1)"""
-        if not s1 or not s2: return 0.0
-        if s1 == s2: return 1.0
-        import difflib
-        return difflib.SequenceMatcher(None, s1, s2).ratio()
+        """计算拟音相似度 (0~1)：按音段发音特征的编辑距离，*dzruŋ vs *tuŋ 约 0.81"""
+        if not s1 or not s2 or "未知" in (s1, s2): return 0.0
+        from ..data.phonemes import recon_similarity
+        return recon_similarity(s1, s2)
     # ==============================
 
     def _get_best_recon(self, p: PhonologyInfo):
@@ -261,6 +355,14 @@ def check_phonetic_relation(char1: str, char2: str) -> Dict[str, Any]:
     tool = _get_tool()
     return tool.is_phonetically_close(char1, char2)
 
+def find_series_mates(char: str) -> Dict[int, List[str]]:
+    tool = _get_tool()
+    return tool.series_mates(char)
+
+def find_similar_chars(char: str, k: int = 10) -> List[Dict[str, Any]]:
+    tool = _get_tool()
+    return tool.similar_chars(char, k)
+
 
 # ===== 测试代码 =====
 if __name__ == "__main__":
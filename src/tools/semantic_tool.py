@@ -24,7 +24,8 @@ class SemanticTool:
     """
     语义查询工具类
     
-    使用DYHDCIndexLoader查询《汉语大词典》
+    使用DYHDCIndexLoader查询《汉语大词典》；加载器与词条缓存由 get_shared_loader 提供，
+    与 TextualTool 共用，同一个字在一次分析中只读盘、格式化一次
     
     使用方法：
         tool = SemanticTool()
@@ -50,7 +51,7 @@ class SemanticTool:
             jsonl_path = str(settings.dyhdc_path)
         
         if index_path is None:
-            index_path = str(settings.data_processed_dir / "dyhdc_index.json")
+            index_path = str(settings.dyhdc_index_path)
         
         self.jsonl_path = jsonl_path
         self.index_path = index_path
@@ -61,15 +62,16 @@ class SemanticTool:
         """
         加载字典索引
         
-        首次调用时会加载索引（约1秒）
+        首次调用时会mmap二进制索引，与词条数无关；
+        若JSONL在建索引后被修改（大小或修改时间变化），会自动增量重建索引
         
         注意：如果索引文件不存在，会提示用户先构建索引
         """
         if self._loaded:
             return
         
-        from ..data.dyhdc_index_builder import DYHDCIndexLoader
-        from pathlib import Path
+        from ..data.dyhdc_index_builder import get_shared_loader
+        from ..config import get_settings
         
         # 检查索引文件是否存在
         index_path_obj = Path(self.index_path)
@@ -81,7 +83,11 @@ class SemanticTool:
                 f"或运行: python check_and_build_index.py"
             )
         
-        self._loader = DYHDCIndexLoader(self.jsonl_path, self.index_path)
+        # 与其他工具共用同一个加载器和词条缓存
+        self._loader = get_shared_loader(
+            self.jsonl_path, self.index_path,
+            cache_bytes=get_settings().dyhdc_cache_mb * 1024 * 1024,
+        )
         if not self._loader.load_index():
             raise RuntimeError(
                 f"索引加载失败。请检查：\n"
@@ -89,6 +95,8 @@ class SemanticTool:
                 f"  2. JSONL文件是否存在: {self.jsonl_path}\n"
                 f"  3. 索引文件格式是否正确"
             )
+        # JSONL更新后旧偏移量会读出错误词条，检测到过期时先增量重建
+        self._loader.refresh_if_stale()
         self._loaded = True
     
     def query(self, char: str) -> WordMeaning:
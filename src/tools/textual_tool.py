@@ -3,9 +3,11 @@
 
 功能：检索文献中是否存在异文、平行文本等佐证
 数据源：《汉语大词典》例句、假借标注
+（若已构建 data/processed/dyhdc.db，则在释义与例证上做FTS5全文检索）
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
+from pathlib import Path
 import re
 
 
@@ -23,7 +25,9 @@ class TextualTool:
     """
     文献检索工具类
     
-    从《汉语大词典》提取假借标注和例句作为佐证
+    从《汉语大词典》提取假借标注和例句作为佐证。
+    SQLite数据库存在时优先使用全文检索：假借标注在被释字/释字的义项中检索，
+    上下文在全书例证引文中检索（其他词条下引用同一文句的即为平行文本）。
     
     使用方法：
         tool = TextualTool()
@@ -31,15 +35,25 @@ class TextualTool:
         print(result.has_evidence)  # True
     """
     
-    def __init__(self, jsonl_path: Optional[str] = None, index_path: Optional[str] = None):
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        index_path: Optional[str] = None,
+        db_path: Optional[str] = None,
+        quote_index_path: Optional[str] = None,
+        jiajie_index_path: Optional[str] = None,
+    ):
         """
         初始化工具
         
         Args:
             jsonl_path: 词典JSONL文件路径
             index_path: 索引文件路径
+            db_path: SQLite数据库路径（build_sqlite_db 生成；不存在时退回偏移量索引）
+            quote_index_path: 例证引文倒排索引路径（build_quote_index 生成）
+            jiajie_index_path: 假借关系索引路径（build_jiajie_index 生成）
         """
-        from ..data.dyhdc_index_builder import DYHDCIndexLoader
+        from ..data.dyhdc_index_builder import DYHDCIndexLoader, DYHDCSQLiteLoader
         from ..config import get_settings
         
         settings = get_settings()
@@ -49,24 +63,53 @@ class TextualTool:
             jsonl_path = str(settings.dyhdc_path)
         
         if index_path is None:
-            index_path = str(settings.data_processed_dir / "dyhdc_index.json")
+            index_path = str(settings.dyhdc_index_path)
+        
+        if db_path is None:
+            db_path = str(settings.dyhdc_db_path)
+        
+        if quote_index_path is None:
+            quote_index_path = str(settings.dyhdc_quote_index_path)
+        
+        if jiajie_index_path is None:
+            jiajie_index_path = str(settings.dyhdc_jiajie_index_path)
         
         self.jsonl_path = jsonl_path
         self.index_path = index_path
+        self.db_path = db_path
+        self.quote_index_path = quote_index_path
+        self._quote_index = None
+        self.jiajie_index_path = jiajie_index_path
+        self._jiajie_index = None
         self._loader: Optional[DYHDCIndexLoader] = None
+        self._db: Optional[DYHDCSQLiteLoader] = None
         self._loaded = False
     
     def load(self) -> None:
         """
         加载词典索引
         
+        SQLite数据库存在时直接使用数据库，不再加载偏移量索引；
+        假借关系索引存在时一并打开。
+        
         注意：如果索引文件不存在，会提示用户先构建索引
         """
         if self._loaded:
             return
         
-        from ..data.dyhdc_index_builder import DYHDCIndexLoader
-        from pathlib import Path
+        from ..data.dyhdc_index_builder import DYHDCSQLiteLoader, get_shared_loader
+        from ..data.jiajie_index import JiajieIndex
+        from ..config import get_settings
+        
+        if Path(self.jiajie_index_path).exists():
+            self._jiajie_index = JiajieIndex(self.jiajie_index_path)
+        
+        if Path(self.db_path).exists():
+            self._db = DYHDCSQLiteLoader(self.db_path)
+            if self._db.connect():
+                self._loaded = True
+                return
+            self._db = None
         
         # 检查索引文件是否存在
         index_path_obj = Path(self.index_path)
@@ -78,7 +121,11 @@ class TextualTool:
                 f"或运行: python check_and_build_index.py"
             )
         
-        self._loader = DYHDCIndexLoader(self.jsonl_path, self.index_path)
+        # 与其他工具共用同一个加载器和词条缓存
+        self._loader = get_shared_loader(
+            self.jsonl_path, self.index_path,
+            cache_bytes=get_settings().dyhdc_cache_mb * 1024 * 1024,
+        )
         if not self._loader.load_index():
             raise RuntimeError(
                 f"索引加载失败。请检查：\n"
@@ -86,6 +133,8 @@ class TextualTool:
                 f"  2. JSONL文件是否存在: {self.jsonl_path}\n"
                 f"  3. 索引文件格式是否正确"
             )
+        # JSONL更新后旧偏移量会读出错误词条，检测到过期时先增量重建
+        self._loader.refresh_if_stale()
         self._loaded = True
     
     def search(
@@ -110,7 +159,7 @@ class TextualTool:
         if not self._loaded:
             self.load()
         
-        if self._loader is None:
+        if self._loader is None and self._db is None:
             return TextualEvidence(
                 has_evidence=False,
                 variant_texts=[],
@@ -119,6 +168,111 @@ class TextualTool:
                 summary="词典未加载"
             )
         
+        if self._jiajie_index is not None:
+            # 假借关系索引按字对直接查表，包括只在第三方条目中写明的关系；
+            # 词条本身只在需要按上下文找异文时才读取
+            jiajie_records = self._lookup_jiajie(char_a, char_b)
+            variant_texts, parallel_texts = [], []
+            if context:
+                variant_texts, parallel_texts, _ = self._search_backend(char_a, char_b, context)
+        else:
+            variant_texts, parallel_texts, jiajie_records = self._search_backend(char_a, char_b, context)
+        
+        # 引文倒排索引可用时，在全书例证中查找 char_a 处作 char_b 的异文
+        if context and Path(self.quote_index_path).exists():
+            seen = {item["text"] for item in variant_texts}
+            for hit in self.search_corpus(context, char_a, char_b, limit=5):
+                if hit["text"] not in seen:
+                    variant_texts.append({
+                        "type": "variant",
+                        "source": hit["source"] or "《汉语大词典》例句",
+                        "text": hit["text"],
+                        "note": f"异文：{char_a}作{char_b}（见词条“{hit['headword']}”）"
+                    })
+        
+        has_evidence = len(variant_texts) > 0 or len(jiajie_records) > 0 or len(parallel_texts) > 0
+        
+        # 生成总结
+        summary_parts = []
+        if variant_texts:
+            summary_parts.append(f"找到{len(variant_texts)}处异文")
+        if parallel_texts:
+            summary_parts.append(f"找到{len(parallel_texts)}处平行文本")
+        if jiajie_records:
+            summary_parts.append(f"找到{len(jiajie_records)}处假借记录")
+        if not summary_parts:
+            summary_parts.append("未找到相关佐证")
+        
+        return TextualEvidence(
+            has_evidence=has_evidence,
+            variant_texts=variant_texts,
+            parallel_texts=parallel_texts,
+            jiajie_records=jiajie_records,
+            summary="；".join(summary_parts)
+        )
+    
+    def search_corpus(
+        self,
+        context: str,
+        char_a: str,
+        char_b: str,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        在全书例证引文中检索异文：上下文里 char_a 所在位置写作 char_b 的文句
+        
+        Args:
+            context: 上下文，如"崇朝其雨"
+            char_a: 被释字
+            char_b: 释字
+            limit: 最多返回条数
+            
+        Returns:
+            [{"headword": "词头", "source": "出处", "text": "引文", "score": 命中比例}, ...]，按相似度降序
+        """
+        if self._quote_index is None:
+            from ..data.quote_index import QuoteIndex
+            
+            if not Path(self.quote_index_path).exists():
+                raise FileNotFoundError(
+                    f"引文索引不存在: {self.quote_index_path}\n"
+                    f"请先运行以下命令构建索引：\n"
+                    f"  python -c \"from src.data.quote_index import build_quote_index; build_quote_index()\""
+                )
+            self._quote_index = QuoteIndex(self.quote_index_path)
+        
+        return self._quote_index.search_variants(context, char_a, char_b, limit=limit)
+    
+    def _search_backend(
+        self,
+        char_a: str,
+        char_b: str,
+        context: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], List[Dict[str, str]]]:
+        """在SQLite数据库或偏移量索引上检索（返回 异文, 平行文本, 假借记录）"""
+        if self._db is not None:
+            return self._search_fulltext(char_a, char_b, context)
+        return self._search_index(char_a, char_b, context)
+    
+    def _lookup_jiajie(self, char_a: str, char_b: str) -> List[Dict[str, str]]:
+        """从假借关系索引中取两字之间的关系记录"""
+        records = []
+        for relation in self._jiajie_index.lookup(char_a, char_b):
+            records.append({
+                "type": "jiajie",
+                "source": relation["source"] or "《汉语大词典》",
+                "text": relation["text"],
+                "note": f"词典中标注：{relation['借字']}{relation['关系']}{relation['本字']}（见词条“{relation['词条']}”）"
+            })
+        return records
+    
+    def _search_index(
+        self,
+        char_a: str,
+        char_b: str,
+        context: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], List[Dict[str, str]]]:
+        """基于偏移量索引：在两字的格式化条目中逐条查找（返回 异文, 平行文本, 假借记录）"""
         variant_texts = []
         parallel_texts = []
         jiajie_records = []
@@ -185,26 +339,61 @@ class TextualTool:
                             "note": f"义项中标注假借关系"
                         })
         
-        has_evidence = len(variant_texts) > 0 or len(jiajie_records) > 0
+        return variant_texts, parallel_texts, jiajie_records
+    
+    def _search_fulltext(
+        self,
+        char_a: str,
+        char_b: str,
+        context: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], List[Dict[str, str]]]:
+        """基于SQLite全文检索（返回 异文, 平行文本, 假借记录）"""
+        from ..data.dyhdc_index_builder import JIAJIE_TERMS
         
-        # 生成总结
-        summary_parts = []
-        if variant_texts:
-            summary_parts.append(f"找到{len(variant_texts)}处异文")
-        if parallel_texts:
-            summary_parts.append(f"找到{len(parallel_texts)}处平行文本")
-        if jiajie_records:
-            summary_parts.append(f"找到{len(jiajie_records)}处假借记录")
-        if not summary_parts:
-            summary_parts.append("未找到相关佐证")
+        variant_texts = []
+        parallel_texts = []
+        jiajie_records = []
         
-        return TextualEvidence(
-            has_evidence=has_evidence,
-            variant_texts=variant_texts,
-            parallel_texts=parallel_texts,
-            jiajie_records=jiajie_records,
-            summary="；".join(summary_parts)
-        )
+        # 被释字义项中提到释字的假借标注，及反向
+        for headword, other in ((char_a, char_b), (char_b, char_a)):
+            for row in self._db.search_senses(other, headword=headword):
+                mean = row["mean"]
+                if any(term in mean for term in JIAJIE_TERMS):
+                    jiajie_records.append({
+                        "type": "jiajie",
+                        "source": self._extract_source(mean) or "《汉语大词典》",
+                        "text": mean,
+                        "note": f"词典中标注：{headword}与{other}的假借关系"
+                    })
+        
+        if context:
+            # 被释字例证中出现释字或上下文的，视为异文线索
+            seen = set()
+            for query in (context, char_b):
+                for row in self._db.search_examples(query, headword=char_a, limit=5):
+                    text = row["text"] or row["quotes"] or ""
+                    if text in seen:
+                        continue
+                    seen.add(text)
+                    variant_texts.append({
+                        "type": "variant",
+                        "source": row["books"] or "《汉语大词典》例句",
+                        "text": text[:200],
+                        "note": "例句中包含相关用字"
+                    })
+            
+            # 全书例证中引用同一文句的其他词条
+            for row in self._db.search_examples(context, limit=10):
+                if row["headword"] == char_a:
+                    continue
+                parallel_texts.append({
+                    "type": "parallel",
+                    "source": row["books"] or "《汉语大词典》例句",
+                    "text": (row["text"] or row["quotes"] or "")[:200],
+                    "note": f"见于词条“{row['headword']}”：{row['mean'][:50]}"
+                })
+        
+        return variant_texts, parallel_texts, jiajie_records
     
     def _extract_source(self, text: str) -> str:
         """从文本中提取出处信息"""
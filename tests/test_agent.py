@@ -75,6 +75,39 @@ class TestXunguAgent:
         parsed = json.loads(j)
         assert "classification" in parsed
 
+    def test_analyze_rule_path(self, agent):
+        """测试规则快速判定（不调用LLM）"""
+        result = agent.analyze("正，读为征")
+        assert result.path == "rule"
+        assert result.to_dict()["path"] == "rule"
+
+
+class TestRuleClassifier:
+    """测试规则快速判定"""
+    
+    @pytest.fixture
+    def classifier(self, tmp_path):
+        from src.agent import RuleClassifier
+        return RuleClassifier(jiajie_index_path=str(tmp_path / "missing.bin"))
+    
+    def test_direct_jiajie(self, classifier):
+        decision = classifier.classify("正，读为征")
+        assert decision.classification == "假借说明" and decision.accepted
+        assert decision.pattern["格式"] == "读为"
+    
+    def test_threshold(self, tmp_path):
+        from src.agent import FastPathConfig, RuleClassifier
+        path = str(tmp_path / "missing.bin")
+        decision = RuleClassifier(jiajie_index_path=path).classify("硕，大貌")
+        assert decision.classification == "语义解释" and not decision.accepted
+        relaxed = RuleClassifier(FastPathConfig(min_confidence=0.8), jiajie_index_path=path)
+        assert relaxed.classify("硕，大貌").accepted
+    
+    def test_undecided(self, classifier):
+        # 不确定格式且无词典假借记录：交给LLM
+        assert classifier.classify("崇，终也") is None
+        assert classifier.classify("无训释术语") is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,745 @@
+"""
+数据工程模块测试
+
+运行方法：
+    pytest tests/test_data.py -v
+"""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from src.data import DYHDCIndexBuilder, DYHDCIndexLoader, DYHDCSQLiteLoader
+from src.data.binary_index import BinaryIndex, is_binary_index
+
+
+SAMPLE_ENTRIES = [
+    {"headword": "#name", "html": "汉语大词典"},
+    {"headword": "崇朝", "hw": "崇朝", "pron": "chóng zhāo",
+     "senses": [{"mean": "终朝。从天亮到早饭时。", "examples": [
+         {"books": ["《诗·鄘风·蝃蝀》"], "quotes": ["崇朝其雨。"], "text": "《诗·鄘风·蝃蝀》：崇朝其雨。"}]}]},
+    {"headword": "崇", "hw": "崇", "pron": "chóng",
+     "senses": [{"mean": "高；高大。", "examples": []},
+                {"mean": "通“終”。终尽。", "examples": [
+                    {"books": ["《诗·卫风·河广》"], "quotes": ["誰謂宋遠，曾不崇朝。"], "text": "《诗·卫风·河广》：誰謂宋遠，曾不崇朝。"}]}]},
+    {"headword": "終", "hw": "終", "simp": "终", "pron": "zhōng",
+     "senses": [{"mean": "终了；结束。", "examples": []}]},
+    {"headword": "海", "hw": "海", "pron": "hǎi",
+     "senses": [{"mean": "大洋靠近陆地的部分。", "examples": []}]},
+    {"headword": "崇山", "hw": "崇山", "senses": [{"mean": "高山。"}]},
+]
+
+
+@pytest.fixture
+def sample_jsonl(tmp_path):
+    path = tmp_path / "dyhdc.sample.jsonl"
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for entry in SAMPLE_ENTRIES:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return path
+
+
+@pytest.fixture
+def binary_index(sample_jsonl, tmp_path):
+    index_path = tmp_path / "dyhdc_index.bin"
+    DYHDCIndexBuilder(str(sample_jsonl)).build_index(str(index_path))
+    return index_path
+
+
+class TestBinaryIndex:
+    """测试二进制偏移量索引"""
+
+    def test_format_and_lookup(self, binary_index):
+        assert is_binary_index(binary_index)
+        with BinaryIndex(binary_index) as index:
+            assert len(index) == 5
+            assert [index.key(i) for i in index.prefix_range("崇")] == ["崇", "崇山", "崇朝"]
+            assert [index.key(i) for i in index.find("崇")] == ["崇"]
+            assert len(index.find("龘")) == 0
+            assert index.meta["stats"]["total_entries"] == 5
+
+    def test_loader_matches_json_index(self, sample_jsonl, binary_index, tmp_path):
+        json_path = tmp_path / "dyhdc_index.json"
+        DYHDCIndexBuilder(str(sample_jsonl)).build_index(str(json_path))
+
+        binary_loader = DYHDCIndexLoader(str(sample_jsonl), str(binary_index))
+        json_loader = DYHDCIndexLoader(str(sample_jsonl), str(json_path))
+        for char in ["崇", "終", "海", "龘"]:
+            assert binary_loader.query_single_char(char) == json_loader.query_single_char(char)
+
+        result = binary_loader.query_single_char("崇")
+        assert result["本义"] == "高；高大。"
+        assert result["假借标注"] == ["通“終”。终尽。"]
+
+    def test_loader_lifecycle_and_threads(self, sample_jsonl, binary_index):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with DYHDCIndexLoader(str(sample_jsonl), str(binary_index)) as loader:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(loader.query_single_char, ["崇", "終", "海"] * 20))
+            assert [r["字"] for r in results[:3]] == ["崇", "終", "海"]
+            assert loader._fd is not None
+        assert loader._fd is None
+
+    def test_exact_and_prefix_queries(self, sample_jsonl, binary_index):
+        with BinaryIndex(binary_index) as index:
+            assert [index.key(i) for i in index.find_char("崇")] == ["崇"]
+            assert len(index.find_char("龘")) == 0
+
+        with DYHDCIndexLoader(str(sample_jsonl), str(binary_index)) as loader:
+            assert [e["headword"] for e in loader.query("崇")] == ["崇"]
+            assert [e["headword"] for e in loader.query_prefix("崇")] == ["崇", "崇山", "崇朝"]
+            assert [e["headword"] for e in loader.query_prefix("崇朝")] == ["崇朝"]
+            assert len(loader.query_prefix("崇", limit=2)) == 2
+
+    def test_parallel_build_matches_serial(self, sample_jsonl):
+        with open(sample_jsonl, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"headword": "引\"号", "hw": "引号"}, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"hw": "甲", "headword": None}, ensure_ascii=False) + "\n")
+
+        serial = DYHDCIndexBuilder(str(sample_jsonl))
+        serial.build_index(workers=1)
+        parallel = DYHDCIndexBuilder(str(sample_jsonl))
+        parallel.build_index(workers=2, chunk_size=256)
+
+        assert parallel.index == serial.index
+        assert parallel.exact == serial.exact
+        assert serial.index["引"][0]["headword"] == "引\"号"
+        assert "甲" in serial.exact
+
+    def test_incremental_rebuild_matches_full(self, sample_jsonl, tmp_path, capsys):
+        paths = [tmp_path / "dyhdc_index.bin", tmp_path / "dyhdc_index.json"]
+        for path in paths:
+            DYHDCIndexBuilder(str(sample_jsonl)).build_index(str(path), workers=1, chunk_size=128)
+        loader = DYHDCIndexLoader(str(sample_jsonl), str(paths[0]))
+        assert loader.fingerprint["size"] == sample_jsonl.stat().st_size
+        assert not loader.is_stale()
+
+        # 改写文件尾部并追加一行：前面的区间不变，只有尾部（变长后切成两个）的区间需要重新扫描
+        lines = sample_jsonl.read_text(encoding="utf-8").splitlines(keepends=True)
+        lines[-1] = json.dumps({"headword": "海岸", "hw": "海岸"}, ensure_ascii=False) + "\n"
+        lines.append(json.dumps({"headword": "崖", "hw": "崖"}, ensure_ascii=False) + "\n")
+        sample_jsonl.write_text("".join(lines), encoding="utf-8")
+        assert loader.is_stale()
+
+        full = DYHDCIndexBuilder(str(sample_jsonl))
+        full.build_index(workers=1, chunk_size=128)
+        for path in paths:
+            capsys.readouterr()
+            incremental = DYHDCIndexBuilder(str(sample_jsonl))
+            incremental.build_index(str(path), workers=1, chunk_size=128, incremental=True)
+            assert "复用 2/4 个区间，重新扫描 2 个" in capsys.readouterr().out
+            assert incremental.index == full.index
+            assert incremental.exact == full.exact
+            assert incremental.fingerprint == full.fingerprint
+
+        # 加载器发现过期后自动重建
+        sample_jsonl.write_text("".join(lines[:-1]), encoding="utf-8")
+        assert loader.refresh_if_stale()
+        assert not loader.is_stale()
+        assert [e["headword"] for e in loader.query_prefix("海")] == ["海", "海岸"]
+        assert loader.query("崖") == []
+        loader.close()
+
+    def test_incremental_rebuild_after_insert_near_start(self, tmp_path, capsys):
+        path = tmp_path / "dyhdc.large.jsonl"
+        lines = [json.dumps({"headword": f"字{i}", "hw": f"字{i}"}, ensure_ascii=False) + "\n"
+                 for i in range(3000)]
+        path.write_text("".join(lines), encoding="utf-8")
+        index_path = tmp_path / "dyhdc_index.bin"
+        DYHDCIndexBuilder(str(path)).build_index(str(index_path), workers=1, chunk_size=2048)
+
+        # 在文件开头插入一行：边界随内容平移，后面的区间都应被复用
+        lines.insert(3, json.dumps({"headword": "插入", "hw": "插入"}, ensure_ascii=False) + "\n")
+        path.write_text("".join(lines), encoding="utf-8")
+
+        full = DYHDCIndexBuilder(str(path))
+        full.build_index(workers=1, chunk_size=2048)
+        capsys.readouterr()
+        incremental = DYHDCIndexBuilder(str(path))
+        incremental.build_index(str(index_path), workers=1, chunk_size=2048, incremental=True)
+        reused, total, rescanned = map(int, re.search(
+            r"复用 (\d+)/(\d+) 个区间，重新扫描 (\d+) 个", capsys.readouterr().out).groups())
+        assert total > 10
+        assert rescanned <= 2 and reused == total - rescanned
+        assert incremental.index == full.index
+        assert incremental.exact == full.exact
+        assert incremental.fingerprint == full.fingerprint
+
+
+class TestSQLiteBackend:
+    """测试规范化SQLite数据库与FTS5全文检索"""
+
+    @pytest.fixture
+    def sqlite_db(self, sample_jsonl, tmp_path):
+        db_path = tmp_path / "dyhdc.db"
+        DYHDCIndexBuilder(str(sample_jsonl)).build_sqlite_db(str(db_path))
+        return db_path
+
+    def test_query_matches_index_loader(self, sample_jsonl, binary_index, sqlite_db):
+        index_loader = DYHDCIndexLoader(str(sample_jsonl), str(binary_index))
+        with DYHDCSQLiteLoader(str(sqlite_db)) as db:
+            for char in ["崇", "終", "海"]:
+                assert db.query(char) == index_loader.query_single_char(char)
+            assert db.query("终")["字"] == "終"  # 按简体词头回退
+            assert db.query("龘") is None
+            counts = {t: db.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                      for t in ("entries", "senses", "examples")}
+            assert counts == {"entries": 5, "senses": 6, "examples": 2}
+        index_loader.close()
+
+    def test_fulltext_search(self, sqlite_db):
+        with DYHDCSQLiteLoader(str(sqlite_db)) as db:
+            assert [r["mean"] for r in db.search_senses("終", headword="崇")] == ["通“終”。终尽。"]
+            assert [r["headword"] for r in db.search_senses("高")] == ["崇", "崇山"]
+            assert [r["headword"] for r in db.search_examples("崇朝")] == ["崇朝", "崇"]
+            assert db.search_examples("朝崇") == []
+            assert db.search_examples("") == []
+
+    def test_headword_search_uses_headword_index(self, sqlite_db):
+        with DYHDCSQLiteLoader(str(sqlite_db)) as db:
+            assert [r["quotes"] for r in db.search_examples("曾不崇朝", headword="崇")] == ["誰謂宋遠，曾不崇朝。"]
+            assert db.search_examples("崇朝其雨", headword="崇") == []
+            assert db.search_senses("高", headword="海") == []
+            # 限定词头时不扫描FTS倒排表
+            for table, column in (("senses", "mean"), ("examples", "quotes")):
+                plan = " ".join(row[-1] for row in db.conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT 1 FROM entries e CROSS JOIN {table} t ON t.entry_id = e.id "
+                    f"WHERE e.headword = ? AND instr(t.{column}, ?) > 0", ("崇", "終")))
+                assert "idx_entries_headword" in plan and "_fts" not in plan
+
+    def test_textual_tool_uses_database(self, sample_jsonl, sqlite_db, tmp_path):
+        from src.tools.textual_tool import TextualTool
+
+        tool = TextualTool(str(sample_jsonl), str(tmp_path / "missing.bin"), str(sqlite_db))
+        result = tool.search("崇", "終", context="曾不崇朝")
+        assert [r["text"] for r in result.jiajie_records] == ["通“終”。终尽。"]
+        assert len(result.variant_texts) == 1
+        assert result.parallel_texts == []
+        assert result.has_evidence
+
+        result = tool.search("海", "晦", context="崇朝其雨")
+        assert result.jiajie_records == []
+        assert [r["source"] for r in result.parallel_texts] == ["《诗·鄘风·蝃蝀》"]
+
+
+class TestQuoteIndex:
+    """测试例证引文倒排索引（异文检索）"""
+
+    @pytest.fixture
+    def quote_index(self, sample_jsonl, tmp_path):
+        from src.data import build_quote_index
+
+        with open(sample_jsonl, "a", encoding="utf-8") as f:
+            for headword, book, quote in [
+                ("終朝", "《诗·小雅·采绿》", "終朝采綠，不盈一匊。"),
+                ("雨", "《易林》", "終朝其雨，不可久也。"),
+                ("其", "《书》", "崇朝其雨。"),
+            ]:
+                entry = {"headword": headword, "senses": [
+                    {"mean": "", "examples": [{"books": [book], "quotes": [quote]}]}]}
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        path = tmp_path / "dyhdc_quotes.bin"
+        assert build_quote_index(str(sample_jsonl), str(path), workers=1) == 5
+        return path
+
+    def test_search_variants(self, quote_index):
+        from src.data import QuoteIndex
+
+        with QuoteIndex(quote_index) as index:
+            assert len(index) == 5
+            assert len(index.postings("崇朝")) == 3
+            hits = index.search_variants("崇朝其雨", "崇", "終")
+            assert [h["text"] for h in hits] == ["終朝其雨，不可久也。", "終朝采綠，不盈一匊。"]
+            assert hits[0]["score"] == 1.0
+            assert hits[0]["headword"] == "雨"
+            assert index.search_variants("崇朝其雨", "崇", "海") == []
+            assert index.search_variants("崇朝其雨", "龘", "終") == []
+
+    def test_search_variants_simplified_query(self, quote_index):
+        from src.data import QuoteIndex
+        from src.data.char_convert import CharConverter
+
+        converter = CharConverter(s2t={"终": ["終"], "绿": ["綠"]}, t2s={"終": ["终"], "綠": ["绿"]})
+        with QuoteIndex(quote_index, converter=converter) as index:
+            # 简体的替换字、简体的上下文都要展开成繁体再检索
+            hits = index.search_variants("崇朝其雨", "崇", "终")
+            assert [h["text"] for h in hits] == ["終朝其雨，不可久也。", "終朝采綠，不盈一匊。"]
+            hits = index.search_variants("崇朝采绿", "崇", "终")
+            assert hits[0]["text"] == "終朝采綠，不盈一匊。" and hits[0]["score"] == 1.0
+
+    def test_candidates_capped_for_frequent_bigrams(self, quote_index, monkeypatch):
+        from src.data import QuoteIndex
+        from src.data import quote_index as module
+
+        monkeypatch.setattr(module, "MAX_CANDIDATES", 1)
+        with QuoteIndex(quote_index) as index:
+            # "朝"的两侧二元组都很常见：先用更罕见的上下文二元组收窄，候选不超过上限
+            hits = index.search_variants("崇朝其雨", "崇", "終")
+            assert [h["text"] for h in hits] == ["終朝其雨，不可久也。"]
+
+    def test_textual_tool_search_corpus(self, sample_jsonl, binary_index, quote_index, tmp_path):
+        from src.tools.textual_tool import TextualTool
+
+        tool = TextualTool(str(sample_jsonl), str(binary_index), str(tmp_path / "missing.db"), str(quote_index))
+        hits = tool.search_corpus("崇朝其雨", "崇", "終", limit=1)
+        assert [h["source"] for h in hits] == ["《易林》"]
+        result = tool.search("崇", "終", context="崇朝其雨")
+        assert "終朝其雨，不可久也。" in [v["text"] for v in result.variant_texts]
+
+
+class TestJiajieIndex:
+    """测试假借关系索引"""
+
+    @pytest.fixture
+    def jiajie_index(self, sample_jsonl, tmp_path):
+        from src.data import build_jiajie_index
+
+        with open(sample_jsonl, "a", encoding="utf-8") as f:
+            for entry in [
+                {"headword": "海若", "senses": [{"mean": "海神名。海，通“晦”。", "examples": [
+                    {"books": ["《庄子·秋水》"], "quotes": ["北海若曰"]}]}]},
+                {"headword": "崈", "redirect_to": "崇", "senses": []},
+            ]:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        path = tmp_path / "dyhdc_jiajie.bin"
+        assert build_jiajie_index(str(sample_jsonl), str(path), workers=1) == 3
+        return path
+
+    def test_lookup(self, jiajie_index):
+        from src.data import JiajieIndex
+
+        with JiajieIndex(jiajie_index) as index:
+            # 简体"终"与词条中的"終"查到同一条记录，且不论方向
+            for pair in [("崇", "終"), ("崇", "终"), ("终", "崇")]:
+                assert [(r["借字"], r["本字"], r["关系"]) for r in index.lookup(*pair)] == [("崇", "終", "通")]
+            # 只在第三方条目中写明的关系
+            relation, = index.lookup("海", "晦")
+            assert (relation["词条"], relation["source"]) == ("海若", "《庄子·秋水》")
+            assert index.lookup("崈", "崇")[0]["关系"] == "同"
+            assert index.lookup("海", "崇") == []
+
+    def test_textual_tool_uses_relation_index(self, sample_jsonl, binary_index, jiajie_index, tmp_path):
+        from src.tools.textual_tool import TextualTool
+
+        tool = TextualTool(str(sample_jsonl), str(binary_index), str(tmp_path / "missing.db"),
+                           str(tmp_path / "missing_quotes.bin"), str(jiajie_index))
+        result = tool.search("海", "晦")
+        assert [r["text"] for r in result.jiajie_records] == ["海神名。海，通“晦”。"]
+        assert tool.search("崇", "终").has_evidence
+
+
+class TestEntryCache:
+    """测试共享加载器与词条缓存"""
+
+    def test_lru_by_bytes(self):
+        from src.data import EntryCache
+        from src.data.entry_cache import estimate_size
+
+        entry = {"字": "崇", "义项": ["高；高大。"] * 3}
+        cache = EntryCache(max_bytes=2 * (estimate_size("甲") + estimate_size(entry)))
+        for char in "甲乙":
+            cache.put(char, entry)
+        assert cache.get("甲") is entry  # 甲 变为最近使用
+        cache.put("丙", entry)
+        assert "乙" not in cache and "甲" in cache and "丙" in cache
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        cache.put("大", {"义项": ["x" * 10000]})  # 超过容量的值不缓存
+        assert "大" not in cache
+
+    def test_tools_share_loader_and_cache(self, sample_jsonl, binary_index, tmp_path):
+        from src.tools.semantic_tool import SemanticTool
+        from src.tools.textual_tool import TextualTool
+
+        semantic = SemanticTool(str(sample_jsonl), str(binary_index))
+        textual = TextualTool(str(sample_jsonl), str(binary_index), str(tmp_path / "missing.db"),
+                              str(tmp_path / "missing_quotes.bin"), str(tmp_path / "missing_jiajie.bin"))
+        semantic.load()
+        textual.load()
+        assert semantic._loader is textual._loader
+
+        cache = semantic._loader.cache
+        assert semantic.query("崇").primary_meaning == "高；高大。"
+        assert semantic.query("龘").primary_meaning == "未收录"
+        misses = cache.misses
+        textual.search("崇", "終")  # 崇 已缓存，只有 終 需要读盘
+        semantic.query("龘")  # 未收录的结果也被缓存
+        assert cache.misses == misses + 1
+        assert cache.hits >= 2
+
+
+class TestParquetExport:
+    """测试列式导出与查询"""
+
+    def test_export_and_query(self, sample_jsonl, tmp_path):
+        pytest.importorskip("pyarrow")
+        import pyarrow.compute as pc
+        from src.data import ParquetDictionary, export_parquet
+
+        out = tmp_path / "parquet"
+        totals = export_parquet(str(sample_jsonl), str(out), workers=1, chunk_size=64)
+        assert totals == {"entries": 5, "senses": 6, "examples": 2}
+        assert len(list((out / "senses").glob("part-*.parquet"))) > 1
+
+        dyhdc = ParquetDictionary(out)
+        assert dyhdc.count_senses_with("通“") == 1
+        assert dyhdc.senses_with("通“").column("headword").to_pylist() == ["崇"]
+        assert dyhdc.redirect_entries().num_rows == 0
+
+        entries = dyhdc.scan("entries", columns=["entry_id", "headword"], filter=pc.field("first_char") == "崇")
+        assert sorted(entries.column("headword").to_pylist()) == ["崇", "崇山", "崇朝"]
+        offset = entries.column("entry_id").to_pylist()[entries.column("headword").to_pylist().index("崇")]
+        with open(sample_jsonl, "rb") as f:
+            f.seek(offset)
+            assert json.loads(f.readline())["headword"] == "崇"
+
+
+class TestJsonlCodec:
+    """测试JSONL解码层"""
+
+    def test_backends_agree(self, sample_jsonl):
+        from src.data import jsonl_codec
+
+        lines = sample_jsonl.read_bytes().splitlines()
+        lines.append('{"headword": "甲", "senses": [{"mean": null, "examples": null}], "html_clean": "<hdcs/>"}'.encode())
+        original = jsonl_codec.get_backend()
+        try:
+            decoded = {}
+            for backend in jsonl_codec.BACKENDS:
+                jsonl_codec.set_backend(backend)
+                decoded[backend] = [jsonl_codec.decode_entry(line) for line in lines]
+                assert [jsonl_codec.loads(line) for line in lines[:-1]] == SAMPLE_ENTRIES
+        finally:
+            jsonl_codec.set_backend(original)
+        assert all(entries == decoded["json"] for entries in decoded.values())
+
+        entries = decoded["json"]
+        assert entries[0].is_meta
+        assert entries[2].senses[1].examples[0].quotes == ["誰謂宋遠，曾不崇朝。"]
+        assert entries[-1].senses[0].mean == "" and entries[-1].senses[0].examples == []
+
+    def test_decode_errors(self):
+        from src.data.jsonl_codec import DECODE_ERRORS, decode_entry, set_backend
+
+        with pytest.raises(DECODE_ERRORS):
+            decode_entry(b'{"headword": ')
+        with pytest.raises(ValueError):
+            set_backend("simdjson")
+
+
+class TestDictionaryLoader:
+    """测试基于偏移量索引的 DictionaryLoader"""
+
+    def test_builds_index_and_queries(self, sample_jsonl, tmp_path):
+        from src.knowledge.dictionary_loader import DictionaryLoader
+
+        index_path = tmp_path / "dict_index.bin"
+        loader = DictionaryLoader(str(sample_jsonl), str(index_path))
+        result = loader.query("崇")  # 索引不存在时先构建
+        assert index_path.exists()
+        assert result["本义"] == "高；高大。"
+        assert result["假借标注"] == ["通“終”。终尽。"]
+        assert loader.query("山") is None
+        assert loader.query("龘") is None
+
+        # 旧版JSON索引同样可用
+        index = loader.build_index_file(str(tmp_path / "dict_index.json"))
+        assert sum(len(records) for records in index.values()) == 5
+        json_loader = DictionaryLoader(str(sample_jsonl), str(tmp_path / "dict_index.json"))
+        assert json_loader.query("終")["raw"]["headword"] == "終"
+
+    def test_settings_fall_back_to_json_index(self, tmp_path):
+        from src.config.settings import Settings
+
+        settings = Settings(project_root=tmp_path)
+        processed = tmp_path / "data" / "processed"
+        assert settings.dyhdc_index_path == processed / "dyhdc_index.bin"
+
+        # 只构建过旧版JSON索引的部署继续使用JSON索引，二进制索引建好后优先
+        processed.mkdir(parents=True)
+        (processed / "dyhdc_index.json").write_text("{}", encoding="utf-8")
+        assert settings.dyhdc_index_path == processed / "dyhdc_index.json"
+        (processed / "dyhdc_index.bin").write_bytes(b"")
+        assert settings.dyhdc_index_path == processed / "dyhdc_index.bin"
+
+    def test_prefix_fallback(self, tmp_path):
+        from src.knowledge.dictionary_loader import DictionaryLoader
+
+        path = tmp_path / "compound_only.jsonl"
+        path.write_text(json.dumps(SAMPLE_ENTRIES[1], ensure_ascii=False) + "\n", encoding="utf-8")
+        loader = DictionaryLoader(str(path), str(tmp_path / "compound_only.bin"))
+        # 没有单字条目时退回以该字开头的词条
+        assert loader.query("崇")["本义"] == "终朝。从天亮到早饭时。"
+
+    def test_missing_data(self, tmp_path):
+        from src.knowledge.dictionary_loader import DictionaryLoader
+
+        loader = DictionaryLoader(str(tmp_path / "missing.jsonl"), str(tmp_path / "missing.bin"))
+        assert loader.query("崇") is None
+
+
+class TestBlockStore:
+    """测试zstd压缩分块存储"""
+
+    def test_roundtrip_and_loader(self, sample_jsonl, binary_index, tmp_path):
+        pytest.importorskip("zstandard")
+        from src.data import BlockStore, convert_jsonl_to_store
+
+        store_path = tmp_path / "dyhdc.jsonl.zst"
+        info = convert_jsonl_to_store(str(sample_jsonl), str(store_path), block_size=256)
+        assert info["blocks"] > 1
+
+        raw = sample_jsonl.read_bytes()
+        with BlockStore(store_path, cache_blocks=2) as store:
+            assert store.raw_size == len(raw)
+            assert store.read(0, len(raw)) == raw  # 跨块读取
+            assert store.read(300, 50) == raw[300:350]
+            store.read(300, 50)
+            assert store.hits >= 1 and len(store._blocks) <= 2
+
+        with DYHDCIndexLoader(str(store_path), str(binary_index)) as compressed, \
+                DYHDCIndexLoader(str(sample_jsonl), str(binary_index)) as plain:
+            for char in ["崇", "終", "海", "龘"]:
+                assert compressed.query_single_char(char) == plain.query_single_char(char)
+            assert compressed.query_prefix("崇") == plain.query_prefix("崇")
+            # 压缩存储记录了源JSONL的指纹，与索引一致
+            assert not compressed.is_stale()
+
+
+PANWUYUN_MDX = Path(__file__).parent.parent / "音韵数据/上古音/潘悟云《汉语古音手册》/汉语古音手册/汉语古音手册.mdx"
+
+
+class TestMDictReader:
+    """测试MDX读取器与音韵MDX解析"""
+
+    def test_lzo1x(self):
+        from src.data.mdict_reader import lzo1x_decompress
+
+        # 字面量 "abc" + 长度9、距离3的匹配 + 结束标记
+        assert lzo1x_decompress(bytes([20]) + b"abc" + bytes([39, 8, 0, 0x11, 0, 0]), 12) == b"abc" * 4
+
+    def test_lookup_and_items(self):
+        if not PANWUYUN_MDX.exists():
+            pytest.skip("缺少潘悟云MDX")
+        from src.data import MDXReader
+
+        with MDXReader(PANWUYUN_MDX, cache_blocks=2) as mdx:
+            assert "崇" in mdx and "龘龘" not in mdx
+            records = mdx.lookup("崇")
+            assert records and records[0].count("<h1>崇</h1>") == 1
+            # 流式遍历与按键随机读取一致
+            for i, (key, text) in enumerate(mdx.items()):
+                assert text == mdx.record(i)
+                if i >= 50:
+                    break
+            assert len(mdx._blocks) <= 2
+
+    def test_sources(self, tmp_path):
+        if not PANWUYUN_MDX.exists():
+            pytest.skip("缺少潘悟云MDX")
+        from src.data import MDXPhonologySources, parse_panwuyun_mdx
+
+        with MDXPhonologySources() as sources:
+            entry = sources.query("崇")
+            assert entry["潘悟云"]["韵部"] == "終"
+            assert entry["潘悟云"]["上古音"] == "zruŋ"
+            assert sources.query("龘龘") is None
+        assert parse_panwuyun_mdx(str(PANWUYUN_MDX))["崇"]["声母"] == "崇"
+
+
+class TestPhonologyStore:
+    """测试异读保留与读音两两比较"""
+
+    UNIFIED = {
+        "行": {"字": "行", "潘悟云": {
+            "韵部": "陽", "上古音": "ɡa̠ŋ", "声母": "匣", "韵": "唐", "声调": "平",
+            "异读": [{"韵部": "陽", "上古音": "ɡʳa̠ŋ", "声母": "匣", "韵": "庚", "声调": "平"}]}},
+        "衡": {"字": "衡", "潘悟云": {"韵部": "陽", "上古音": "ɡʳa̠ŋ", "声母": "匣", "韵": "庚", "声调": "平"}},
+        "海": {"字": "海", "白一平沙加尔": {"上古音": "*m̥ˤəʔ", "中古音": "xojX", "释义": "sea", "GSR": "0947h"}},
+        "每": {"字": "每", "白一平沙加尔": {"上古音": "*mˤəʔ", "中古音": "mwojX", "释义": "every", "GSR": "0947a"}},
+    }
+
+    def test_readings_and_best_pair(self):
+        from src.data import PhonologyStore
+
+        store = PhonologyStore.from_unified(self.UNIFIED)
+        assert len(store) == 4 and store.reading_count == 5
+        assert [r.recon for r in store.readings("行")] == ["ɡa̠ŋ", "ɡʳa̠ŋ"]
+        match = store.best_pair("行", "衡")
+        assert match.a.recon == "ɡʳa̠ŋ" and match.score == 1.0
+        # 不同数据源的读音不互相比较
+        assert store.best_pair("行", "海") is None
+        assert store.readings("龘") == []
+        # 批量查询：按请求顺序，未收录的字不出现
+        many = store.readings_many(["衡", "龘", "行", "海"], source="潘悟云")
+        assert list(many) == ["衡", "行", "海"] and many["行"] == store.readings("行") and many["海"] == []
+
+    def test_add_reading_and_compare(self):
+        from src.data import compare_phonology
+        from src.data.phonology_parser import _add_reading, unify_phonology_data
+
+        pan = {}
+        for recon, yun in [("ɡa̠ŋ", "唐"), ("ɡʳa̠ŋ", "庚"), ("ɡa̠ŋ", "唐")]:
+            _add_reading(pan, {"字": "行", "上古韵部": "陽", "上古音": recon, "声母": "匣", "韵": yun})
+        assert pan["行"]["上古音"] == "ɡa̠ŋ" and len(pan["行"]["异读"]) == 1
+
+        unified = unify_phonology_data(pan, {})
+        assert unified["行"]["潘悟云"]["异读"][0]["上古音"] == "ɡʳa̠ŋ"
+        result = compare_phonology("行", "衡", dict(unified, 衡=self.UNIFIED["衡"]))
+        assert result["音近"] and result["详情"]["潘悟云"]["上古音_A"] == "ɡʳa̠ŋ"
+
+    def test_binary_roundtrip(self, tmp_path):
+        from src.data import PhonologyStore, load_phonology_data, save_phonology_data
+        from src.data.phonology_store import is_phonology_store
+
+        path = tmp_path / "phonology.bin"
+        save_phonology_data(self.UNIFIED, str(path))
+        assert is_phonology_store(path)
+        with PhonologyStore.open(path) as store:
+            assert store.readings("行") == PhonologyStore.from_unified(self.UNIFIED).readings("行")
+            assert store.best_pair("行", "衡").score == 1.0
+            assert "海" in store and "龘" not in store
+        assert load_phonology_data(str(path)) == self.UNIFIED
+
+        # 谐声索引随存储一起写入
+        with PhonologyStore.open(path) as store:
+            assert store.same_series("海", "每") == 947 and store.same_series("海", "行") is None
+            assert store.series_mates("每") == {947: ["海"]}
+
+        json_path = tmp_path / "phonology.json"
+        save_phonology_data(self.UNIFIED, str(json_path), as_json=True)
+        assert not is_phonology_store(json_path)
+        assert load_phonology_data(str(json_path)) == self.UNIFIED
+
+        # 由二进制存储重新导出旧版JSON
+        from src.data import export_phonology_json
+
+        exported = tmp_path / "phonology_unified.json"
+        export_phonology_json(str(path), str(exported))
+        assert json.loads(exported.read_text(encoding="utf-8")) == self.UNIFIED
+
+
+class TestPhoneticSimilarity:
+    """测试拟音音段切分与全字表音近矩阵"""
+
+    def test_data_package_does_not_import_numpy(self):
+        import subprocess
+        import sys
+
+        code = "import sys, src.data, src.tools.textual_tool; print('numpy' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent.parent, check=True).stdout
+        assert out.strip() == "False"
+
+    def test_parse_syllable(self):
+        from src.data.phonemes import parse_syllable, syllable_distance
+
+        # 白-沙与潘悟云写法规整到同一槽位
+        assert parse_syllable("*[ɡ]<r>ˤaŋ-s") == parse_syllable("ɡʳa̠ŋs")
+        syllable = parse_syllable("*kʷˤet-s")
+        assert syllable.onset.labialized and syllable.coda.base == "t" and syllable.post == "s"
+        assert parse_syllable("*Cə.[ɢ]am").onset.base == "ɢ"
+        assert parse_syllable("ʔ") is None
+        near = syllable_distance(parse_syllable("ɡa̠ŋ"), parse_syllable("kʰa̠ŋ"))
+        far = syllable_distance(parse_syllable("ɡa̠ŋ"), parse_syllable("mɯ"))
+        assert 0 < near < far <= 1
+
+    def test_matrix_and_top_k(self, tmp_path):
+        from src.data import PhonologyStore
+        from src.data.phonetic_similarity import PhoneticNeighbors, PhoneticSimilarity
+
+        unified = dict(TestPhonologyStore.UNIFIED)
+        unified["杭"] = {"字": "杭", "潘悟云": {"韵部": "陽", "上古音": "ɡa̠ŋ", "声母": "匣"}}
+        unified["之"] = {"字": "之", "潘悟云": {"韵部": "之", "上古音": "tjɯ", "声母": "章"}}
+        store = PhonologyStore.from_unified(unified)
+        sim = PhoneticSimilarity(store)
+        assert "海" not in sim  # 只收录该数据源有读音的字
+
+        chars, matrix = sim.matrix(["行", "衡", "之", "龘"])
+        assert chars == ["行", "衡", "之"]
+        # 多音字取最匹配的一对读音
+        assert matrix[0, 1] == pytest.approx(1.0)
+        assert matrix[0, 2] < 0.5 and (matrix == matrix.T).all()
+
+        neighbors = sim.top_k(k=2)
+        assert [c for c, _ in neighbors.neighbors("行")] == [c for c, _ in sim.neighbors("行", 2)]
+        assert neighbors.neighbors("之")[-1][0] != "之"
+        path = tmp_path / "neighbors.npz"
+        neighbors.save(path)
+        assert PhoneticNeighbors.load(path).neighbors("衡", 1) == neighbors.neighbors("衡", 1)
+
+    def test_feature_edit_distance(self):
+        from src.data.phonemes import feature_edit_distance, feature_edit_distances, recon_similarity
+
+        # 同部位替换 + 介音增删，比按字符比较更近
+        assert recon_similarity("*dzruŋ", "*tuŋ") > 0.8
+        assert recon_similarity("*[ɡ]<r>ˤaŋ-s", "ɡʳa̠ŋs") == 1.0
+        assert recon_similarity("ɡa̠ŋ", "kʰa̠ŋ") > recon_similarity("ɡa̠ŋ", "mɯ")
+        assert recon_similarity("", "*tuŋ") == 0.0
+        assert feature_edit_distance("*tuŋ", "*dzruŋ") == feature_edit_distance("*dzruŋ", "*tuŋ")
+
+        pairs = [("*dzruŋ", "*tuŋ"), ("ɡa̠ŋ", "mɯ"), ("kʰlo̠ls", "*kʷˤet-s"), ("*tuŋ", ""), ("a", "a")]
+        batch = feature_edit_distances(pairs, chunk_size=2)
+        assert batch.tolist() == pytest.approx([feature_edit_distance(a, b) for a, b in pairs])
+
+
+class TestCharConverter:
+    """测试繁简单字对照表"""
+
+    S2T = {"干": ["幹", "乾", "干"], "终": ["終"], "说": ["說"]}
+    T2S = {"乾": ["干", "乾"], "終": ["终"], "說": ["说"]}
+
+    def test_convert(self):
+        from src.data import CharConverter
+
+        converter = CharConverter(self.S2T, self.T2S)
+        assert converter.convert("终干", "s2t") == "終幹"
+        assert converter.convert("說文解字", "t2s") == "说文解字"
+        assert converter.candidates("干") == ["幹", "乾", "干"]
+        assert converter.candidates("龘") == ["龘"]
+        assert converter.convert_char("乾", "t2s") == "干"
+        assert converter.convert_batch(["终", "说", "龘"]) == ["終", "說", "龘"]
+
+    def test_stored_with_phonology(self, tmp_path):
+        from src.data import CharConverter, PhonologyStore, save_phonology_data
+
+        path = tmp_path / "phonology.bin"
+        save_phonology_data(TestPhonologyStore.UNIFIED, str(path), char_tables=(self.S2T, self.T2S))
+        with PhonologyStore.open(path) as store:
+            assert store.char_tables() == (self.S2T, self.T2S)
+        assert CharConverter.load(path).candidates("乾", "t2s") == ["干", "乾"]
+
+
+class TestXunguMiner:
+    """测试注疏语料训诂句抽取"""
+
+    TEXT = ("《周礼·春官·肆师》：“凡四时之大甸猎，祭表貉。”郑玄注：“貉，师祭也。貉，读为十百之百。”\n"
+            "《郑笺》：“孙，读当如‘公孙于齐之孙’，孙之言孙遁也。”\n"
+            "此章六句，前四句为交句韵。\n")
+
+    def test_extract(self):
+        from src.data import extract_xungu
+
+        items = list(extract_xungu(self.TEXT.splitlines()[0]))
+        assert [(i["格式"], i["被释字"], i["释字"]) for i in items] == [("A也", "貉", "师祭"), ("读为", "貉", "十百之百")]
+        line = self.TEXT.splitlines()[1]
+        item = next(i for i in extract_xungu(line) if i["格式"] == "之言")
+        assert line[item["位置"]:].startswith("孙之言孙遁也。")
+
+    def test_mine_corpus(self, tmp_path):
+        from src.data import mine_corpus
+
+        txt = tmp_path / "commentary.txt"
+        txt.write_text(self.TEXT * 20, encoding="utf-8")
+        jsonl = tmp_path / "commentary.jsonl"
+        jsonl.write_text("\n".join(json.dumps({"text": line}, ensure_ascii=False)
+                                   for line in self.TEXT.splitlines()) + "\n", encoding="utf-8")
+
+        serial = list(mine_corpus([txt, jsonl], workers=1, chunk_size=256))
+        assert len(serial) == 20 * 3 + 3
+        # 偏移指向行首
+        with open(txt, 'rb') as f:
+            f.seek(serial[-4]["偏移"])
+            assert "孙之言孙遁也" in f.readline().decode("utf-8")
+        assert list(mine_corpus([txt, jsonl], workers=2, chunk_size=256)) == serial
@@ -42,6 +42,25 @@ class TestPhonologyTool:
         result = check_phonetic_relation("崇", "终")
         assert "is_close" in result
         assert "same_yunbu" in result
+        assert "same_series" in result
+
+    def test_series_mates(self):
+        from src.tools.phonology_tool import find_series_mates
+        result = check_phonetic_relation("工", "江")
+        assert result["same_series"] and result["is_close"]
+        assert "江" in find_series_mates("工")[result["series"]]
+
+    def test_trad_candidates(self):
+        from src.tools.phonology_tool import _get_tool
+        tool = _get_tool()
+        # 一简多繁：全部候选各带自己的数据
+        infos = tool.query_candidates("干")
+        assert [info.char_trad for info in infos] == ["幹", "乾", "干"]
+        assert tool.query("干").char_trad == "幹"
+        # 判定时取最好的一对候选：干 与 旱 同谐声
+        result = check_phonetic_relation("干", "旱")
+        assert result["candidates"]["char1"] == ["幹", "乾", "干"]
+        assert result["char1_info"]["繁体"] == "干" and result["same_series"]
 
 
 class TestPatternTool:
@@ -62,6 +81,18 @@ class TestPatternTool:
         result = identify_pattern("夭夭，盛貌")
         assert result["暗示类型"] == "语义解释"
 
+    def test_keyword_prefilter_matches_full_scan(self):
+        from src.tools.pattern_tool import PatternTool
+        sentences = [
+            "正，读为征", "崇，终也", "海之言晦也", "甫之为言父也", "X谓之言Y也", "夭夭，盛貌",
+            "关关，和声之貌", "古者，今之所以也", "荼，读当为舒", "蚤与早通", "羞、脩，古字通",
+            "某，某之假借字", "某，或作某", "某，犹言某", "某者，某也", "某，即某",
+            "讀為終", "句中无训释术语", "",
+        ]
+        fast, full = PatternTool(), PatternTool(prefilter=False)
+        for sentence in sentences:
+            assert fast.identify(sentence) == full.identify(sentence), sentence
+
 
 class TestTextualTool:
     """测试文献检索工具"""
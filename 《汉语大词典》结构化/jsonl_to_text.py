@@ -16,13 +16,19 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
 import sys
 from typing import Any, Dict, Iterable, List, Optional
 
 
+# 解码统一用仓库的 src/data/jsonl_codec（按 orjson → msgspec → json 自动选择后端）；
+# 该模块不依赖项目中的其它模块，直接从 src/data 目录导入，不执行 src 包的 __init__
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")))
+
+from jsonl_codec import loads as json_loads  # noqa: E402
+
+
 def norm(s: Optional[str]) -> str:
     if not s:
         return ""
@@ -183,7 +189,7 @@ def main() -> None:
             if not line:
                 continue
             try:
-                obj = json.loads(line)
+                obj = json_loads(line)
             except Exception:
                 continue
             total += 1
@@ -13,6 +13,9 @@
   python3 maxjsonl_analysis.py --out parsed.jsonl --limit 5000 # 解析前 5000 条
   python3 maxjsonl_analysis.py --keep-html                     # 保留清理后的 html_clean 字段
   python3 maxjsonl_analysis.py --no-skip-meta                  # 包含以 # 开头的元信息行
+  python3 maxjsonl_analysis.py --workers 8                     # 8 进程并行解析（输出顺序不变）
+
+中断后以相同参数重跑即从断点（<输出>.ckpt 中记录的已提交输入偏移）继续；--no-resume 从头开始。
 """
 
 import argparse
@@ -24,6 +27,13 @@ import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional, Tuple
 
 
+# 解码统一用仓库的 src/data/jsonl_codec（按 orjson → msgspec → json 自动选择后端）；
+# 该模块不依赖项目中的其它模块，直接从 src/data 目录导入，不执行 src 包的 __init__
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "data")))
+
+from jsonl_codec import loads as json_loads  # noqa: E402
+
+
 def strip_unreadable_html(html: str) -> str:
     """去除不适合人类阅读的部分：脚本与样式引入等。
 
@@ -367,56 +377,182 @@ def parse_entry_html(html: str) -> Dict[str, Any]:
     return result
 
 
+def process_line(line: str, keep_html: bool = False, skip_meta: bool = True) -> Optional[str]:
+    """解析一行输入 JSONL，返回输出行（不含换行）；空行、坏行、被跳过的元信息行返回 None。"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        obj = json_loads(line)
+    except Exception:
+        return None
+
+    head = obj.get("headword")
+    if skip_meta and isinstance(head, str) and head.startswith("#"):
+        return None
+
+    # 兼容两类输入：原始 JSONL(有 html) 与已解析 JSONL(有 html_clean)
+    html = obj.get("html") or obj.get("html_clean", "")
+    # 若 html 不含结构，但 alts 中包含结构化片段（少数异常行），尝试回退
+    if (not html or ('<hdc' not in html and '<hdcs' not in html)) and isinstance(obj.get('alts'), list):
+        for alt in obj['alts']:
+            if isinstance(alt, str) and ('<hdc' in alt or '<hdcs' in alt):
+                html = alt
+                break
+    parsed = parse_entry_html(html)
+    out_obj: Dict[str, Any] = {
+        "headword": head,
+        **parsed,
+    }
+    # 传递上游的 alts（如果 jsonl 中存在）
+    if "alts" in obj and isinstance(obj["alts"], list):
+        out_obj["alts"] = obj["alts"]
+    if keep_html:
+        out_obj["html_clean"] = strip_unreadable_html(html)
+
+    return json.dumps(out_obj, ensure_ascii=False)
+
+
+def _process_batch(task: Tuple[List[bytes], bool, bool]) -> List[str]:
+    """进程池任务：解析一批原始行，按输入顺序返回输出行。"""
+    lines, keep_html, skip_meta = task
+    out = []
+    for raw in lines:
+        result = process_line(raw.decode("utf-8", errors="ignore"), keep_html, skip_meta)
+        if result is not None:
+            out.append(result)
+    return out
+
+
+def _read_batches(fin, batch_size: int):
+    """按批读取原始行，产出 (行列表, 该批结束后的输入偏移)。"""
+    while True:
+        lines = []
+        for _ in range(batch_size):
+            raw = fin.readline()
+            if not raw:
+                break
+            lines.append(raw)
+        if not lines:
+            return
+        yield lines, fin.tell()
+
+
+def _load_checkpoint(ckpt_path: str, in_path: str, keep_html: bool, skip_meta: bool) -> Optional[Dict[str, Any]]:
+    """读取断点；输入文件或参数与断点不一致时返回 None（从头开始）。"""
+    if not os.path.exists(ckpt_path):
+        return None
+    try:
+        with open(ckpt_path, "r", encoding="utf-8") as f:
+            ckpt = json.load(f)
+    except (OSError, ValueError):
+        return None
+    st = os.stat(in_path)
+    if (ckpt.get("in_size"), ckpt.get("in_mtime_ns"), ckpt.get("keep_html"), ckpt.get("skip_meta")) != \
+            (st.st_size, st.st_mtime_ns, keep_html, skip_meta):
+        print(f"[Warn] 断点与当前输入/参数不一致，忽略: {ckpt_path}")
+        return None
+    return ckpt
+
+
+def _save_checkpoint(ckpt_path: str, ckpt: Dict[str, Any]) -> None:
+    """原子写入断点（先写临时文件再替换），中途中断不会留下半个断点文件。"""
+    tmp = ckpt_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ckpt, f)
+    os.replace(tmp, ckpt_path)
+
+
 def process_jsonl(
     in_path: str,
     out_path: str,
     keep_html: bool = False,
     skip_meta: bool = True,
     limit: Optional[int] = None,
+    workers: int = 1,
+    batch_size: int = 500,
+    checkpoint: bool = False,
 ) -> int:
     """流式读取 JSONL，解析并另存为结构化 JSONL。
 
-    返回写入的条数。
+    - workers > 1 时按批交给进程池解析，同时在途的批数不超过 workers*2，输出仍保持输入顺序；
+    - checkpoint=True 时每写完一批就把"已提交的输入偏移/输出偏移/条数"记入 out_path + ".ckpt"，
+      中断后以相同参数重跑会截断输出到断点处并从该输入偏移继续；全部完成后删除断点文件。
+
+    返回写入的条数（续跑时包含此前已写入的条数）。
     """
-    count_out = 0
-    with open(in_path, "r", encoding="utf-8", errors="ignore") as fin, \
-         open(out_path, "w", encoding="utf-8", newline="\n") as fout:
-        for i, line in enumerate(fin, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-
-            head = obj.get("headword")
-            if skip_meta and isinstance(head, str) and head.startswith("#"):
-                continue
-
-            # 兼容两类输入：原始 JSONL(有 html) 与已解析 JSONL(有 html_clean)
-            html = obj.get("html") or obj.get("html_clean", "")
-            # 若 html 不含结构，但 alts 中包含结构化片段（少数异常行），尝试回退
-            if (not html or ('<hdc' not in html and '<hdcs' not in html)) and isinstance(obj.get('alts'), list):
-                for alt in obj['alts']:
-                    if isinstance(alt, str) and ('<hdc' in alt or '<hdcs' in alt):
-                        html = alt
+    ckpt_path = out_path + ".ckpt"
+    st = os.stat(in_path)
+    ckpt = _load_checkpoint(ckpt_path, in_path, keep_html, skip_meta) if checkpoint else None
+
+    in_offset, out_offset, count_out = 0, 0, 0
+    if ckpt is not None and os.path.exists(out_path):
+        in_offset, out_offset, count_out = ckpt["in_offset"], ckpt["out_offset"], ckpt["count"]
+        print(f"[Resume] 从输入偏移 {in_offset} 继续（已写入 {count_out} 行）")
+
+    if limit is not None and count_out >= limit:
+        return count_out
+
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    mode = "r+b" if out_offset else "wb"
+    with open(in_path, "rb") as fin, open(out_path, mode) as fout:
+        fin.seek(in_offset)
+        # 丢弃断点之后未提交的输出
+        fout.seek(out_offset)
+        fout.truncate()
+
+        def commit(lines: List[str], end_offset: int) -> bool:
+            """按顺序写出一批结果并更新断点；达到 limit 时返回 True。"""
+            nonlocal count_out
+            if limit is not None:
+                lines = lines[:limit - count_out]
+            if lines:
+                fout.write(("\n".join(lines) + "\n").encode("utf-8"))
+                count_out += len(lines)
+            if checkpoint:
+                fout.flush()
+                _save_checkpoint(ckpt_path, {
+                    "in_offset": end_offset,
+                    "out_offset": fout.tell(),
+                    "count": count_out,
+                    "in_size": st.st_size,
+                    "in_mtime_ns": st.st_mtime_ns,
+                    "keep_html": keep_html,
+                    "skip_meta": skip_meta,
+                })
+            return limit is not None and count_out >= limit
+
+        batches = _read_batches(fin, batch_size)
+        try:
+            if pool is None:
+                for lines, end_offset in batches:
+                    if commit(_process_batch((lines, keep_html, skip_meta)), end_offset):
                         break
-            parsed = parse_entry_html(html)
-            out_obj: Dict[str, Any] = {
-                "headword": head,
-                **parsed,
-            }
-            # 传递上游的 alts（如果 jsonl 中存在）
-            if "alts" in obj and isinstance(obj["alts"], list):
-                out_obj["alts"] = obj["alts"]
-            if keep_html:
-                out_obj["html_clean"] = strip_unreadable_html(html)
-
-            fout.write(json.dumps(out_obj, ensure_ascii=False) + "\n")
-            count_out += 1
-            if limit is not None and count_out >= limit:
-                break
+            else:
+                from collections import deque
+                pending = deque()
+                done = False
+                for lines, end_offset in batches:
+                    pending.append((pool.submit(_process_batch, (lines, keep_html, skip_meta)), end_offset))
+                    # 在途批数有上限，内存占用不随文件大小增长
+                    if len(pending) >= workers * 2:
+                        future, offset = pending.popleft()
+                        if commit(future.result(), offset):
+                            done = True
+                            break
+                while pending and not done:
+                    future, offset = pending.popleft()
+                    done = commit(future.result(), offset)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    if checkpoint and os.path.exists(ckpt_path):
+        os.remove(ckpt_path)
     return count_out
 
 
@@ -427,6 +563,9 @@ def main():
     parser.add_argument("--limit", type=int, default=None, help="最多处理条数（默认全量）")
     parser.add_argument("--keep-html", dest="keep_html", action="store_true", help="在输出中保留清理后的 html_clean")
     parser.add_argument("--no-skip-meta", dest="skip_meta", action="store_false", help="包含以 # 开头的元信息行")
+    parser.add_argument("--workers", type=int, default=1, help="解析进程数（默认 1，即单进程）")
+    parser.add_argument("--batch-size", dest="batch_size", type=int, default=500, help="每批交给进程池的行数")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", help="忽略已有断点，从头开始")
     args = parser.parse_args()
 
     in_path = os.path.abspath(args.in_path)
@@ -435,12 +574,18 @@ def main():
         print(f"[Error] 未找到输入文件: {in_path}")
         sys.exit(1)
 
+    if not args.resume and os.path.exists(out_path + ".ckpt"):
+        os.remove(out_path + ".ckpt")
+
     written = process_jsonl(
         in_path=in_path,
         out_path=out_path,
         keep_html=args.keep_html,
         skip_meta=args.skip_meta,
         limit=args.limit,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint=True,
     )
     print(f"[Done] 写入 {written} 行 -> {out_path}")
 